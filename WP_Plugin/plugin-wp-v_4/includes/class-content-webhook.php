@@ -0,0 +1,160 @@
+<?php
+/**
+ * Content Webhook Class
+ * Notifica al backend le modifiche ai contenuti (save_post, trash, delete)
+ * così la cache del chatbot viene invalidata in pochi secondi
+ */
+
+// Prevent direct access
+if (!defined('ABSPATH')) {
+    exit('Direct access forbidden.');
+}
+
+/**
+ * Content Webhook Class
+ *
+ * Il secret va definito in wp-config.php e deve coincidere con
+ * WORDPRESS_WEBHOOK_SECRET del backend:
+ *
+ *     define('VERONICA_CHATBOT_WEBHOOK_SECRET', '...');
+ */
+class Veronica_Chatbot_Content_Webhook {
+
+    /**
+     * Endpoint REST letti dal chatbot (rest_base dei post type notificati)
+     */
+    const REST_BASES = array(
+        'posts',
+        'projects',
+        'certifications',
+        'work-experiences',
+        'books',
+        'tools',
+        'stacks',
+    );
+
+    /**
+     * Settings manager instance
+     */
+    private $settings_manager;
+
+    /**
+     * Eventi già inviati nella richiesta corrente (save_post scatta più volte)
+     */
+    private $sent = array();
+
+    /**
+     * Constructor
+     */
+    public function __construct($settings_manager) {
+        $this->settings_manager = $settings_manager;
+
+        if (!defined('VERONICA_CHATBOT_WEBHOOK_SECRET') || !VERONICA_CHATBOT_WEBHOOK_SECRET) {
+            return;
+        }
+
+        add_action('save_post', array($this, 'on_save_post'), 20, 3);
+        add_action('wp_trash_post', array($this, 'on_trash_post'));
+        add_action('before_delete_post', array($this, 'on_delete_post'));
+    }
+
+    /**
+     * Post creato o aggiornato
+     */
+    public function on_save_post($post_id, $post, $update) {
+        if (wp_is_post_revision($post_id) || wp_is_post_autosave($post_id)) {
+            return;
+        }
+
+        // Un post non più pubblicato va rimosso dalla cache del backend
+        $action = $post->post_status === 'publish' ? 'save' : 'unpublish';
+        $this->notify($post, $action);
+    }
+
+    /**
+     * Post spostato nel cestino
+     */
+    public function on_trash_post($post_id) {
+        $this->notify(get_post($post_id), 'trash');
+    }
+
+    /**
+     * Post eliminato definitivamente
+     */
+    public function on_delete_post($post_id) {
+        $this->notify(get_post($post_id), 'delete');
+    }
+
+    /**
+     * Invia l'evento firmato al backend (non bloccante)
+     */
+    private function notify($post, $action) {
+        if (!$post) {
+            return;
+        }
+
+        $post_type_object = get_post_type_object($post->post_type);
+        $rest_base = ($post_type_object && $post_type_object->rest_base)
+            ? $post_type_object->rest_base
+            : $post->post_type;
+
+        $rest_bases = apply_filters('veronica_chatbot_webhook_rest_bases', self::REST_BASES);
+        if (!in_array($rest_base, $rest_bases, true)) {
+            return;
+        }
+
+        $event_key = $post->ID . ':' . $action;
+        if (isset($this->sent[$event_key])) {
+            return;
+        }
+        $this->sent[$event_key] = true;
+
+        $webhook_url = $this->get_webhook_url();
+        if (empty($webhook_url)) {
+            return;
+        }
+
+        $body = wp_json_encode(array(
+            'post_type' => $post->post_type,
+            'rest_base' => $rest_base,
+            'id' => (int) $post->ID,
+            'action' => $action,
+        ));
+
+        $timestamp = (string) time();
+        $signature = 'sha256=' . hash_hmac(
+            'sha256',
+            $timestamp . '.' . $body,
+            VERONICA_CHATBOT_WEBHOOK_SECRET
+        );
+
+        wp_remote_post($webhook_url, array(
+            'timeout' => 5,
+            'blocking' => false,
+            'headers' => array(
+                'Content-Type' => 'application/json',
+                'X-Webhook-Timestamp' => $timestamp,
+                'X-Webhook-Signature' => $signature,
+            ),
+            'body' => $body,
+        ));
+    }
+
+    /**
+     * URL del webhook ricavato dall'API URL del chatbot (.../chat)
+     */
+    private function get_webhook_url() {
+        $options = $this->settings_manager->get_options();
+        $api_url = isset($options['api_url']) ? $options['api_url'] : '';
+
+        if (empty($api_url)) {
+            return '';
+        }
+
+        $base_url = preg_replace('#/chat/?$#', '', untrailingslashit($api_url));
+        return apply_filters(
+            'veronica_chatbot_webhook_url',
+            $base_url . '/wordpress/webhook'
+        );
+    }
+}
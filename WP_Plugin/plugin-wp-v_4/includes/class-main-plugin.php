@@ -39,6 +39,11 @@ class Veronica_Chatbot_Main_Plugin {
      */
     private $utilities;
 
+    /**
+     * Content webhook instance
+     */
+    private $content_webhook;
+
     /**
      * Constructor - Inizializza tutti i moduli
      */
@@ -74,6 +79,9 @@ class Veronica_Chatbot_Main_Plugin {
         
         // Initialize utilities
         $this->utilities = new Veronica_Chatbot_Utility_Functions($this->settings_manager);
+
+        // Initialize content webhook (invalidazione cache del backend)
+        $this->content_webhook = new Veronica_Chatbot_Content_Webhook($this->settings_manager);
     }
 
     /**
@@ -32,6 +32,7 @@ require_once VERONICA_CHATBOT_PATH . 'includes/class-frontend-manager.php';
 require_once VERONICA_CHATBOT_PATH . 'includes/class-ajax-handlers.php';
 require_once VERONICA_CHATBOT_PATH . 'includes/class-settings-manager.php';
 require_once VERONICA_CHATBOT_PATH . 'includes/class-utility-functions.php';
+require_once VERONICA_CHATBOT_PATH . 'includes/class-content-webhook.php';
 
 /**
  * Initialize the plugin
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: checkpointer write and read latency per turn
+
+Uso:
+    python -m benchmarks.bench_checkpointer [--turns N] [--messages N]
+
+Simula una conversazione: a ogni turno il checkpoint contiene tutta la
+history (coppie domanda/risposta di lunghezza realistica) e viene salvato e
+riletto come fa LangGraph a ogni step. Confronta MemorySaver con
+SqliteCheckpointer (WAL, compressione, potatura per thread) e mostra la
+dimensione del database.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, List, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.veronica_wordpress_chatbot.workflow.checkpointer import SqliteCheckpointer
+
+ANSWER = (
+    "Veronica ha scritto diversi articoli su LangGraph e sui pattern ReAct; "
+    "il più recente spiega come collegare i tool WordPress al modello. "
+) * 6
+
+
+def run(saver: Any, turns: int, messages: int) -> Tuple[List[float], List[float]]:
+    """Latenze (secondi) di put e get_tuple per ogni turno"""
+    config = {"configurable": {"thread_id": "bench", "checkpoint_ns": ""}}
+    history: List[Any] = []
+    writes, reads = [], []
+    for turn in range(turns):
+        history = history[-messages:] + [
+            HumanMessage(content=f"Domanda {turn} sugli articoli di AI"),
+            AIMessage(content=ANSWER),
+        ]
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": history}
+
+        started = time.perf_counter()
+        config = saver.put(config, checkpoint, {"source": "loop", "step": turn}, {})
+        writes.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        saver.get_tuple({"configurable": {"thread_id": "bench"}})
+        reads.append(time.perf_counter() - started)
+    return writes, reads
+
+
+def report(name: str, writes: List[float], reads: List[float]) -> None:
+    print(
+        f"  {name:<8} put {statistics.median(writes) * 1e3:7.3f} ms "
+        f"(p95 {sorted(writes)[int(len(writes) * 0.95)] * 1e3:7.3f})   "
+        f"get {statistics.median(reads) * 1e3:7.3f} ms "
+        f"(p95 {sorted(reads)[int(len(reads) * 0.95)] * 1e3:7.3f})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Latenza per turno ({args.turns} turni, history di {args.messages}):")
+    report("memory", *run(MemorySaver(), args.turns, args.messages))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "checkpoints.sqlite3")
+        saver = SqliteCheckpointer(path)
+        report("sqlite", *run(saver, args.turns, args.messages))
+        saver.vacuum()
+        stats = saver.stats()
+        print(
+            f"  database {stats['size_bytes'] / 1024:.0f} KiB, "
+            f"{stats['checkpoints']} checkpoint tenuti, {stats['pruned']} potati"
+        )
+
+
+if __name__ == "__main__":
+    main()
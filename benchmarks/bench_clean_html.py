@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: ContentProcessor.clean_html vs the previous regex/replace version
+
+Uso:
+    python -m benchmarks.bench_clean_html [--repeat N]
+
+Genera articoli di dimensione reale (Gutenberg, entità italiane, script
+incorporati) e confronta la conversione completa e l'anteprima da 500
+caratteri usata da process_post.
+"""
+
+import argparse
+import re
+import timeit
+
+from src.veronica_wordpress_chatbot.wordpress.processor import ContentProcessor
+
+
+def legacy_clean_html(html_content: str) -> str:
+    """Implementazione precedente (due regex + cinque replace)"""
+    if not html_content:
+        return ""
+    clean_text = re.sub(r"<[^>]+>", "", html_content)
+    clean_text = clean_text.replace("&nbsp;", " ")
+    clean_text = clean_text.replace("&amp;", "&")
+    clean_text = clean_text.replace("&lt;", "<")
+    clean_text = clean_text.replace("&gt;", ">")
+    clean_text = clean_text.replace("&quot;", '"')
+    clean_text = re.sub(r"\s+", " ", clean_text)
+    return clean_text.strip()
+
+
+PARAGRAPH = (
+    "<!-- wp:paragraph -->\n<p>L&#8217;agente usa <strong>LangGraph</strong> "
+    "per orchestrare il ciclo ReAct: il modello sceglie un tool, legge il "
+    "risultato e decide se rispondere. Perch&eacute; funzioni servono prompt "
+    "chiari, tool con descrizioni precise e una buona gestione degli errori "
+    "&ndash; soprattutto quando WordPress risponde lentamente&hellip;</p>\n"
+    "<!-- /wp:paragraph -->\n"
+)
+CODE = (
+    '<!-- wp:code -->\n<pre class="wp-block-code"><code>graph.add_edge('
+    "&quot;agent&quot;, &quot;tools&quot;)</code></pre>\n<!-- /wp:code -->\n"
+)
+EMBED = '<script type="text/javascript">window.dataLayer = [{"page": 1}];</script>'
+
+
+def make_post(paragraphs: int) -> str:
+    """Articolo HTML con ``paragraphs`` paragrafi (≈400 byte l'uno)"""
+    body = []
+    for i in range(paragraphs):
+        body.append(PARAGRAPH)
+        if i % 5 == 4:
+            body.append(CODE)
+    return EMBED + "".join(body)
+
+
+def bench(label: str, func, repeat: int) -> float:
+    per_call = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+    print(f"  {label:<28} {per_call * 1e6:10.1f} µs")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for paragraphs in (5, 25, 100):
+        html = make_post(paragraphs)
+        print(f"\nArticolo da {len(html) / 1024:.1f} KB ({paragraphs} paragrafi)")
+
+        legacy = bench(
+            "legacy (completo)", lambda: legacy_clean_html(html), args.repeat
+        )
+        full = bench(
+            "clean_html (completo)",
+            lambda: ContentProcessor.clean_html(html),
+            args.repeat,
+        )
+        preview = bench(
+            "clean_html (max_length=500)",
+            lambda: ContentProcessor.clean_html(html, 500),
+            args.repeat,
+        )
+        legacy_preview = bench(
+            "legacy + [:500]",
+            lambda: legacy_clean_html(html)[:500],
+            args.repeat,
+        )
+        print(
+            f"  speedup completo {legacy / full:.2f}x, "
+            f"anteprima {legacy_preview / preview:.2f}x"
+        )
+
+    sample = make_post(1)
+    print("\nLegacy:    ", legacy_clean_html(sample)[:120])
+    print("clean_html:", ContentProcessor.clean_html(sample)[:120])
+
+
+if __name__ == "__main__":
+    main()
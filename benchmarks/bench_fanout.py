@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: fan-out of multi-endpoint tools
+
+Uso:
+    python -m benchmarks.bench_fanout [--deadline S]
+
+Simula gli endpoint interrogati da search_all_content (fallback ?search=)
+con latenze diverse e confronta le chiamate in serie, il fan-out in
+parallelo e il fan-out con una deadline più corta dell'endpoint più lento
+(risposta parziale).
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from src.veronica_wordpress_chatbot.wordpress.fanout import fan_out
+
+# Latenze simulate degli endpoint (secondi)
+LATENCIES: Dict[str, float] = {
+    "articles": 0.12,
+    "projects": 0.08,
+    "certifications": 0.05,
+    "tools": 0.35,
+}
+
+
+def fetch(name: str) -> List[str]:
+    """Richiesta simulata a un endpoint"""
+    time.sleep(LATENCIES[name])
+    return [name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--deadline", type=float, default=0.2)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    for name in LATENCIES:
+        fetch(name)
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fan_out({name: (lambda n=name: fetch(n)) for name in LATENCIES}, deadline=None)
+    parallel = time.perf_counter() - started
+
+    started = time.perf_counter()
+    partial = fan_out(
+        {name: (lambda n=name: fetch(n)) for name in LATENCIES},
+        deadline=args.deadline,
+    )
+    deadline = time.perf_counter() - started
+
+    print(f"  in serie              {serial * 1e3:7.1f} ms")
+    print(f"  fan-out               {parallel * 1e3:7.1f} ms")
+    print(
+        f"  fan-out ({args.deadline:.2f} s)      {deadline * 1e3:7.1f} ms "
+        f"(mancanti: {', '.join(partial.missing) or 'nessuno'})"
+    )
+
+
+if __name__ == "__main__":
+    main()
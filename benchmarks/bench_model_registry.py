@@ -0,0 +1,59 @@
+"""
+Micro-benchmark: per-step overhead of the agent node
+
+Uso:
+    python -m benchmarks.bench_model_registry [--repeat N]
+
+Misura il lavoro fatto da ``call_model`` prima della chiamata al modello
+(nessuna richiesta a OpenAI): come prima del registry, con un nuovo
+ChatOpenAI, ``bind_tools(TOOLS)`` e il system prompt riletto dai template a
+ogni step, e con ModelRegistry che riusa modello e prompt.
+"""
+
+import argparse
+import logging
+import os
+import timeit
+
+from langchain_openai import ChatOpenAI
+
+from src.veronica_wordpress_chatbot.config import Configuration
+from src.veronica_wordpress_chatbot.tools import TOOLS
+from src.veronica_wordpress_chatbot.utils.prompts import create_system_prompt
+from src.veronica_wordpress_chatbot.workflow.registry import ModelRegistry
+
+
+def rebuild_every_step() -> None:
+    """Setup di uno step senza registry"""
+    configuration = Configuration()
+    model = ChatOpenAI(model=configuration.model, temperature=0.1, streaming=True)
+    model.bind_tools(TOOLS)
+    create_system_prompt()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    # ChatOpenAI vuole una chiave anche se non viene fatta nessuna richiesta
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    logging.disable(logging.INFO)
+
+    registry = ModelRegistry()
+
+    def registry_step() -> None:
+        configuration = Configuration()
+        registry.bound_model(ChatOpenAI, configuration.model)
+        registry.system_prompt()
+
+    before = min(timeit.repeat(rebuild_every_step, number=args.repeat, repeat=3))
+    after = min(timeit.repeat(registry_step, number=args.repeat, repeat=3))
+
+    print(f"Overhead per step ({len(TOOLS)} tools):")
+    print(f"  senza registry  {before / args.repeat * 1e3:8.3f} ms")
+    print(f"  con registry    {after / args.repeat * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Micro-benchmark: payload size with and without the _fields projection
+
+Uso:
+    python -m benchmarks.bench_projection [--per-page N]
+
+Scarica la stessa pagina di ogni endpoint con e senza ``_fields`` dal
+WordPress configurato (WORDPRESS_URL) e mostra i byte prima/dopo. Fa due
+richieste non in cache per endpoint: da lanciare a mano, non dall'API.
+"""
+
+import argparse
+import logging
+
+from src.veronica_wordpress_chatbot.config import WORDPRESS_FIELD_CONFIGS
+from src.veronica_wordpress_chatbot.wordpress import get_wordpress_client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-page", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    wp_client = get_wordpress_client()
+
+    print(f"Payload per pagina ({args.per_page} item):")
+    for endpoint in WORDPRESS_FIELD_CONFIGS:
+        measurement = wp_client.measure_projection(endpoint, args.per_page)
+        if measurement is None:
+            print(f"  {endpoint:<18} non raggiungibile")
+            continue
+        print(
+            f"  {endpoint:<18} {measurement['bytes_before']:9,d} B → "
+            f"{measurement['bytes_after']:9,d} B "
+            f"(-{measurement['reduction']:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
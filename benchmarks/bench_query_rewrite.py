@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: query rewriting before WordPress ``search``
+
+Uso:
+    python -m benchmarks.bench_query_rewrite [--repeat N]
+
+Simula ``search`` di WordPress (ogni parola in AND, LIKE '%parola%' su titolo
+e contenuto, senza maiuscole e accenti) su un piccolo corpus di articoli e
+conta le ricerche vuote con le query come le scrive il modello e con le query
+riscritte. Ogni ricerca vuota costa al modello un nuovo tentativo: un altro
+step e altre chiamate a WordPress.
+"""
+
+import argparse
+import timeit
+from typing import List
+
+from src.veronica_wordpress_chatbot.wordpress.query_rewrite import rewrite_query
+from src.veronica_wordpress_chatbot.wordpress.search_index import fold_accents
+
+POSTS = [
+    "Agenti AI con LangGraph: workflow multi-step e memoria delle conversazioni",
+    "Come funzionano gli LLM: modelli linguistici, token e finestra di contesto",
+    "RAG in produzione: embeddings, chunking e valutazione con FastAPI",
+    "Obsidian per organizzare note e idee: il mio sistema",
+    "Corso di machine learning: cosa ho imparato sulla regressione",
+    "Palermo e la community tech: meetup e conferenze in città",
+    "Fine tuning di un LLM open source su dati italiani",
+    "Perché sono passata dal design allo sviluppo AI",
+]
+
+QUERIES = [
+    "hai lavorato con modelli linguistici?",
+    "articles about LangGraph agents",
+    "Hai scritto qualcosa su RAG in produzione?",
+    "come usi Obsidian per organizzare le note",
+    "machine learning course",
+    "eventi tech a Palermo",
+    "fine-tuning of large language models",
+    "perché sei passata all'intelligenza artificiale",
+    "LangGraph",
+    "AI",
+]
+
+
+def wordpress_search(query: str) -> List[int]:
+    """Articoli che contengono tutte le parole della query (come WordPress)"""
+    terms = fold_accents(query).split()
+    texts = [fold_accents(post) for post in POSTS]
+    return [i for i, text in enumerate(texts) if all(t in text for t in terms)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    raw_empty = rewritten_empty = 0
+    print(f"  {'query del modello':<48} {'riscritta':<26} {'prima':>5} {'dopo':>5}")
+    for query in QUERIES:
+        rewritten = rewrite_query(query)
+        before = len(wordpress_search(query))
+        after = len(wordpress_search(rewritten))
+        raw_empty += not before
+        rewritten_empty += not after
+        print(f"  {query:<48} {rewritten:<26} {before:>5} {after:>5}")
+
+    per_query = min(
+        timeit.repeat(
+            lambda: [rewrite_query(query) for query in QUERIES], number=args.repeat
+        )
+    ) / (args.repeat * len(QUERIES))
+    print(
+        f"\nRicerche vuote: {raw_empty}/{len(QUERIES)} → "
+        f"{rewritten_empty}/{len(QUERIES)}\n"
+        f"Riscrittura: {per_query * 1e6:.1f} µs per query"
+    )
+
+
+if __name__ == "__main__":
+    main()
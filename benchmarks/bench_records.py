@@ -0,0 +1,152 @@
+"""
+Micro-benchmark: slotted records vs dicts for processed content
+
+Uso:
+    python -m benchmarks.bench_records [--per-type N]
+
+Confronta, per ``N`` item di ognuno dei sette post type:
+- memoria occupata dai documenti processati (tracemalloc)
+- memoria allocata da una chiamata tool (process_* + serializzazione)
+- tempo di serializzazione del risultato (json.dumps sui dict vs
+  dumps_result sui record, a freddo e con il JSON dei record già calcolato)
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.veronica_wordpress_chatbot.wordpress import get_processed_cache
+from src.veronica_wordpress_chatbot.wordpress.processor import ENDPOINT_PROCESSORS
+from src.veronica_wordpress_chatbot.wordpress.records import dumps_result
+
+from .bench_clean_html import make_post
+
+
+def make_items(per_type: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Item raw WordPress realistici per ogni endpoint"""
+    content = make_post(3)
+    acf = {
+        "project_repository": "https://github.com/Pandagan-85/progetto",
+        "ente_certificazione": "DeepLearning.AI",
+        "azienda_work": "Azienda",
+        "qualifica_work": "AI Engineer",
+        "descrizione_work": content,
+        "books_author": "Autore",
+    }
+    return {
+        endpoint: [
+            {
+                "id": i,
+                "modified": "2024-05-01T10:00:00",
+                "date": "2024-05-01T10:00:00",
+                "title": {"rendered": f"{endpoint} {i}"},
+                "content": {"rendered": content},
+                "excerpt": {"rendered": ""},
+                "link": f"https://www.veronicaschembri.com/{endpoint}/{i}",
+                "acf": acf,
+                "tool-category": [13, 15],
+                "stack-category": [2, 27],
+            }
+            for i in range(per_type)
+        ]
+        for endpoint in ENDPOINT_PROCESSORS
+    }
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """Esegue ``func`` e restituisce (risultato, byte ancora allocati, picco)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-type", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    items = make_items(args.per_type)
+    total = sum(len(batch) for batch in items.values())
+    cache = get_processed_cache()
+
+    def process_records() -> Dict[str, List[Any]]:
+        return {
+            endpoint: [ENDPOINT_PROCESSORS[endpoint](item) for item in batch]
+            for endpoint, batch in items.items()
+        }
+
+    def process_dicts() -> Dict[str, List[Any]]:
+        return {
+            endpoint: [
+                ENDPOINT_PROCESSORS[endpoint].uncached(item).to_dict()  # type: ignore
+                for item in batch
+            ]
+            for endpoint, batch in items.items()
+        }
+
+    def copy_records() -> Dict[str, List[Any]]:
+        # Nuove istanze con gli stessi valori (e senza JSON in cache)
+        return {
+            endpoint: [type(record)(*record._values(record)) for record in batch]
+            for endpoint, batch in records.items()
+        }
+
+    print(f"{total} documenti processati ({args.per_type} per post type)\n")
+
+    # Memoria dei documenti tenuti in cache (stessi valori, contenitore diverso)
+    cache.clear()
+    records = process_records()
+    dicts = {
+        endpoint: [record.to_dict() for record in batch]
+        for endpoint, batch in records.items()
+    }
+    _, records_bytes, _ = measure(copy_records)
+    _, dict_bytes, _ = measure(
+        lambda: {key: [dict(d) for d in batch] for key, batch in dicts.items()}
+    )
+    print("Memoria dei contenitori (valori condivisi)")
+    print(f"  dict      {dict_bytes / 1024:8.1f} KB")
+    print(
+        f"  record    {records_bytes / 1024:8.1f} KB "
+        f"({1 - records_bytes / dict_bytes:.0%} in meno)\n"
+    )
+
+    # Memoria allocata da una chiamata tool: process_* + serializzazione
+    cache.clear()
+    _, _, legacy_peak = measure(lambda: json.dumps(process_dicts()))
+    dumps_result(process_records())  # cache calda, come dalla seconda chiamata
+    _, _, warm_peak = measure(lambda: dumps_result(process_records()))
+    print("Picco di memoria allocata per chiamata (processing + JSON)")
+    print(f"  dict, senza cache     {legacy_peak / 1024:8.1f} KB")
+    print(f"  record, cache calda   {warm_peak / 1024:8.1f} KB\n")
+
+    # Serializzazione del risultato di un tool
+    dict_payload = {"total": total, "data": dicts}
+    record_payload = {"total": total, "data": records}
+    assert json.dumps(dict_payload) == dumps_result(record_payload)
+
+    def per_call(func: Callable[[], Any]) -> float:
+        return min(timeit.repeat(func, number=args.repeat, repeat=5)) / args.repeat
+
+    dict_time = per_call(lambda: json.dumps(dict_payload))
+    cold_time = per_call(
+        lambda: dumps_result({"total": total, "data": copy_records()})
+    ) - per_call(copy_records)
+    warm_time = per_call(lambda: dumps_result(record_payload))
+    print("Serializzazione del risultato")
+    print(f"  json.dumps (dict)            {dict_time * 1e3:8.3f} ms")
+    print(f"  dumps_result (record nuovi)  {cold_time * 1e3:8.3f} ms")
+    print(
+        f"  dumps_result (JSON in cache) {warm_time * 1e3:8.3f} ms "
+        f"({dict_time / warm_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
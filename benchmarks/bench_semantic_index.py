@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: NumPy semantic index
+
+Uso:
+    python -m benchmarks.bench_semantic_index [--docs N] [--repeat N]
+
+Costruisce la matrice dei vettori sullo stesso corpus sintetico di
+bench_search_index, la salva in file .npy e la riapre in mmap da un secondo
+indice (come un altro worker); misura poi la latenza di una query e di un
+blocco di query risolto con un solo prodotto matriciale (``search_many``).
+"""
+
+import argparse
+import tempfile
+import time
+import timeit
+from typing import Any, Callable
+
+from benchmarks.bench_search_index import QUERIES, make_corpus
+from src.veronica_wordpress_chatbot.wordpress.search_index import SearchIndex
+from src.veronica_wordpress_chatbot.wordpress.semantic_index import SemanticIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    source = SearchIndex()
+    for endpoint, item in make_corpus(args.docs):
+        source.add(endpoint, item)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = f"{directory}/semantic_index"
+
+        started = time.perf_counter()
+        built = SemanticIndex(path=path, source=source)
+        built.rebuild()
+        build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        loaded = SemanticIndex(path=path, source=source)
+        loaded.rebuild()
+        load = time.perf_counter() - started
+
+        stats = loaded.stats()
+        print(
+            f"Matrice: {stats['documents']} documenti × {stats['dimensions']} "
+            f"dimensioni (mmap: {stats['memory_mapped']})\n"
+            f"  costruzione {build * 1e3:8.1f} ms\n"
+            f"  apertura    {load * 1e3:8.1f} ms (secondo worker)\n"
+        )
+
+        def per_call(func: Callable[[], Any]) -> float:
+            return min(timeit.repeat(func, number=args.repeat)) / args.repeat
+
+        queries = list(QUERIES) * 8
+        single = per_call(lambda: loaded.search(QUERIES[0], 10))
+        looped = per_call(lambda: [loaded.search(query, 10) for query in queries])
+        batched = per_call(lambda: loaded.search_many(queries, 10))
+
+        print(f"  1 query                {single * 1e6:9.1f} µs")
+        print(f"  {len(queries)} query una alla volta {looped * 1e6:9.1f} µs")
+        print(f"  {len(queries)} query in blocco     {batched * 1e6:9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
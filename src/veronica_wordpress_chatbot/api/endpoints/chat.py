@@ -2,12 +2,15 @@
 Chat endpoints
 """
 
+import json
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from ...utils.logging_config import setup_logging
-from ...utils.tracing import LANGSMITH_ENABLED, process_chat_with_tracing
+from ...utils.tracing import LANGSMITH_ENABLED, aprocess_chat_with_tracing
 from ..dependencies import get_chatbot, limiter
 from ..models import ChatRequest, ChatResponse
 
@@ -30,11 +33,11 @@ async def chat_endpoint(request: Request, chat_request: ChatRequest):
 
         # Process con tracing
         if LANGSMITH_ENABLED:
-            response, trace_url = process_chat_with_tracing(
+            response, trace_url = await aprocess_chat_with_tracing(
                 chat_request.message, chat_request.thread_id
             )
         else:
-            response = chatbot.chat(chat_request.message, chat_request.thread_id)
+            response = await chatbot.achat(chat_request.message, chat_request.thread_id)
             trace_url = None
 
         return ChatResponse(
@@ -49,3 +52,40 @@ async def chat_endpoint(request: Request, chat_request: ChatRequest):
     except Exception as e:
         logger.error(f"Errore nel processare la chat: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Errore interno: {str(e)}")
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Evento nel formato Server-Sent Events"""
+    data = json.dumps(event["data"], ensure_ascii=False)
+    return f"event: {event['event']}\ndata: {data}\n\n"
+
+
+@router.post("/chat/stream")
+@limiter.limit("10/minute")
+async def chat_stream_endpoint(request: Request, chat_request: ChatRequest):
+    """
+    Chat in streaming (Server-Sent Events): eventi ``tool`` mentre il
+    modello consulta i contenuti, ``token`` con la risposta man mano che
+    viene generata e ``done`` con la risposta completa (vedi
+    VeronicaChatbot.astream_chat). Stessa validazione, rate limit e thread
+    di /chat.
+    """
+    chatbot = get_chatbot()
+    if chatbot is None:
+        raise HTTPException(status_code=503, detail="Chatbot non disponibile")
+
+    if not chat_request.message.strip():
+        raise HTTPException(status_code=400, detail="Messaggio vuoto")
+
+    thread_id = chat_request.thread_id or "default"
+
+    async def events() -> AsyncIterator[str]:
+        async for event in chatbot.astream_chat(chat_request.message, thread_id):
+            yield _sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Niente buffering nei reverse proxy (nginx): ogni evento parte subito
+        headers={"X-Accel-Buffering": "no"},
+    )
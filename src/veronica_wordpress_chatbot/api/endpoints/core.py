@@ -2,12 +2,14 @@
 Core endpoints (/, /health, /api/info)
 """
 
+import asyncio
 import os
 from datetime import datetime
 from typing import Dict
 
 from fastapi import APIRouter, HTTPException
 
+from ...wordpress import get_circuit_breakers
 from ..dependencies import get_chatbot
 from ..models import HealthResponse
 
@@ -34,11 +36,11 @@ async def health_check():
         # Test chatbot
         chatbot_status = "healthy" if chatbot is not None else "unhealthy"
 
-        # Test WordPress API
+        # Test WordPress API (stats sincrone: fuori dall'event loop)
         wordpress_stats = {}
         if chatbot:
             try:
-                wordpress_stats = chatbot.get_wordpress_stats()
+                wordpress_stats = await asyncio.to_thread(chatbot.get_wordpress_stats)
                 wordpress_status = (
                     "healthy"
                     if wordpress_stats.get("status") == "success"
@@ -50,6 +52,14 @@ async def health_check():
         else:
             wordpress_status = "unknown"
 
+        # Circuit breaker per endpoint: un circuito aperto degrada il servizio,
+        # come gli endpoint che non rispondono entro la deadline del fan-out
+        breakers = get_circuit_breakers()
+        if wordpress_status == "healthy" and (
+            breakers.open_endpoints() or wordpress_stats.get("missing_endpoints")
+        ):
+            wordpress_status = "degraded"
+
         # Test LangSmith
         from ...utils.tracing import LANGSMITH_ENABLED
 
@@ -69,6 +79,7 @@ async def health_check():
                 "wordpress_api": wordpress_status,
                 "langsmith_tracing": langsmith_status,
                 "wordpress_details": wordpress_stats,
+                "wordpress_circuit_breakers": breakers.stats(),
             },
         )
 
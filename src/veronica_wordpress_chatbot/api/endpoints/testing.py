@@ -6,7 +6,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Request
 
-from ...utils.tracing import LANGSMITH_ENABLED, process_chat_with_tracing
+from ...utils.tracing import LANGSMITH_ENABLED, aprocess_chat_with_tracing
 from ..dependencies import get_chatbot, limiter
 from ..models import ChatRequest
 
@@ -75,9 +75,11 @@ async def test_conversation():
     for i, message in enumerate(test_messages):
         try:
             if LANGSMITH_ENABLED:
-                response, trace_url = process_chat_with_tracing(message, thread_id)
+                response, trace_url = await aprocess_chat_with_tracing(
+                    message, thread_id
+                )
             else:
-                response = chatbot.chat(message, thread_id)
+                response = await chatbot.achat(message, thread_id)
                 trace_url = None
 
             results.append(
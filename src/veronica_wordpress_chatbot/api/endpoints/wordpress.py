@@ -2,10 +2,23 @@
 WordPress endpoints
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
 
-from ...config import Configuration
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pydantic import ValidationError
+
+from ...config import WEBHOOK_SECRET, WORDPRESS_FIELD_CONFIGS, Configuration
+from ...wordpress import build_fields_projection, get_payload_stats
+from ...wordpress.webhook import (
+    DELETE_ACTIONS,
+    SAVE_ACTIONS,
+    get_webhook_stats,
+    invalidate_content,
+    refresh_mirror_item,
+    verify_signature,
+)
 from ..dependencies import get_chatbot
+from ..models import WordPressWebhookEvent
 
 router = APIRouter()
 
@@ -18,8 +31,7 @@ async def test_wordpress():
         if chatbot is None:
             raise HTTPException(status_code=503, detail="Chatbot non inizializzato")
 
-        stats = chatbot.get_wordpress_stats()
-        return stats
+        return await asyncio.to_thread(chatbot.get_wordpress_stats)
 
     except Exception as e:
         return {"status": "error", "message": f"Errore nel test WordPress: {str(e)}"}
@@ -33,7 +45,7 @@ async def wordpress_stats():
         if chatbot is None:
             raise HTTPException(status_code=503, detail="Chatbot non inizializzato")
 
-        stats = chatbot.get_wordpress_stats()
+        stats = await asyncio.to_thread(chatbot.get_wordpress_stats)
 
         # Aggiungi informazioni aggiuntive
         config = Configuration()
@@ -54,3 +66,67 @@ async def wordpress_stats():
             "status": "error",
             "message": f"Errore nel recupero stats WordPress: {str(e)}",
         }
+
+
+@router.get("/projection")
+async def wordpress_projection():
+    """
+    Proiezione _fields per endpoint e byte registrati (nessuna richiesta a
+    WordPress: il confronto prima/dopo si misura con
+    ``python -m benchmarks.bench_projection``)
+    """
+    payload = get_payload_stats().stats()
+    return {
+        "status": "success",
+        "projection_enabled": payload["projection_enabled"],
+        "endpoints": {
+            endpoint: {
+                "fields": build_fields_projection(endpoint),
+                "payload": payload["endpoints"].get(endpoint, {}),
+            }
+            for endpoint in WORDPRESS_FIELD_CONFIGS
+        },
+    }
+
+
+@router.post("/webhook")
+async def wordpress_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Notifica di modifica dal plugin WordPress (save_post / trash / delete).
+
+    Richiede gli header ``X-Webhook-Timestamp`` e ``X-Webhook-Signature``
+    (``sha256=`` HMAC di ``<timestamp>.<body>`` con WORDPRESS_WEBHOOK_SECRET).
+    """
+    if not WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhook non configurato")
+
+    body = await request.body()
+    if not verify_signature(
+        body,
+        request.headers.get("X-Webhook-Timestamp"),
+        request.headers.get("X-Webhook-Signature"),
+        WEBHOOK_SECRET,
+    ):
+        get_webhook_stats().record_rejected()
+        raise HTTPException(status_code=401, detail="Firma webhook non valida")
+
+    try:
+        event = WordPressWebhookEvent.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    if event.action not in SAVE_ACTIONS | DELETE_ACTIONS:
+        raise HTTPException(
+            status_code=422, detail=f"Azione non valida: {event.action}"
+        )
+
+    invalidated = invalidate_content(
+        event.post_type, event.id, event.action, event.rest_base
+    )
+    if invalidated is None:
+        return {"status": "ignored", "post_type": event.post_type}
+
+    background_tasks.add_task(
+        refresh_mirror_item, invalidated["endpoint"], event.id, event.action
+    )
+    return {"status": "success", "invalidated": invalidated}
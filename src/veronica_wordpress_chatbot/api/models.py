@@ -1,5 +1,5 @@
 """
-Pydantic models for API requests/responses - Chat and Health
+Pydantic models for API requests/responses - Chat, Health and WordPress webhook
 """
 
 from typing import Any, Dict, List, Optional
@@ -61,3 +61,12 @@ class HealthResponse(BaseModel):
     status: str
     timestamp: str
     services: Dict[str, Any]
+
+
+class WordPressWebhookEvent(BaseModel):
+    """Modifica di un contenuto notificata dal plugin WordPress"""
+
+    post_type: str = Field(..., min_length=1, max_length=50)
+    id: int = Field(..., ge=1)
+    action: str = Field(..., description="save/update/publish o delete/trash/unpublish")
+    rest_base: Optional[str] = Field(default=None, max_length=50)
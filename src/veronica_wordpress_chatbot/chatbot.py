@@ -3,17 +3,78 @@ VeronicaChatbot class - Core chatbot logic with LangGraph
 and optimized WordPress endpoints
 """
 
-from typing import Any, Dict
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessageChunk, HumanMessage
 from langchain_core.runnables.config import RunnableConfig
 
+from .config import (
+    CHECKPOINT_BACKEND,
+    CHECKPOINT_PATH,
+    MIRROR_ENABLED,
+    SNAPSHOT_ENABLED,
+)
+from .tools import TOOL_PROGRESS
 from .utils.logging_config import setup_logging
-from .wordpress import get_wordpress_client
-from .workflow import create_graph
+from .wordpress import (
+    fan_out,
+    get_circuit_breakers,
+    get_content_mirror,
+    get_content_snapshot,
+    get_fanout_stats,
+    get_hedging_policy,
+    get_payload_stats,
+    get_pool_stats,
+    get_processed_cache,
+    get_query_stats,
+    get_response_cache,
+    get_revalidation_store,
+    get_search_index,
+    get_semantic_index,
+    get_single_flight,
+    get_taxonomy_cache,
+    get_wordpress_client,
+)
+from .wordpress.webhook import get_webhook_stats
+from .workflow import (
+    create_graph,
+    get_history_manager,
+    get_model_registry,
+    get_sqlite_checkpointer,
+)
 
 logger = setup_logging(__name__)
 
+# Endpoint controllati da get_wordpress_stats → metodo del client
+STATS_ENDPOINTS = {
+    "posts": "get_posts",
+    "projects": "get_projects",
+    "certifications": "get_certifications",
+    "work_experiences": "get_work_experiences",
+    "books": "get_books",
+    "tools": "get_tools",
+}
+
+
+def _endpoint_status(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Stato di un endpoint dal suo item più recente"""
+    return {
+        "working": len(items) > 0,
+        "count": len(items),
+        "latest": items[0].get("title", {}).get("rendered", "") if items else "Nessuno",
+    }
+
+
+def _response_text(result: Any) -> str:
+    """Testo dell'ultimo messaggio prodotto dal grafo"""
+    if result and "messages" in result:
+        last_message = result["messages"][-1]
+        if hasattr(last_message, "content"):
+            return str(last_message.content)
+
+    return "Mi dispiace, non sono riuscita a processare la tua richiesta."
+
 
 class VeronicaChatbot:
     """Chatbot Veronica con LangGraph e endpoint WordPress ottimizzati"""
@@ -47,18 +108,105 @@ class VeronicaChatbot:
             # Esegui il grafo
             result = self.graph.invoke(input_state, config)
 
-            # Estrai la risposta
-            if result and "messages" in result:
-                last_message = result["messages"][-1]
-                if hasattr(last_message, "content"):
-                    return str(last_message.content)
+            # Riassunto dei turni vecchi fuori dal critical path
+            get_history_manager().schedule_summary(self.graph, config)
 
-            return "Mi dispiace, non sono riuscita a processare la tua richiesta."
+            return _response_text(result)
 
         except Exception as e:
             logger.error(f"Errore nella chat: {e}", exc_info=True)
             return "Mi dispiace, c'è stato un errore. Riprova più tardi."
 
+    async def achat(self, message: str, thread_id: str = "default") -> str:
+        """
+        Versione async di chat (graph.ainvoke): modello e tools async, senza
+        bloccare l'event loop per tutta la durata della conversazione
+
+        Args:
+            message: Messaggio dell'utente
+            thread_id: ID del thread per la persistenza della conversazione
+        """
+        try:
+            config = RunnableConfig(configurable={"thread_id": thread_id})
+            input_state = {"messages": [HumanMessage(content=message)]}
+
+            result = await self.graph.ainvoke(input_state, config)
+
+            get_history_manager().schedule_summary(self.graph, config)
+
+            return _response_text(result)
+
+        except Exception as e:
+            logger.error(f"Errore nella chat: {e}", exc_info=True)
+            return "Mi dispiace, c'è stato un errore. Riprova più tardi."
+
+    async def astream_chat(
+        self, message: str, thread_id: str = "default"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Versione in streaming di achat (graph.astream). Produce eventi
+        ``{"event": ..., "data": {...}}``:
+
+        - ``tool``: il modello ha chiamato un tool (con messaggio di avanzamento)
+        - ``token``: testo della risposta man mano che il modello lo genera
+        - ``done``: risposta completa, salvata nel thread come con chat
+        - ``error``: la conversazione si è interrotta
+
+        Args:
+            message: Messaggio dell'utente
+            thread_id: ID del thread per la persistenza della conversazione
+        """
+        try:
+            config = RunnableConfig(configurable={"thread_id": thread_id})
+            input_state = {"messages": [HumanMessage(content=message)]}
+
+            async for mode, chunk in self.graph.astream(
+                input_state, config, stream_mode=["messages", "updates"]
+            ):
+                if mode == "messages":
+                    # Token del modello (non l'output dei tool)
+                    message_chunk, metadata = chunk
+                    content = message_chunk.content
+                    if (
+                        metadata.get("langgraph_node") == "agent"
+                        and isinstance(message_chunk, AIMessageChunk)
+                        and isinstance(content, str)
+                        and content
+                    ):
+                        yield {"event": "token", "data": {"content": content}}
+                    continue
+
+                # Fine di uno step agent: i tool che verranno eseguiti
+                for step_message in (chunk.get("agent") or {}).get("messages", []):
+                    for tool_call in getattr(step_message, "tool_calls", None) or []:
+                        name = tool_call["name"]
+                        yield {
+                            "event": "tool",
+                            "data": {
+                                "tool": name,
+                                "message": TOOL_PROGRESS.get(name, "Sto cercando…"),
+                            },
+                        }
+
+            state = await self.graph.aget_state(config)
+            get_history_manager().schedule_summary(self.graph, config)
+            yield {
+                "event": "done",
+                "data": {
+                    "response": _response_text(state.values),
+                    "thread_id": thread_id,
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Errore nella chat in streaming: {e}", exc_info=True)
+            yield {
+                "event": "error",
+                "data": {
+                    "message": "Mi dispiace, c'è stato un errore. Riprova più tardi."
+                },
+            }
+
     def get_wordpress_stats(self) -> Dict[str, Any]:
         """
         Ottieni statistiche WordPress per debugging/monitoring
@@ -69,73 +217,57 @@ class VeronicaChatbot:
         try:
             wp_client = get_wordpress_client()
 
-            # Test tutti gli endpoint
-            posts = wp_client.get_posts({"per_page": 1})
-            projects = wp_client.get_projects({"per_page": 1})
-            certifications = wp_client.get_certifications({"per_page": 1})
-            work_experiences = wp_client.get_work_experiences({"per_page": 1})
-            books = wp_client.get_books({"per_page": 1})
-            tools = wp_client.get_tools({"per_page": 1})
+            # Test tutti gli endpoint in parallelo, entro la deadline del fan-out
+            fetched = fan_out(
+                {
+                    endpoint: partial(getattr(wp_client, getter), {"per_page": 1})
+                    for endpoint, getter in STATS_ENDPOINTS.items()
+                }
+            )
 
             return {
                 "status": "success",
                 "wordpress_url": wp_client.base_url,
                 "endpoints_status": {
-                    "posts": {
-                        "working": len(posts) > 0,
-                        "count": len(posts),
-                        "latest": (
-                            posts[0].get("title", {}).get("rendered", "")
-                            if posts
-                            else "Nessuno"
-                        ),
-                    },
-                    "projects": {
-                        "working": len(projects) > 0,
-                        "count": len(projects),
-                        "latest": (
-                            projects[0].get("title", {}).get("rendered", "")
-                            if projects
-                            else "Nessuno"
-                        ),
-                    },
-                    "certifications": {
-                        "working": len(certifications) > 0,
-                        "count": len(certifications),
-                        "latest": (
-                            certifications[0].get("title", {}).get("rendered", "")
-                            if certifications
-                            else "Nessuno"
-                        ),
-                    },
-                    "work_experiences": {
-                        "working": len(work_experiences) > 0,
-                        "count": len(work_experiences),
-                        "latest": (
-                            work_experiences[0].get("title", {}).get("rendered", "")
-                            if work_experiences
-                            else "Nessuno"
-                        ),
-                    },
-                    "books": {
-                        "working": len(books) > 0,
-                        "count": len(books),
-                        "latest": (
-                            books[0].get("title", {}).get("rendered", "")
-                            if books
-                            else "Nessuno"
-                        ),
-                    },
-                    "tools": {
-                        "working": len(tools) > 0,
-                        "count": len(tools),
-                        "latest": (
-                            tools[0].get("title", {}).get("rendered", "")
-                            if tools
-                            else "Nessuno"
-                        ),
-                    },
+                    endpoint: (
+                        _endpoint_status(fetched.results[endpoint])
+                        if endpoint in fetched.results
+                        else {"working": False, "count": 0, "missing": True}
+                    )
+                    for endpoint in STATS_ENDPOINTS
                 },
+                "missing_endpoints": fetched.missing,
+                "http_pool": get_pool_stats(),
+                "cache": get_response_cache().stats(),
+                "processed_cache": get_processed_cache().stats(),
+                "taxonomy": get_taxonomy_cache().stats(),
+                "search_index": get_search_index().stats(),
+                "semantic_index": get_semantic_index().stats(),
+                "query_rewrite": get_query_stats().stats(),
+                "revalidation": get_revalidation_store().stats(),
+                "payload": get_payload_stats().stats(),
+                "coalescing": get_single_flight().stats(),
+                "fanout": get_fanout_stats().stats(),
+                "llm_registry": get_model_registry().stats(),
+                "history": get_history_manager().stats(),
+                "checkpointer": (
+                    get_sqlite_checkpointer(CHECKPOINT_PATH).stats()
+                    if CHECKPOINT_BACKEND == "sqlite"
+                    else {"backend": CHECKPOINT_BACKEND}
+                ),
+                "circuit_breakers": get_circuit_breakers().stats(),
+                "hedging": get_hedging_policy().stats(),
+                "webhook": get_webhook_stats().stats(),
+                "mirror": (
+                    get_content_mirror().stats()
+                    if MIRROR_ENABLED
+                    else {"enabled": False}
+                ),
+                "snapshot": (
+                    get_content_snapshot().stats()
+                    if SNAPSHOT_ENABLED
+                    else {"enabled": False}
+                ),
             }
 
         except Exception as e:
@@ -3,6 +3,7 @@ Configuration module for Veronica WordPress Chatbot
 Centralizes all configuration classes and constants
 """
 
+import os
 from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
@@ -23,24 +24,32 @@ class Configuration:
 
 
 # WordPress API field configurations for each endpoint
+# fields: campi top-level letti da ContentProcessor (inviati come _fields)
+# acf_fields: campi ACF letti dal processore (inviati come acf.<campo>)
+# cache_ttl: secondi di validità delle risposte in cache per l'endpoint
+# taxonomy: tassonomia WordPress delle categorie dell'endpoint (vedi taxonomy.py)
+# categories: termini noti della tassonomia (ID → nome), usati finché i termini
+#   non sono stati scaricati da WordPress o se WordPress non risponde
 WORDPRESS_FIELD_CONFIGS = {
     "posts": {
-        "fields": "id,date,title,content,excerpt,link,categories,tags,author,featured_media,yoast_head_json",
+        "fields": "id,modified,date,title,content,excerpt,link",
+        "cache_ttl": 300,
         "description": "Articoli del blog completi",
     },
     "projects": {
-        "fields": "id,date,title,content,excerpt,link,acf,project-category,featured_media",
+        "fields": "id,modified,date,title,content,link,project-category",
         "acf_fields": [
             "project_external_url",
             "project_preview_text",
             "project_repository",
             "project_frontend",
-            "project_single_page",
         ],
+        "taxonomy": "project-category",
+        "cache_ttl": 3600,
         "description": "Progetti portfolio con ACF",
     },
     "certifications": {
-        "fields": "id,date,title,content,link,acf",
+        "fields": "id,modified,date,title,content",
         "acf_fields": [
             "ente_certificazione",
             "descrizione_certificazione",
@@ -49,32 +58,44 @@ WORDPRESS_FIELD_CONFIGS = {
             "link_corso",
             "link_progetto",
         ],
+        "cache_ttl": 3600,
         "description": "Certificazioni e formazione",
     },
     "work-experiences": {
-        "fields": "id,date,title,content,link,acf",
-        "acf_fields": ["qualifica_work", "azienda_work", "descrizione_work", "start_work", "end_work"],
+        "fields": "id,modified,date,title",
+        "acf_fields": [
+            "qualifica_work",
+            "azienda_work",
+            "descrizione_work",
+            "start_work",
+            "end_work",
+        ],
+        "cache_ttl": 3600,
         "description": "Esperienze lavorative",
     },
     "books": {
-        "fields": "id,date,title,content,excerpt,link,acf,book-category",
-        "acf_fields": ["books_author", "book_rating", "book_review", "book_status"],
+        "fields": "id,modified,date,title,content",
+        "acf_fields": ["books_author", "books_link"],
+        "cache_ttl": 3600,
         "description": "Libri letti e recensiti",
     },
     "tools": {
-        "fields": "id,date,title,content,tool-category",
+        "fields": "id,modified,date,title,content,tool-category",
         "acf_fields": [],  # Non ci sono campi ACF per tools
+        "taxonomy": "tool-category",
         "categories": {
             13: "Strumenti",
             14: "Have fun",
             15: "Organizzare",
             16: "Catturare"
         },
+        "cache_ttl": 3600,
         "description": "Strumenti personali divisi per categoria",
     },
     "stacks": {
-        "fields": "id,date,title,content,stack-category",
+        "fields": "id,modified,date,title,content,stack-category",
         "acf_fields": [],  # Non ci sono campi ACF per stacks
+        "taxonomy": "stack-category",
         "categories": {
             2: "AI Engineering & Machine Learning",
             25: "Design",
@@ -82,10 +103,27 @@ WORDPRESS_FIELD_CONFIGS = {
             12: "Front-End Dev",
             92: "MLOps & DevOps"
         },
+        "cache_ttl": 3600,
         "description": "Stack tecnologico professionale diviso per categoria",
     },
 }
 
+# Campi extra da richiedere senza modificare il codice, es.
+# WORDPRESS_EXTRA_FIELDS="posts:categories,tags;projects:featured_media"
+WORDPRESS_EXTRA_FIELDS: Dict[str, List[str]] = {
+    endpoint.strip(): [f.strip() for f in fields.split(",") if f.strip()]
+    for endpoint, _, fields in (
+        entry.partition(":")
+        for entry in os.getenv("WORDPRESS_EXTRA_FIELDS", "").split(";")
+        if ":" in entry
+    )
+}
+
+# Proiezione _fields attiva (disattivabile per debug)
+FIELDS_PROJECTION_ENABLED = (
+    os.getenv("WORDPRESS_FIELDS_PROJECTION", "true").lower() == "true"
+)
+
 # API constants
 DEFAULT_REQUEST_PARAMS = {
     "per_page": 50,
@@ -93,8 +131,170 @@ DEFAULT_REQUEST_PARAMS = {
     "order": "desc",
 }
 
-# Request timeouts
-REQUEST_TIMEOUT = 15
+# Paginazione completa (iter_*): massimo consentito da WordPress per pagina
+# e numero di pagine scaricate in parallelo
+ITER_PER_PAGE = 100
+ITER_MAX_CONCURRENCY = 4
+
+# Request timeouts per singolo tentativo (connessione, lettura): un host lento
+# non tiene occupato un worker per più di qualche secondo
+REQUEST_CONNECT_TIMEOUT = float(os.getenv("WORDPRESS_CONNECT_TIMEOUT", "3"))
+REQUEST_READ_TIMEOUT = float(os.getenv("WORDPRESS_READ_TIMEOUT", "5"))
+REQUEST_TIMEOUT = (REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT)
+
+# HTTP connection pool condiviso da tutti i client WordPress
+# pool_connections: numero di host distinti tenuti in cache
+# pool_maxsize: connessioni keep-alive riutilizzabili per host
+HTTP_POOL_CONNECTIONS = int(os.getenv("WORDPRESS_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("WORDPRESS_POOL_MAXSIZE", "20"))
+HTTP_USER_AGENT = "veronica-wordpress-chatbot/2.0"
+
+# Cache delle risposte WordPress (TTL per endpoint in WORDPRESS_FIELD_CONFIGS)
+CACHE_ENABLED = os.getenv("WORDPRESS_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_BYTES = int(os.getenv("WORDPRESS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_DEFAULT_TTL = 600
+# Per quanto una risposta scaduta può essere servita mentre si aggiorna
+CACHE_STALE_TTL = 24 * 3600
+
+# Termini delle tassonomie (tool-category, stack-category, project-category):
+# scaricati in blocco e riusati per TAXONOMY_CACHE_TTL secondi
+TAXONOMY_CACHE_TTL = float(os.getenv("WORDPRESS_TAXONOMY_TTL", "3600"))
+
+# Documenti già processati da ContentProcessor, per revisione (id, modified)
+# 0 disattiva la cache
+PROCESSED_CACHE_MAX_BYTES = int(
+    os.getenv("WORDPRESS_PROCESSED_CACHE_MAX_BYTES", str(8 * 1024 * 1024))
+)
+
+# Webhook WordPress (POST /wordpress/webhook firmato HMAC-SHA256): con il
+# secret configurato le modifiche arrivano via push e la cache può usare TTL
+# lunghi, invalidando solo l'endpoint interessato
+WEBHOOK_SECRET = os.getenv("WORDPRESS_WEBHOOK_SECRET", "")
+WEBHOOK_TOLERANCE = 300  # secondi di scarto massimo del timestamp firmato
+CACHE_WEBHOOK_TTL = int(os.getenv("WORDPRESS_CACHE_WEBHOOK_TTL", str(7 * 24 * 3600)))
+
+# Conditional GET (If-None-Match / If-Modified-Since) sulle richieste ripetute
+CONDITIONAL_GET_ENABLED = (
+    os.getenv("WORDPRESS_CONDITIONAL_GET", "true").lower() == "true"
+)
+REVALIDATION_MAX_ENTRIES = 256
+
+# Retry delle GET fallite per errori transitori (connessione, 5xx/429)
+# RETRY_MAX_ATTEMPTS: tentativi totali; backoff esponenziale con full jitter.
+# Un read timeout non viene ritentato (l'host è lento: un retry raddoppia
+# l'attesa) e nessun retry parte se sforerebbe RETRY_DEADLINE secondi totali
+RETRY_MAX_ATTEMPTS = int(os.getenv("WORDPRESS_RETRY_ATTEMPTS", "2"))
+RETRY_DEADLINE = float(os.getenv("WORDPRESS_RETRY_DEADLINE", "8"))
+RETRY_BACKOFF_BASE = 0.25
+RETRY_BACKOFF_MAX = 2.0
+
+# Circuit breaker per endpoint: dopo N errori consecutivi le richieste
+# falliscono subito (servendo la cache stale) per CIRCUIT_RESET_TIMEOUT secondi
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("WORDPRESS_CIRCUIT_THRESHOLD", "3"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("WORDPRESS_CIRCUIT_RESET", "30"))
+
+# Hedged requests (opt-in): se una GET non risponde entro il percentile
+# HEDGING_PERCENTILE delle latenze recenti dell'endpoint parte una seconda
+# richiesta identica. HEDGING_MAX_RATIO limita le richieste extra rispetto
+# al totale; sotto HEDGING_MIN_SAMPLES campioni non si fa hedging
+HEDGING_ENABLED = os.getenv("WORDPRESS_HEDGING", "false").lower() == "true"
+HEDGING_PERCENTILE = float(os.getenv("WORDPRESS_HEDGING_PERCENTILE", "95"))
+HEDGING_MAX_RATIO = float(os.getenv("WORDPRESS_HEDGING_MAX_RATIO", "0.1"))
+HEDGING_MIN_SAMPLES = 20
+HEDGING_WINDOW = 200
+HEDGING_MIN_DELAY = 0.05
+
+# Fan-out dei tool che interrogano più endpoint: le richieste partono in
+# parallelo e dopo FANOUT_DEADLINE secondi il tool risponde con le sezioni
+# già arrivate, indicando quelle mancanti
+FANOUT_DEADLINE = float(os.getenv("WORDPRESS_FANOUT_DEADLINE", "8"))
+
+# Mirror SQLite locale dei contenuti: i tool leggono dal database e WordPress
+# viene sincronizzato in background (full sync iniziale, poi incrementale con
+# modified_after e rilevamento delle cancellazioni)
+MIRROR_ENABLED = os.getenv("WORDPRESS_MIRROR", "false").lower() == "true"
+MIRROR_PATH = os.getenv("WORDPRESS_MIRROR_PATH", "data/wordpress_mirror.sqlite3")
+MIRROR_SYNC_INTERVAL = float(os.getenv("WORDPRESS_MIRROR_SYNC_INTERVAL", "300"))
+
+# Snapshot offline: bundle compresso con tutte le collezioni (raw + processate)
+# generato dalla CLI ``python -m src.veronica_wordpress_chatbot.wordpress.snapshot``.
+# Con WORDPRESS_SNAPSHOT=true i client leggono solo dal bundle, senza rete
+SNAPSHOT_ENABLED = os.getenv("WORDPRESS_SNAPSHOT", "false").lower() == "true"
+SNAPSHOT_PATH = os.getenv("WORDPRESS_SNAPSHOT_PATH", "data/wordpress_snapshot.bin")
+
+# Indice di ricerca locale (BM25) usato da search_all_content: costruito alla
+# prima ricerca (o all'avvio) e aggiornato in background in modo incrementale
+# ogni SEARCH_INDEX_REFRESH secondi. Se non è disponibile la ricerca usa ?search=
+SEARCH_INDEX_ENABLED = os.getenv("WORDPRESS_SEARCH_INDEX", "true").lower() == "true"
+SEARCH_INDEX_REFRESH = float(os.getenv("WORDPRESS_SEARCH_INDEX_REFRESH", "300"))
+
+# Riscrittura delle query prima di ?search=: WordPress cerca ogni parola con
+# LIKE e le mette in AND, quindi frasi intere non trovano nulla. Restano al
+# massimo SEARCH_QUERY_MAX_TERMS parole chiave
+SEARCH_QUERY_MAX_TERMS = int(os.getenv("WORDPRESS_SEARCH_MAX_TERMS", "3"))
+
+# Sinonimi per la ricerca: termine usato nei contenuti del sito → forme con
+# cui utenti e modello lo chiedono (confronto senza maiuscole e accenti)
+SEARCH_SYNONYMS: Dict[str, List[str]] = {
+    "LLM": [
+        "LLMs",
+        "modelli linguistici",
+        "modello linguistico",
+        "large language model",
+        "large language models",
+        "language model",
+        "language models",
+    ],
+    "AI": ["IA", "intelligenza artificiale", "artificial intelligence"],
+    "machine learning": ["ML", "apprendimento automatico"],
+    "deep learning": ["apprendimento profondo"],
+    "RAG": ["retrieval augmented generation", "retrieval-augmented generation"],
+    # "agent" è sottostringa di agente/agenti/agents: LIKE li trova tutti
+    "agent": ["agente", "agenti", "agents", "agentic"],
+    "chatbot": ["chat bot", "chatbots", "assistente virtuale", "assistenti virtuali"],
+    "data science": ["scienza dei dati"],
+    "NLP": ["natural language processing", "elaborazione del linguaggio naturale"],
+}
+
+# Indice semantico (vettori densi in NumPy) usato da semantic_search: costruito
+# sui documenti dell'indice di ricerca e salvato in file .npy mappati in memoria
+# condivisi dai worker (SEMANTIC_INDEX_PATH vuoto = solo in memoria). Embedder:
+# "hashed" (n-grammi hashati + SVD, offline su CPU) oppure "openai"
+SEMANTIC_INDEX_ENABLED = (
+    os.getenv("WORDPRESS_SEMANTIC_INDEX", "true").lower() == "true"
+)
+SEMANTIC_INDEX_PATH = os.getenv("WORDPRESS_SEMANTIC_INDEX_PATH", "data/semantic_index")
+SEMANTIC_EMBEDDER = os.getenv("WORDPRESS_SEMANTIC_EMBEDDER", "hashed").lower()
+SEMANTIC_EMBEDDING_MODEL = os.getenv(
+    "WORDPRESS_SEMANTIC_EMBEDDING_MODEL", "text-embedding-3-small"
+)
+SEMANTIC_DIMENSIONS = int(os.getenv("WORDPRESS_SEMANTIC_DIMENSIONS", "128"))
+
+# Persistenza delle conversazioni (checkpointer LangGraph): di default
+# "memory" li tiene in memoria nel processo (MemorySaver, come prima);
+# "sqlite" (opt-in) salva i checkpoint in un database locale in WAL condiviso
+# dai worker che sopravvive ai deploy.
+# Per thread restano gli ultimi CHECKPOINT_KEEP checkpoint; i thread inattivi
+# da più di CHECKPOINT_TTL secondi vengono cancellati dalla manutenzione in
+# background (ogni CHECKPOINT_VACUUM_INTERVAL secondi, con vacuum incrementale)
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "memory").lower()
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "data/checkpoints.sqlite3")
+CHECKPOINT_KEEP = int(os.getenv("CHECKPOINT_KEEP", "10"))
+CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", str(7 * 24 * 3600)))
+CHECKPOINT_VACUUM_INTERVAL = float(os.getenv("CHECKPOINT_VACUUM_INTERVAL", "3600"))
+# Checkpoint serializzati più grandi di così vengono compressi con zlib
+CHECKPOINT_COMPRESS_MIN_BYTES = 1024
+
+# History inviata al modello: al massimo HISTORY_TOKEN_BUDGET token stimati
+# (i turni più vecchi vengono esclusi), output dei tool dei turni precedenti
+# ridotti a un'anteprima. Quando i turni superano 2 * HISTORY_KEEP_TURNS (o il
+# budget) la conversazione viene riassunta in background dopo la risposta fino
+# agli ultimi HISTORY_KEEP_TURNS turni (riassunto progressivo nello state)
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "8000"))
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "6"))
+HISTORY_SUMMARY_ENABLED = os.getenv("HISTORY_SUMMARY", "true").lower() == "true"
+# Caratteri tenuti di un output di tool già usato in un turno precedente
+HISTORY_TOOL_PREVIEW_CHARS = 200
 
 # Contact information
 CONTACT_INFO = {
@@ -7,7 +7,24 @@ import uvicorn
 from .api import create_app
 from .api.dependencies import set_chatbot
 from .chatbot import VeronicaChatbot
+from .config import (
+    CHECKPOINT_BACKEND,
+    MIRROR_ENABLED,
+    SEARCH_INDEX_ENABLED,
+    SEMANTIC_INDEX_ENABLED,
+    SNAPSHOT_ENABLED,
+)
 from .utils.tracing import setup_langsmith
+from .wordpress import (
+    close_http_session,
+    get_content_snapshot,
+    get_wordpress_client,
+    start_mirror_sync,
+    stop_mirror_sync,
+    warm_search_index,
+    warm_semantic_index,
+)
+from .workflow import start_checkpoint_vacuum, stop_checkpoint_vacuum
 
 # Create FastAPI app
 app = create_app()
@@ -25,12 +42,40 @@ async def startup_event():
         # Initialize chatbot and set in dependencies
         set_chatbot(VeronicaChatbot())
 
+        # Snapshot offline: il bundle viene aperto subito (errore all'avvio
+        # se manca) e WordPress non viene mai contattato
+        if SNAPSHOT_ENABLED:
+            get_content_snapshot()
+        # Mirror SQLite: sincronizzazione WordPress fuori dal request path
+        elif MIRROR_ENABLED:
+            start_mirror_sync()
+
+        # Indice di ricerca costruito in background: la prima ricerca non
+        # deve scaricare tutte le collezioni
+        if SEARCH_INDEX_ENABLED:
+            warm_search_index(get_wordpress_client())
+        # Indice semantico: caricato dai file condivisi se un altro worker
+        # lo ha già costruito sugli stessi documenti
+        if SEMANTIC_INDEX_ENABLED:
+            warm_semantic_index(get_wordpress_client())
+        # Conversazioni su SQLite: thread scaduti cancellati in background
+        if CHECKPOINT_BACKEND == "sqlite":
+            start_checkpoint_vacuum()
+
         print("✅ Chatbot inizializzato con successo!")
     except Exception as e:
         print(f"❌ Errore inizializzazione chatbot: {e}")
         set_chatbot(None)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Ferma sync del mirror e manutenzione, chiude le connessioni HTTP"""
+    stop_mirror_sync()
+    stop_checkpoint_vacuum()
+    close_http_session()
+
+
 if __name__ == "__main__":
     print("🚀 Starting Veronica Schembri WordPress Chatbot API v2.0...")
     print("📍 Local server: http://localhost:8000")
@@ -15,6 +15,8 @@ class State(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
     wordpress_url: str
     user_info: Dict[str, Any]
+    # Riassunto dei turni tolti dalla history (vedi workflow/history.py)
+    summary: str
 
 
 class InputState(TypedDict):
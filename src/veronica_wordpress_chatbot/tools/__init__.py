@@ -6,7 +6,7 @@ from .blog_tools import get_latest_blog_post, search_blog_posts
 from .content_tools import get_books_and_reading, get_tools_and_stack
 from .portfolio_tools import get_portfolio_projects
 from .profile_tools import get_certifications, get_work_experience
-from .search_tools import get_contact_info, search_all_content
+from .search_tools import get_contact_info, search_all_content, semantic_search
 
 # Lista dei tools ottimizzati (same order as original)
 TOOLS = [
@@ -18,9 +18,24 @@ TOOLS = [
     get_books_and_reading,
     get_tools_and_stack,
     search_all_content,
+    semantic_search,
     get_contact_info,
 ]
 
+# Messaggi di avanzamento mostrati in /chat/stream quando il modello chiama un tool
+TOOL_PROGRESS = {
+    "search_blog_posts": "Sto cercando negli articoli del blog…",
+    "get_latest_blog_post": "Sto recuperando l'ultimo articolo…",
+    "get_portfolio_projects": "Sto cercando nei progetti…",
+    "get_certifications": "Sto recuperando le certificazioni…",
+    "get_work_experience": "Sto recuperando le esperienze lavorative…",
+    "get_books_and_reading": "Sto cercando tra i libri letti…",
+    "get_tools_and_stack": "Sto recuperando strumenti e stack tecnologico…",
+    "search_all_content": "Sto cercando in tutti i contenuti…",
+    "semantic_search": "Sto cercando i contenuti più pertinenti…",
+    "get_contact_info": "Sto recuperando i contatti…",
+}
+
 
 def get_all_tools():
     """Restituisce tutti i tools disponibili"""
@@ -29,6 +44,7 @@ def get_all_tools():
 
 __all__ = [
     "TOOLS",
+    "TOOL_PROGRESS",
     "get_all_tools",
     "search_blog_posts",
     "get_latest_blog_post",
@@ -38,5 +54,6 @@ __all__ = [
     "get_books_and_reading",
     "get_tools_and_stack",
     "search_all_content",
+    "semantic_search",
     "get_contact_info",
 ]
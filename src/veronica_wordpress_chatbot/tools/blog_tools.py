@@ -3,11 +3,78 @@ Blog-related tools - search posts, get latest post
 """
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from langchain_core.tools import tool
 
-from ..wordpress import ContentProcessor, get_wordpress_client
+from ..wordpress import (
+    ContentProcessor,
+    dumps_result,
+    get_async_wordpress_client,
+    get_query_stats,
+    get_wordpress_client,
+    rewrite_query,
+    with_stale_notice,
+)
+
+
+def _search_params(query: str, limit: int) -> Dict[str, Any]:
+    """Parametri WordPress per la ricerca articoli (query riscritta in parole chiave)"""
+    params: Dict[str, Any] = {"per_page": limit}
+    if query.strip():
+        params["search"] = rewrite_query(query)
+    return params
+
+
+def _search_results(
+    posts: List[Dict[str, Any]], query: str, params: Dict[str, Any]
+) -> str:
+    """Serializza i risultati della ricerca articoli"""
+    searched = params.get("search", "")
+    if searched:
+        get_query_stats().record(query, searched, len(posts))
+
+    if not posts:
+        return json.dumps(
+            {
+                "message": f"Nessun articolo trovato"
+                + (f" per la ricerca: {query}" if query else "")
+                + (f" (parole chiave: {searched})" if searched != query else ""),
+                "total": 0,
+                "articles": [],
+            }
+        )
+
+    results = []
+    for post in posts:
+        processed = ContentProcessor.process_post(post)
+        results.append(processed)
+
+    return dumps_result(
+        with_stale_notice(
+            {
+                "total": len(results),
+                "search_query": query if query else "ultimi articoli",
+                "articles": results,
+            },
+            posts,
+        )
+    )
+
+
+def _latest_result(posts: List[Dict[str, Any]]) -> str:
+    """Serializza l'ultimo articolo pubblicato"""
+    if not posts:
+        return json.dumps({"message": "Nessun articolo trovato"})
+
+    processed = ContentProcessor.process_post(posts[0])
+
+    return dumps_result(
+        with_stale_notice(
+            {"latest_article": processed, "message": "Ultimo articolo pubblicato"},
+            posts,
+        )
+    )
 
 
 @tool
@@ -23,34 +90,24 @@ def search_blog_posts(query: str = "", limit: int = 5) -> str:
     try:
         wp_client = get_wordpress_client()
 
-        params: Dict[str, Any] = {"per_page": limit}
-        if query.strip():
-            params["search"] = query
-
+        params = _search_params(query, limit)
         posts = wp_client.get_posts(params)
 
-        if not posts:
-            return json.dumps(
-                {
-                    "message": f"Nessun articolo trovato"
-                    + (f" per la ricerca: {query}" if query else ""),
-                    "total": 0,
-                    "articles": [],
-                }
-            )
-
-        results = []
-        for post in posts:
-            processed = ContentProcessor.process_post(post)
-            results.append(processed)
+        return _search_results(posts, query, params)
 
-        return json.dumps(
-            {
-                "total": len(results),
-                "search_query": query if query else "ultimi articoli",
-                "articles": results,
-            }
-        )
+    except Exception as e:
+        return json.dumps({"error": f"Errore nella ricerca articoli: {str(e)}"})
+
+
+async def _asearch_blog_posts(query: str = "", limit: int = 5) -> str:
+    """Versione async di search_blog_posts (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        params = _search_params(query, limit)
+        posts = await wp_client.get_posts(params)
+
+        return _search_results(posts, query, params)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nella ricerca articoli: {str(e)}"})
@@ -64,14 +121,25 @@ def get_latest_blog_post() -> str:
 
         posts = wp_client.get_posts({"per_page": 1})
 
-        if not posts:
-            return json.dumps({"message": "Nessun articolo trovato"})
+        return _latest_result(posts)
 
-        processed = ContentProcessor.process_post(posts[0])
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero ultimo articolo: {str(e)}"})
 
-        return json.dumps(
-            {"latest_article": processed, "message": "Ultimo articolo pubblicato"}
-        )
+
+async def _aget_latest_blog_post() -> str:
+    """Versione async di get_latest_blog_post (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        posts = await wp_client.get_posts({"per_page": 1})
+
+        return _latest_result(posts)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero ultimo articolo: {str(e)}"})
+
+
+# ainvoke usa il client async invece di occupare un thread per la I/O
+search_blog_posts.coroutine = _asearch_blog_posts  # type: ignore[attr-defined]
+get_latest_blog_post.coroutine = _aget_latest_blog_post  # type: ignore[attr-defined]
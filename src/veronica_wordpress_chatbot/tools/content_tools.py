@@ -3,10 +3,123 @@ Content-related tools (books, tools stack)
 """
 
 import json
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
 
 from langchain_core.tools import tool
 
-from ..wordpress import ContentProcessor, get_wordpress_client
+from ..wordpress import (
+    ENDPOINT_TAXONOMIES,
+    ContentProcessor,
+    ContentRecord,
+    afan_out,
+    dumps_result,
+    fan_out,
+    get_async_wordpress_client,
+    get_taxonomy_cache,
+    get_wordpress_client,
+    with_missing_notice,
+    with_stale_notice,
+)
+
+# Tassonomie delle categorie di tools e stacks
+_TOOLS_TAXONOMIES = (ENDPOINT_TAXONOMIES["tools"], ENDPOINT_TAXONOMIES["stacks"])
+
+# Endpoint → sezione del risultato di get_tools_and_stack
+_TOOLS_SECTIONS = {"tools": "personal_tools", "stacks": "professional_stack"}
+
+
+def _books_result(books: List[Dict[str, Any]]) -> str:
+    """Serializza i libri letti"""
+    if not books:
+        return json.dumps({"message": "Nessun libro trovato", "total": 0, "books": []})
+
+    results = []
+    for book in books:
+        processed = ContentProcessor.process_book(book)
+        results.append(processed)
+
+    return dumps_result(
+        with_stale_notice({"total": len(results), "books": results}, books)
+    )
+
+
+def _tools_and_stack_params(
+    category: str, limit: int
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Parametri delle richieste a tools e stacks con il filtro per categoria
+    spinto su WordPress come ID dei termini (es. ``tool-category=13,15``).
+
+    Returns:
+        Mappa endpoint → params, con None se nessun termine della tassonomia
+        corrisponde alla categoria (la richiesta non serve)
+    """
+    taxonomy_cache = get_taxonomy_cache()
+    requests: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    for endpoint in ("tools", "stacks"):
+        params: Dict[str, Any] = {"per_page": limit}
+        taxonomy = ENDPOINT_TAXONOMIES[endpoint]
+        term_ids = taxonomy_cache.resolve(taxonomy, category) if category else None
+
+        # None: termini sconosciuti, resta solo il filtro locale sui nomi
+        if term_ids is not None:
+            if not term_ids:
+                requests[endpoint] = None
+                continue
+            params[taxonomy] = ",".join(str(term_id) for term_id in term_ids)
+
+        requests[endpoint] = params
+
+    return requests
+
+
+def _matches_category(categories: Iterable[str], category: str) -> bool:
+    """True se la categoria richiesta è vuota o compare tra le categorie"""
+    category = category.lower()
+    return not category or any(category in name.lower() for name in categories)
+
+
+def _tools_and_stack_result(
+    tools: List[Dict[str, Any]],
+    stacks: List[Dict[str, Any]],
+    category: str,
+    missing: Iterable[str] = (),
+) -> str:
+    """
+    Processa, filtra per categoria e serializza tools e stacks.
+
+    Il filtro locale sui nomi resta per i client che ignorano il parametro
+    della tassonomia (costa poco: gli item sono già filtrati da WordPress).
+    Gli endpoint in ``missing`` (oltre la deadline) sono indicati come
+    sezioni mancanti.
+    """
+    results: Dict[str, List[ContentRecord]] = {
+        "personal_tools": [],  # Strumenti uso personale
+        "professional_stack": [],  # Stack tecnologico lavoro
+    }
+
+    # Processa tools e stacks, filtrati per categoria se specificata
+    for item in tools:
+        processed = ContentProcessor.process_tool(item)
+        if _matches_category(processed.categories, category):
+            results["personal_tools"].append(processed)
+
+    for stack in stacks:
+        processed = ContentProcessor.process_stack(stack)
+        if _matches_category(processed.categories, category):
+            results["professional_stack"].append(processed)
+
+    result = {
+        "total_personal": len(results["personal_tools"]),
+        "total_professional": len(results["professional_stack"]),
+        "data": results,
+    }
+    sections = [_TOOLS_SECTIONS[endpoint] for endpoint in missing]
+    return dumps_result(
+        with_missing_notice(with_stale_notice(result, tools, stacks), sections)
+    )
 
 
 @tool
@@ -17,17 +130,20 @@ def get_books_and_reading(limit: int = 10) -> str:
 
         books = wp_client.get_books({"per_page": limit})
 
-        if not books:
-            return json.dumps(
-                {"message": "Nessun libro trovato", "total": 0, "books": []}
-            )
+        return _books_result(books)
 
-        results = []
-        for book in books:
-            processed = ContentProcessor.process_book(book)
-            results.append(processed)
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero libri: {str(e)}"})
 
-        return json.dumps({"total": len(results), "books": results})
+
+async def _aget_books_and_reading(limit: int = 10) -> str:
+    """Versione async di get_books_and_reading (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        books = await wp_client.get_books({"per_page": limit})
+
+        return _books_result(books)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero libri: {str(e)}"})
@@ -44,34 +160,57 @@ def get_tools_and_stack(category: str = "", limit: int = 20) -> str:
     try:
         wp_client = get_wordpress_client()
 
-        # Recupera sia tools che stacks
-        tools = wp_client.get_tools({"per_page": limit})
-        stacks = wp_client.get_stacks({"per_page": limit})
-
-        results = {
-            "personal_tools": [],  # Strumenti uso personale
-            "professional_stack": []  # Stack tecnologico lavoro
-        }
-
-        # Processa tools
-        for tool in tools:
-            processed = ContentProcessor.process_tool(tool)
-            # Filtra per categoria se specificata
-            if not category or any(category.lower() in cat.lower() for cat in processed["categories"]):
-                results["personal_tools"].append(processed)
-
-        # Processa stacks
-        for stack in stacks:
-            processed = ContentProcessor.process_stack(stack)
-            # Filtra per categoria se specificata
-            if not category or any(category.lower() in cat.lower() for cat in processed["categories"]):
-                results["professional_stack"].append(processed)
-
-        return json.dumps({
-            "total_personal": len(results["personal_tools"]),
-            "total_professional": len(results["professional_stack"]),
-            "data": results
-        })
+        # Termini aggiornati per i nomi delle categorie e il filtro per ID
+        get_taxonomy_cache().ensure(wp_client, _TOOLS_TAXONOMIES)
+        params = _tools_and_stack_params(category, limit)
+
+        # Recupera tools e stacks in parallelo
+        fetched = fan_out(
+            {
+                endpoint: partial(getattr(wp_client, f"get_{endpoint}"), request)
+                for endpoint, request in params.items()
+                if request is not None
+            }
+        )
+
+        return _tools_and_stack_result(
+            fetched.get("tools", []),
+            fetched.get("stacks", []),
+            category,
+            fetched.missing,
+        )
+
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero strumenti: {str(e)}"})
+
+
+async def _aget_tools_and_stack(category: str = "", limit: int = 20) -> str:
+    """Versione async di get_tools_and_stack (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        await get_taxonomy_cache().aensure(wp_client, _TOOLS_TAXONOMIES)
+        params = _tools_and_stack_params(category, limit)
+
+        fetched = await afan_out(
+            {
+                endpoint: partial(getattr(wp_client, f"get_{endpoint}"), request)
+                for endpoint, request in params.items()
+                if request is not None
+            }
+        )
+
+        return _tools_and_stack_result(
+            fetched.get("tools", []),
+            fetched.get("stacks", []),
+            category,
+            fetched.missing,
+        )
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero strumenti: {str(e)}"})
+
+
+# ainvoke usa il client async invece di occupare un thread per la I/O
+get_books_and_reading.coroutine = _aget_books_and_reading  # type: ignore[attr-defined]
+get_tools_and_stack.coroutine = _aget_tools_and_stack  # type: ignore[attr-defined]
@@ -3,10 +3,56 @@ Portfolio-related tools
 """
 
 import json
+from typing import Any, Dict, List
 
 from langchain_core.tools import tool
 
-from ..wordpress import ContentProcessor, get_wordpress_client
+from ..wordpress import (
+    ENDPOINT_TAXONOMIES,
+    ContentProcessor,
+    dumps_result,
+    get_async_wordpress_client,
+    get_taxonomy_cache,
+    get_wordpress_client,
+    with_stale_notice,
+)
+
+_PROJECT_TAXONOMY = ENDPOINT_TAXONOMIES["projects"]
+
+
+def _projects_result(projects: List[Dict[str, Any]]) -> str:
+    """Serializza i progetti del portfolio"""
+    if not projects:
+        return json.dumps(
+            {
+                "message": "Nessun progetto trovato nel portfolio",
+                "total": 0,
+                "projects": [],
+            }
+        )
+
+    results = []
+    for project in projects:
+        processed = ContentProcessor.process_project(project)
+        results.append(processed)
+
+    return dumps_result(
+        with_stale_notice({"total": len(results), "projects": results}, projects)
+    )
+
+
+def _projects_params(category: str, limit: int) -> Dict[str, Any]:
+    """
+    Parametri della richiesta ai progetti, con il filtro per categoria spinto
+    su WordPress come ID dei termini di project-category. Se nessun termine
+    corrisponde la categoria viene ignorata (come prima del filtro).
+    """
+    params: Dict[str, Any] = {"per_page": limit}
+    if category:
+        term_ids = get_taxonomy_cache().resolve(_PROJECT_TAXONOMY, category)
+        if term_ids:
+            params[_PROJECT_TAXONOMY] = ",".join(str(term_id) for term_id in term_ids)
+    return params
 
 
 @tool
@@ -21,26 +67,34 @@ def get_portfolio_projects(category: str = "", limit: int = 10) -> str:
     try:
         wp_client = get_wordpress_client()
 
-        params = {"per_page": limit}
-        # Note: category filtering può essere implementato se necessario
+        if category:
+            get_taxonomy_cache().ensure(wp_client, (_PROJECT_TAXONOMY,))
 
-        projects = wp_client.get_projects(params)
+        projects = wp_client.get_projects(_projects_params(category, limit))
 
-        if not projects:
-            return json.dumps(
-                {
-                    "message": "Nessun progetto trovato nel portfolio",
-                    "total": 0,
-                    "projects": [],
-                }
-            )
+        return _projects_result(projects)
 
-        results = []
-        for project in projects:
-            processed = ContentProcessor.process_project(project)
-            results.append(processed)
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero progetti: {str(e)}"})
+
+
+async def _aget_portfolio_projects(category: str = "", limit: int = 10) -> str:
+    """Versione async di get_portfolio_projects (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
 
-        return json.dumps({"total": len(results), "projects": results})
+        if category:
+            await get_taxonomy_cache().aensure(wp_client, (_PROJECT_TAXONOMY,))
+
+        projects = await wp_client.get_projects(_projects_params(category, limit))
+
+        return _projects_result(projects)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero progetti: {str(e)}"})
+
+
+# ainvoke usa il client async invece di occupare un thread per la I/O
+get_portfolio_projects.coroutine = (  # type: ignore[attr-defined]
+    _aget_portfolio_projects
+)
@@ -3,10 +3,61 @@ Profile-related tools (certifications, work experience)
 """
 
 import json
+from typing import Any, Dict, List
 
 from langchain_core.tools import tool
 
-from ..wordpress import ContentProcessor, get_wordpress_client
+from ..wordpress import (
+    ContentProcessor,
+    dumps_result,
+    get_async_wordpress_client,
+    get_wordpress_client,
+    with_stale_notice,
+)
+
+
+def _certifications_result(certifications: List[Dict[str, Any]]) -> str:
+    """Serializza le certificazioni"""
+    if not certifications:
+        return json.dumps(
+            {
+                "message": "Nessuna certificazione trovata",
+                "total": 0,
+                "certifications": [],
+            }
+        )
+
+    results = []
+    for cert in certifications:
+        processed = ContentProcessor.process_certification(cert)
+        results.append(processed)
+
+    return dumps_result(
+        with_stale_notice(
+            {"total": len(results), "certifications": results}, certifications
+        )
+    )
+
+
+def _experiences_result(experiences: List[Dict[str, Any]]) -> str:
+    """Serializza le esperienze lavorative"""
+    if not experiences:
+        return json.dumps(
+            {
+                "message": "Nessuna esperienza lavorativa trovata",
+                "total": 0,
+                "experiences": [],
+            }
+        )
+
+    results = []
+    for exp in experiences:
+        processed = ContentProcessor.process_work_experience(exp)
+        results.append(processed)
+
+    return dumps_result(
+        with_stale_notice({"total": len(results), "experiences": results}, experiences)
+    )
 
 
 @tool
@@ -17,21 +68,20 @@ def get_certifications(limit: int = 10) -> str:
 
         certifications = wp_client.get_certifications({"per_page": limit})
 
-        if not certifications:
-            return json.dumps(
-                {
-                    "message": "Nessuna certificazione trovata",
-                    "total": 0,
-                    "certifications": [],
-                }
-            )
+        return _certifications_result(certifications)
 
-        results = []
-        for cert in certifications:
-            processed = ContentProcessor.process_certification(cert)
-            results.append(processed)
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero certificazioni: {str(e)}"})
 
-        return json.dumps({"total": len(results), "certifications": results})
+
+async def _aget_certifications(limit: int = 10) -> str:
+    """Versione async di get_certifications (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        certifications = await wp_client.get_certifications({"per_page": limit})
+
+        return _certifications_result(certifications)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero certificazioni: {str(e)}"})
@@ -45,21 +95,25 @@ def get_work_experience(limit: int = 10) -> str:
 
         experiences = wp_client.get_work_experiences({"per_page": limit})
 
-        if not experiences:
-            return json.dumps(
-                {
-                    "message": "Nessuna esperienza lavorativa trovata",
-                    "total": 0,
-                    "experiences": [],
-                }
-            )
+        return _experiences_result(experiences)
+
+    except Exception as e:
+        return json.dumps({"error": f"Errore nel recupero esperienze: {str(e)}"})
 
-        results = []
-        for exp in experiences:
-            processed = ContentProcessor.process_work_experience(exp)
-            results.append(processed)
 
-        return json.dumps({"total": len(results), "experiences": results})
+async def _aget_work_experience(limit: int = 10) -> str:
+    """Versione async di get_work_experience (usata da ainvoke)"""
+    try:
+        wp_client = get_async_wordpress_client()
+
+        experiences = await wp_client.get_work_experiences({"per_page": limit})
+
+        return _experiences_result(experiences)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nel recupero esperienze: {str(e)}"})
+
+
+# ainvoke usa il client async invece di occupare un thread per la I/O
+get_certifications.coroutine = _aget_certifications  # type: ignore[attr-defined]
+get_work_experience.coroutine = _aget_work_experience  # type: ignore[attr-defined]
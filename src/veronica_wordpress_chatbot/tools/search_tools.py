@@ -2,65 +2,201 @@
 Search and contact tools
 """
 
+import asyncio
 import json
+import math
+from functools import partial
 from typing import Any, Dict, List
 
 from langchain_core.tools import tool
 
-from ..config import CONTACT_INFO
-from ..wordpress import ContentProcessor, get_wordpress_client
+from ..config import CONTACT_INFO, SEARCH_INDEX_ENABLED, SEMANTIC_INDEX_ENABLED
+from ..wordpress import (
+    ContentProcessor,
+    FanOutResult,
+    SearchHit,
+    afan_out,
+    dumps_result,
+    expand_query,
+    fan_out,
+    get_async_wordpress_client,
+    get_query_stats,
+    get_search_index,
+    get_semantic_index,
+    get_wordpress_client,
+    rewrite_query,
+    with_missing_notice,
+    with_stale_notice,
+)
+
+# Tipi di contenuto interrogati con ?search= quando l'indice locale non è
+# disponibile: chiave → (metodo del client, processore)
+SEARCH_TARGETS = {
+    "articles": ("get_posts", ContentProcessor.process_post),
+    "projects": ("get_projects", ContentProcessor.process_project),
+    "certifications": ("get_certifications", ContentProcessor.process_certification),
+    "tools": ("get_tools", ContentProcessor.process_tool),
+}
+
+
+def _ranked_result(query: str, hits: List[SearchHit]) -> str:
+    """Serializza i risultati dell'indice locale (già ordinati per rilevanza)"""
+    return dumps_result(
+        {
+            "search_query": query,
+            "total": len(hits),
+            "results": [hit.record for hit in hits],
+        }
+    )
+
+
+def _index_search(query: str, limit: int) -> List[SearchHit]:
+    """Ricerca nell'indice BM25 con i termini del sito dei sinonimi trovati"""
+    expanded = expand_query(query)
+    hits = get_search_index().search(expanded, limit)
+    get_query_stats().record(query, expanded, len(hits))
+    return hits
+
+
+def _search_all_result(query: str, found: FanOutResult, limit: int) -> str:
+    """
+    Processa e serializza i risultati di ?search= (per tipo di contenuto);
+    i tipi che non hanno risposto entro la deadline sono in missing_sections
+    """
+    results = [
+        processor(item)
+        for key, (_, processor) in SEARCH_TARGETS.items()
+        for item in found.get(key) or []
+    ][:limit]
+    get_query_stats().record(query, rewrite_query(query), len(results))
+
+    payload = {"search_query": query, "total": len(results), "results": results}
+    return dumps_result(
+        with_missing_notice(
+            with_stale_notice(payload, *found.results.values()), found.missing
+        )
+    )
+
+
+def _per_type_params(query: str, limit: int) -> Dict[str, Any]:
+    """Parametri di ?search= per ogni tipo di contenuto (query in parole chiave)"""
+    return {
+        "search": rewrite_query(query),
+        "per_page": max(1, math.ceil(limit / len(SEARCH_TARGETS))),
+    }
 
 
 @tool
-def search_all_content(query: str, limit_per_type: int = 3) -> str:
+def search_all_content(query: str, limit: int = 10) -> str:
     """
     Ricerca generale nei contenuti di Veronica (articoli, progetti, certificazioni, etc.).
+    I risultati di tutti i tipi di contenuto sono in un'unica lista ordinata
+    per rilevanza.
 
     Args:
         query: Termine di ricerca
-        limit_per_type: Limite risultati per tipo di contenuto
+        limit: Numero massimo di risultati, ordinati per rilevanza
     """
+    return _search_all_content(query, limit)
+
+
+def _search_all_content(query: str, limit: int = 10) -> str:
+    """Implementazione di search_all_content (usata anche da semantic_search)"""
     try:
         wp_client = get_wordpress_client()
 
-        results: Dict[str, Any] = {"search_query": query, "results": {}}
-
-        # Cerca in articoli
-        posts = wp_client.get_posts({"search": query, "per_page": limit_per_type})
-        if posts:
-            results["results"]["articles"] = [
-                ContentProcessor.process_post(p) for p in posts
-            ]
-
-        # Cerca in progetti
-        projects = wp_client.get_projects({"search": query, "per_page": limit_per_type})
-        if projects:
-            results["results"]["projects"] = [
-                ContentProcessor.process_project(p) for p in projects
-            ]
-
-        # Cerca in certificazioni
-        certifications = wp_client.get_certifications(
-            {"search": query, "per_page": limit_per_type}
+        # Indice BM25 locale su tutti i tipi di contenuto
+        if SEARCH_INDEX_ENABLED:
+            if get_search_index().ensure(wp_client):
+                return _ranked_result(query, _index_search(query, limit))
+
+        # Fallback: cerca in parallelo in articoli, progetti, certificazioni
+        # e strumenti
+        params = _per_type_params(query, limit)
+        found = fan_out(
+            {
+                key: partial(getattr(wp_client, getter), params)
+                for key, (getter, _) in SEARCH_TARGETS.items()
+            }
         )
-        if certifications:
-            results["results"]["certifications"] = [
-                ContentProcessor.process_certification(c) for c in certifications
-            ]
 
-        # Cerca in strumenti
-        tools_list = wp_client.get_tools({"search": query, "per_page": limit_per_type})
-        if tools_list:
-            results["results"]["tools"] = [
-                ContentProcessor.process_tool(t) for t in tools_list
-            ]
+        return _search_all_result(query, found, limit)
+
+    except Exception as e:
+        return json.dumps({"error": f"Errore nella ricerca generale: {str(e)}"})
+
 
-        return json.dumps(results)
+async def _asearch_all_content(query: str, limit: int = 10) -> str:
+    """Versione async di search_all_content (fallback sugli endpoint in parallelo)"""
+    try:
+        if SEARCH_INDEX_ENABLED:
+            index = get_search_index()
+            # La prima costruzione dell'indice scarica le collezioni: fuori dal loop
+            if index.ready:
+                ready = index.ensure(get_wordpress_client())
+            else:
+                ready = await asyncio.to_thread(index.ensure, get_wordpress_client())
+            if ready:
+                return _ranked_result(query, _index_search(query, limit))
+
+        wp_client = get_async_wordpress_client()
+
+        params = _per_type_params(query, limit)
+        found = await afan_out(
+            {
+                key: partial(getattr(wp_client, getter), params)
+                for key, (getter, _) in SEARCH_TARGETS.items()
+            }
+        )
+
+        return _search_all_result(query, found, limit)
 
     except Exception as e:
         return json.dumps({"error": f"Errore nella ricerca generale: {str(e)}"})
 
 
+@tool
+def semantic_search(query: str, limit: int = 5) -> str:
+    """
+    Ricerca per significato nei contenuti di Veronica: trova articoli, progetti
+    e altri contenuti pertinenti anche quando non contengono le parole della
+    domanda (es. "modelli linguistici" per contenuti su LLM).
+
+    Args:
+        query: Domanda o descrizione in linguaggio naturale
+        limit: Numero massimo di risultati, ordinati per similarità
+    """
+    try:
+        if SEMANTIC_INDEX_ENABLED:
+            index = get_semantic_index()
+            if index.ensure(get_wordpress_client()):
+                return _ranked_result(query, index.search(query, limit))
+
+        # Indice semantico non disponibile (es. NumPy non installato)
+        return _search_all_content(query, limit)
+
+    except Exception as e:
+        return json.dumps({"error": f"Errore nella ricerca semantica: {str(e)}"})
+
+
+async def _asemantic_search(query: str, limit: int = 5) -> str:
+    """Versione async di semantic_search (costruzione dell'indice fuori dal loop)"""
+    try:
+        if SEMANTIC_INDEX_ENABLED:
+            index = get_semantic_index()
+            if index.ready:
+                ready = index.ensure(get_wordpress_client())
+            else:
+                ready = await asyncio.to_thread(index.ensure, get_wordpress_client())
+            if ready:
+                return _ranked_result(query, index.search(query, limit))
+
+        return await _asearch_all_content(query, limit)
+
+    except Exception as e:
+        return json.dumps({"error": f"Errore nella ricerca semantica: {str(e)}"})
+
+
 @tool
 def get_contact_info() -> str:
     """Restituisce le informazioni di contatto di Veronica."""
@@ -70,3 +206,8 @@ def get_contact_info() -> str:
             "message": "Contattami per collaborazioni, progetti o semplicemente per fare una chiacchierata tech!",
         }
     )
+
+
+# ainvoke usa il client async invece di occupare un thread per la I/O
+search_all_content.coroutine = _asearch_all_content  # type: ignore[attr-defined]
+semantic_search.coroutine = _asemantic_search  # type: ignore[attr-defined]
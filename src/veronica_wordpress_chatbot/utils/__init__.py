@@ -3,12 +3,18 @@ Utilities module
 """
 
 from .prompts import create_system_prompt, load_personal_summary
-from .tracing import LANGSMITH_ENABLED, process_chat_with_tracing, setup_langsmith
+from .tracing import (
+    LANGSMITH_ENABLED,
+    aprocess_chat_with_tracing,
+    process_chat_with_tracing,
+    setup_langsmith,
+)
 
 __all__ = [
     "create_system_prompt",
     "load_personal_summary",
     "setup_langsmith",
     "process_chat_with_tracing",
+    "aprocess_chat_with_tracing",
     "LANGSMITH_ENABLED",
 ]
@@ -3,11 +3,16 @@ System prompt creation for Veronica Chatbot
 """
 
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 from .logging_config import setup_logging
 
 logger = setup_logging(__name__)
 
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+SUMMARY_PATH = TEMPLATES_DIR / "personal_summary.txt"
+SYSTEM_PROMPT_PATH = TEMPLATES_DIR / "system_prompt.txt"
+
 # Default summary se file non trovato
 DEFAULT_SUMMARY = """
 Ciao! Sono Veronica Schembri, AI Engineer appassionata di Intelligenza Artificiale,
@@ -27,7 +32,7 @@ Amo il sushi e la pizza. Amo perdermi nella musica, nelle onde e nella natura.
 def load_personal_summary() -> str:
     """Carica il summary personale dal template"""
     # Path assoluto relativo a questo file: utils/prompts.py -> utils/templates/personal_summary.txt
-    summary_path = Path(__file__).parent / "templates" / "personal_summary.txt"
+    summary_path = SUMMARY_PATH
 
     try:
         if summary_path.exists():
@@ -46,7 +51,7 @@ def load_personal_summary() -> str:
 
 def load_system_prompt_template() -> str:
     """Carica il template del system prompt da file"""
-    template_path = Path(__file__).parent / "templates" / "system_prompt.txt"
+    template_path = SYSTEM_PROMPT_PATH
 
     try:
         if template_path.exists():
@@ -80,3 +85,17 @@ def create_system_prompt() -> str:
 
     logger.info(f"System prompt generato: {len(prompt)} caratteri")
     return prompt
+
+
+def template_mtimes() -> Tuple[Optional[int], Optional[int]]:
+    """
+    mtime (ns) dei template di summary e system prompt, None se il file
+    manca: cambia quando un template viene modificato
+    """
+    mtimes: List[Optional[int]] = []
+    for path in (SUMMARY_PATH, SYSTEM_PROMPT_PATH):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes[0], mtimes[1]
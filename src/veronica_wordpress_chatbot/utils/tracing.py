@@ -53,7 +53,27 @@ def process_chat_with_tracing(
     # Processa la richiesta (LangSmith traccia automaticamente)
     response = chatbot.chat(message, thread_id)
 
-    # Ottieni trace URL se disponibile
+    return response, _trace_url()
+
+
+@traceable(name="wordpress_chatbot_request")
+async def aprocess_chat_with_tracing(
+    message: str, thread_id: str
+) -> Tuple[str, Optional[str]]:
+    """Versione async di process_chat_with_tracing (usa chatbot.achat)"""
+    from ..api.dependencies import get_chatbot
+
+    chatbot = get_chatbot()
+    if chatbot is None:
+        raise Exception("Chatbot non inizializzato")
+
+    response = await chatbot.achat(message, thread_id)
+
+    return response, _trace_url()
+
+
+def _trace_url() -> Optional[str]:
+    """URL del progetto LangSmith in cui finiscono i trace"""
     trace_url = None
     if LANGSMITH_ENABLED:
         try:
@@ -63,4 +83,4 @@ def process_chat_with_tracing(
         except Exception as e:
             logger.warning(f"Errore generazione trace URL: {e}")
 
-    return response, trace_url
+    return trace_url
@@ -2,26 +2,198 @@
 WordPress integration module
 """
 
-from ..config import Configuration
+from ..config import MIRROR_ENABLED, SNAPSHOT_ENABLED, Configuration
+from .async_client import AsyncWordPressClient
+from .cache import ResponseCache, get_response_cache
 from .client import OptimizedWordPressClient
+from .coalescing import SingleFlight, get_single_flight
+from .fanout import (
+    FanOutResult,
+    FanOutStats,
+    afan_out,
+    fan_out,
+    get_fanout_stats,
+    with_missing_notice,
+)
+from .fields import build_fields_projection, get_payload_stats
+from .hedging import HedgingPolicy, get_hedging_policy
+from .memo import ProcessedCache, get_processed_cache
+from .mirror import (
+    AsyncMirrorWordPressClient,
+    ContentMirror,
+    MirrorWordPressClient,
+    get_content_mirror,
+    start_mirror_sync,
+    stop_mirror_sync,
+)
 from .processor import ContentProcessor
+from .query_rewrite import (
+    QueryStats,
+    expand_query,
+    extract_keywords,
+    get_query_stats,
+    rewrite_query,
+)
+from .records import (
+    BookRecord,
+    CertificationRecord,
+    ContentRecord,
+    PostRecord,
+    ProjectRecord,
+    StackRecord,
+    ToolRecord,
+    WorkExperienceRecord,
+    dumps_result,
+)
+from .resilience import (
+    StalePayload,
+    WordPressUnavailableError,
+    get_circuit_breakers,
+    is_stale,
+    with_stale_notice,
+)
+from .revalidation import RevalidationStore, get_revalidation_store
+from .search_index import (
+    SearchHit,
+    SearchIndex,
+    get_search_index,
+    warm_search_index,
+)
+from .semantic_index import (
+    HashedNgramEmbedder,
+    LangChainEmbedder,
+    SemanticIndex,
+    get_semantic_index,
+    warm_semantic_index,
+)
+from .session import (
+    close_async_http_client,
+    close_http_session,
+    get_async_http_client,
+    get_http_session,
+    get_pool_stats,
+)
+from .snapshot import (
+    AsyncSnapshotWordPressClient,
+    ContentSnapshot,
+    SnapshotFormatError,
+    SnapshotWordPressClient,
+    export_snapshot,
+    get_content_snapshot,
+)
+from .taxonomy import ENDPOINT_TAXONOMIES, TaxonomyCache, get_taxonomy_cache
 
 
 def get_wordpress_client() -> OptimizedWordPressClient:
     """
     Factory function to create WordPress client with default configuration.
 
-    Reduces code duplication across tools and endpoints.
+    Reduces code duplication across tools and endpoints. All clients share
+    the same process-wide pooled HTTP session, so creating one per tool call
+    does not open new connections. With WORDPRESS_SNAPSHOT=true the client
+    serves everything from the offline bundle without network calls; with
+    WORDPRESS_MIRROR=true it reads from the local SQLite mirror and falls
+    back to WordPress.
 
     Returns:
         OptimizedWordPressClient instance configured with default settings
     """
     config = Configuration()
+    if SNAPSHOT_ENABLED:
+        return SnapshotWordPressClient(config.wordpress_base_url)
+    if MIRROR_ENABLED:
+        return MirrorWordPressClient(config.wordpress_base_url)
     return OptimizedWordPressClient(config.wordpress_base_url)
 
 
+def get_async_wordpress_client() -> AsyncWordPressClient:
+    """
+    Factory function to create the async WordPress client.
+
+    Used by the async (ainvoke) implementation of the tools. Clients on the
+    same event loop share one httpx connection pool.
+
+    Returns:
+        AsyncWordPressClient instance configured with default settings
+    """
+    config = Configuration()
+    if SNAPSHOT_ENABLED:
+        return AsyncSnapshotWordPressClient(config.wordpress_base_url)
+    if MIRROR_ENABLED:
+        return AsyncMirrorWordPressClient(config.wordpress_base_url)
+    return AsyncWordPressClient(config.wordpress_base_url)
+
+
 __all__ = [
     "OptimizedWordPressClient",
+    "AsyncWordPressClient",
+    "MirrorWordPressClient",
+    "AsyncMirrorWordPressClient",
+    "ContentMirror",
+    "SnapshotWordPressClient",
+    "AsyncSnapshotWordPressClient",
+    "ContentSnapshot",
+    "SnapshotFormatError",
     "ContentProcessor",
+    "ContentRecord",
+    "PostRecord",
+    "ProjectRecord",
+    "CertificationRecord",
+    "WorkExperienceRecord",
+    "BookRecord",
+    "ToolRecord",
+    "StackRecord",
+    "HedgingPolicy",
+    "ProcessedCache",
+    "ResponseCache",
+    "RevalidationStore",
+    "SearchHit",
+    "SearchIndex",
+    "QueryStats",
+    "SemanticIndex",
+    "HashedNgramEmbedder",
+    "LangChainEmbedder",
+    "SingleFlight",
+    "FanOutResult",
+    "FanOutStats",
+    "TaxonomyCache",
+    "StalePayload",
+    "WordPressUnavailableError",
     "get_wordpress_client",
+    "get_async_wordpress_client",
+    "build_fields_projection",
+    "get_payload_stats",
+    "get_http_session",
+    "get_async_http_client",
+    "get_pool_stats",
+    "get_response_cache",
+    "get_processed_cache",
+    "get_revalidation_store",
+    "get_search_index",
+    "warm_search_index",
+    "get_query_stats",
+    "rewrite_query",
+    "expand_query",
+    "extract_keywords",
+    "get_semantic_index",
+    "warm_semantic_index",
+    "get_single_flight",
+    "fan_out",
+    "afan_out",
+    "get_fanout_stats",
+    "get_taxonomy_cache",
+    "get_circuit_breakers",
+    "get_hedging_policy",
+    "get_content_mirror",
+    "start_mirror_sync",
+    "stop_mirror_sync",
+    "get_content_snapshot",
+    "export_snapshot",
+    "dumps_result",
+    "ENDPOINT_TAXONOMIES",
+    "is_stale",
+    "with_stale_notice",
+    "with_missing_notice",
+    "close_http_session",
+    "close_async_http_client",
 ]
@@ -0,0 +1,391 @@
+"""
+Async WordPress API client - awaitable counterpart of OptimizedWordPressClient
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from ..config import (
+    CACHE_ENABLED,
+    CONDITIONAL_GET_ENABLED,
+    REQUEST_CONNECT_TIMEOUT,
+    REQUEST_READ_TIMEOUT,
+    RETRY_MAX_ATTEMPTS,
+    WORDPRESS_FIELD_CONFIGS,
+)
+from ..utils.logging_config import setup_logging
+from .cache import FRESH, STALE, ResponseCache, get_response_cache
+from .client import TERM_REQUEST_PARAMS, build_request_params
+from .coalescing import SingleFlight, get_single_flight
+from .fields import PayloadStats, get_payload_stats
+from .hedging import HedgingPolicy, get_hedging_policy
+from .resilience import (
+    RETRYABLE_STATUS,
+    CircuitBreakerRegistry,
+    WordPressUnavailableError,
+    backoff_delay,
+    get_circuit_breakers,
+    retry_allowed,
+    stale_fallback,
+)
+from .revalidation import (
+    RevalidationStore,
+    fingerprint_from,
+    fingerprint_params,
+    get_revalidation_store,
+)
+from .session import get_async_http_client
+
+logger = setup_logging(__name__)
+
+# Timeout per tentativo: REQUEST_READ_TIMEOUT anche per scrittura e pool
+REQUEST_TIMEOUT = httpx.Timeout(REQUEST_READ_TIMEOUT, connect=REQUEST_CONNECT_TIMEOUT)
+
+# Riferimenti ai refresh in background (evita che vengano raccolti dal GC)
+_refresh_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _is_transient(error: httpx.HTTPError) -> bool:
+    """True per gli errori per cui ha senso ritentare (timeout, connessione, 5xx)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, httpx.TransportError)
+
+
+class AsyncWordPressClient:
+    """Client WordPress asincrono con la stessa interfaccia del client sync"""
+
+    base_url: str
+    wp_api_base: str
+    field_configs: Dict[str, Any]
+    cache: ResponseCache
+    revalidation: RevalidationStore
+    payload_stats: PayloadStats
+    single_flight: SingleFlight
+    breakers: CircuitBreakerRegistry
+    hedging: HedgingPolicy
+
+    def __init__(
+        self, base_url: str, http_client: Optional[httpx.AsyncClient] = None
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.wp_api_base = f"{self.base_url}/wp-json/wp/v2"
+
+        # Field configurations ottimizzate per ogni endpoint
+        self.field_configs = WORDPRESS_FIELD_CONFIGS
+
+        # Client httpx esplicito (test) oppure pool condiviso del loop corrente
+        self._http_client = http_client
+
+        # Stessa cache delle risposte del client sync
+        self.cache = get_response_cache()
+        self.revalidation = get_revalidation_store()
+        self.payload_stats = get_payload_stats()
+        self.single_flight = get_single_flight()
+        self.breakers = get_circuit_breakers()
+        self.hedging = get_hedging_policy()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Client httpx usato per le richieste"""
+        return self._http_client or get_async_http_client()
+
+    async def _make_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Effettua richiesta async ottimizzata passando dalla cache condivisa.
+
+        Raises:
+            WordPressUnavailableError: WordPress non disponibile e nessuna copia
+                in cache da servire
+        """
+        request_params = build_request_params(params, endpoint)
+
+        key = self.cache.make_key(endpoint, request_params)
+
+        try:
+            if not CACHE_ENABLED:
+                fetched = await self.single_flight.ado(
+                    key, lambda: self._fetch_resilient(endpoint, request_params)
+                )
+                return fetched[0] if fetched else None
+
+            cached: Optional[List[Dict[str, Any]]]
+            cached, state = self.cache.lookup(key)
+
+            if state == FRESH:
+                logger.debug(f"WordPress cache hit: {key}")
+                return cached
+
+            if state == STALE:
+                if self.cache.begin_refresh(key):
+                    task = asyncio.create_task(
+                        self._refresh(endpoint, key, request_params)
+                    )
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+                logger.debug(f"WordPress cache stale, refresh in background: {key}")
+                return cached
+
+            # Richieste identiche concorrenti condividono un'unica chiamata upstream
+            fetched = await self.single_flight.ado(
+                key, lambda: self._fetch_and_store(endpoint, key, request_params)
+            )
+            return fetched[0] if fetched else None
+
+        except WordPressUnavailableError as e:
+            fallback = stale_fallback(self.cache, self.revalidation, key)
+            if fallback is None:
+                raise
+            logger.warning(f"{e} - servita la copia stale in cache")
+            return fallback
+
+    async def _fetch_and_store(
+        self, endpoint: str, key: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Scarica la risposta e la salva in cache (eseguito dal solo leader)"""
+        generation = self.cache.generation(endpoint)
+        fetched = await self._fetch_resilient(endpoint, request_params)
+        if fetched is not None:
+            data, size = fetched
+            self.cache.store(endpoint, key, data, size, generation)
+        return fetched
+
+    async def _refresh(
+        self, endpoint: str, key: str, request_params: Dict[str, Any]
+    ) -> None:
+        """Aggiorna in background una entry scaduta della cache"""
+        try:
+            await self.single_flight.ado(
+                key, lambda: self._fetch_and_store(endpoint, key, request_params)
+            )
+        except WordPressUnavailableError as e:
+            logger.warning(f"Refresh in background fallito: {e}")
+        finally:
+            self.cache.end_refresh(key)
+
+    async def _fetch_resilient(
+        self, endpoint: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        ``_fetch`` con circuit breaker e retry con jitter
+        (vedi OptimizedWordPressClient._fetch_resilient).
+
+        Raises:
+            WordPressUnavailableError: circuito aperto o tentativi esauriti
+        """
+        breaker = self.breakers.get(endpoint)
+        if not breaker.allow():
+            raise WordPressUnavailableError(
+                endpoint,
+                f"circuit breaker aperto, riprova tra {breaker.retry_after():.0f}s",
+            )
+
+        settled = False
+        started = time.monotonic()
+        attempt = 1
+        try:
+            while True:
+                try:
+                    fetched = await self._fetch(endpoint, request_params)
+                except httpx.HTTPError as e:
+                    if not _is_transient(e):
+                        # L'host risponde: errore applicativo, non guasto del servizio
+                        breaker.record_success()
+                        settled = True
+                        logger.error(f"WordPress API Error for {endpoint}: {e}")
+                        return None
+
+                    delay = backoff_delay(attempt)
+                    if not retry_allowed(
+                        attempt,
+                        time.monotonic() - started,
+                        delay,
+                        timed_out=isinstance(e, httpx.ReadTimeout),
+                    ):
+                        breaker.record_failure()
+                        settled = True
+                        logger.error(f"WordPress API Error for {endpoint}: {e}")
+                        raise WordPressUnavailableError(endpoint, str(e)) from e
+
+                    logger.warning(
+                        f"WordPress API retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} "
+                        f"per {endpoint} tra {delay:.2f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+                breaker.record_success()
+                settled = True
+                return fetched
+        finally:
+            # Eccezioni inattese e cancellazione (deadline del fan-out)
+            if not settled:
+                breaker.release()
+
+    async def _fetch(
+        self, endpoint: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Esegue la richiesta HTTP async con revalidation condizionale.
+
+        Raises:
+            httpx.HTTPError: errori HTTP e di rete
+        """
+        try:
+            url = f"{self.wp_api_base}/{endpoint}"
+            logger.debug(f"WordPress API Async Request: {url}")
+
+            key = self.cache.make_key(endpoint, request_params)
+            record = self.revalidation.get(key) if CONDITIONAL_GET_ENABLED else None
+
+            fingerprint = None
+            if (
+                CONDITIONAL_GET_ENABLED
+                and self.revalidation.uses_fingerprint(endpoint)
+                and not (record and record.has_validators)
+            ):
+                started = time.perf_counter()
+                fingerprint, probe_bytes = await self._probe(url, request_params)
+                if record and fingerprint and fingerprint == record.fingerprint:
+                    logger.info(f"WordPress fingerprint invariato: {endpoint}")
+                    payload = self.revalidation.record_reuse(
+                        record,
+                        time.perf_counter() - started,
+                        probe_bytes,
+                        fingerprint=True,
+                    )
+                    return payload, record.size
+
+            headers = record.conditional_headers() if record else {}
+
+            started = time.perf_counter()
+            response = await self.hedging.acall(
+                endpoint,
+                lambda: self.http_client.get(
+                    url,
+                    params=request_params,
+                    headers=headers,
+                    timeout=REQUEST_TIMEOUT,
+                ),
+            )
+            elapsed = time.perf_counter() - started
+
+            if response.status_code == 304 and record is not None:
+                logger.info(f"WordPress API Not Modified: {endpoint}")
+                return self.revalidation.record_reuse(record, elapsed), record.size
+
+            response.raise_for_status()
+
+            data: List[Dict[str, Any]] = response.json()
+            size = len(response.content)
+            item_count = len(data) if isinstance(data, list) else 1
+            logger.info(f"WordPress API Success: {endpoint} - {item_count} items")
+
+            self.payload_stats.record(endpoint, size, item_count)
+
+            if CONDITIONAL_GET_ENABLED and isinstance(data, list):
+                self.revalidation.record_download(
+                    endpoint, key, data, size, elapsed, response.headers, fingerprint
+                )
+
+            return data, size
+
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON Decode Error for {endpoint}: {e}")
+            return None
+
+    async def _probe(
+        self, url: str, request_params: Dict[str, Any]
+    ) -> Tuple[Optional[str], int]:
+        """Fingerprint probe async (vedi OptimizedWordPressClient._probe)"""
+        try:
+            response = await self.http_client.get(
+                url,
+                params=fingerprint_params(request_params),
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            return fingerprint_from(response.headers, response.json()), len(
+                response.content
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"WordPress fingerprint probe fallito: {e}")
+            return None, 0
+
+    async def fetch_many(
+        self, requests: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Esegue più richieste in parallelo sullo stesso connection pool.
+
+        Args:
+            requests: Mappa nome → (endpoint, params)
+
+        Returns:
+            Mappa nome → lista di item (vuota se l'endpoint non restituisce dati)
+
+        Raises:
+            WordPressUnavailableError: un endpoint non è disponibile e non ha
+                copie in cache
+        """
+        names = list(requests)
+        responses = await asyncio.gather(
+            *(
+                self._make_request(endpoint, params)
+                for endpoint, params in requests.values()
+            )
+        )
+        return {name: data or [] for name, data in zip(names, responses)}
+
+    async def get_posts(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera post del blog ottimizzato"""
+        return await self._make_request("posts", params) or []
+
+    async def get_projects(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera progetti del portfolio ottimizzato"""
+        return await self._make_request("projects", params) or []
+
+    async def get_certifications(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera certificazioni ottimizzato (endpoint: certifications)"""
+        return await self._make_request("certifications", params) or []
+
+    async def get_work_experiences(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera esperienze lavorative ottimizzato"""
+        return await self._make_request("work-experiences", params) or []
+
+    async def get_books(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera libri letti ottimizzato"""
+        return await self._make_request("books", params) or []
+
+    async def get_tools(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera strumenti personali ottimizzato"""
+        return await self._make_request("tools", params) or []
+
+    async def get_stacks(
+        self, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Recupera stack tecnologico professionale ottimizzato"""
+        return await self._make_request("stacks", params) or []
+
+    async def get_terms(self, taxonomy: str) -> List[Dict[str, Any]]:
+        """Recupera i termini di una tassonomia (es. "tool-category")"""
+        return await self._make_request(taxonomy, TERM_REQUEST_PARAMS) or []
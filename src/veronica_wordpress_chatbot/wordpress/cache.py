@@ -0,0 +1,274 @@
+"""
+WordPress response cache - TTL + LRU with memory cap and stale-while-revalidate
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from ..config import (
+    CACHE_DEFAULT_TTL,
+    CACHE_ENABLED,
+    CACHE_MAX_BYTES,
+    CACHE_STALE_TTL,
+    CACHE_WEBHOOK_TTL,
+    WEBHOOK_SECRET,
+    WORDPRESS_FIELD_CONFIGS,
+)
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Stati restituiti da lookup()
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+@dataclass
+class CacheEntry:
+    """Singola risposta WordPress in cache"""
+
+    endpoint: str
+    value: Any
+    size: int
+    stored_at: float
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """
+    Cache LRU thread-safe delle risposte WordPress.
+
+    - TTL per endpoint (``cache_ttl`` in WORDPRESS_FIELD_CONFIGS)
+    - eviction LRU quando la dimensione stimata supera ``max_bytes``
+    - stale-while-revalidate: una entry scaduta resta servibile per
+      ``stale_ttl`` secondi mentre il client la aggiorna in background
+    - generazione per endpoint: una risposta scaricata prima di
+      un'invalidazione (webhook) non viene salvata
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        default_ttl: float = CACHE_DEFAULT_TTL,
+        stale_ttl: float = CACHE_STALE_TTL,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.ttls = ttls if ttls is not None else _endpoint_ttls()
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Chiave normalizzata: endpoint + parametri ordinati"""
+        if not params:
+            return endpoint
+
+        normalized = sorted(
+            (str(k), str(v).strip()) for k, v in params.items() if v is not None
+        )
+        return f"{endpoint}?{urlencode(normalized)}"
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL configurato per l'endpoint"""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def lookup(self, key: str) -> Tuple[Any, str]:
+        """
+        Cerca una risposta in cache.
+
+        Returns:
+            Tupla (valore, stato) con stato FRESH, STALE o MISS
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None, MISS
+
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value, FRESH
+
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return entry.value, STALE
+
+            # Troppo vecchia anche per stale-while-revalidate
+            self._remove(key)
+            self.misses += 1
+            return None, MISS
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Restituisce l'entry senza aggiornare LRU né statistiche"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def generation(self, endpoint: str) -> int:
+        """Contatore delle invalidazioni dell'endpoint (da leggere prima del fetch)"""
+        with self._lock:
+            return self._generation(endpoint)
+
+    def store(
+        self,
+        endpoint: str,
+        key: str,
+        value: Any,
+        size: int,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Salva una risposta; applica eviction LRU se si supera il limite.
+
+        Se ``generation`` è indicata e l'endpoint è stato invalidato nel
+        frattempo la risposta (potenzialmente vecchia) viene scartata.
+        """
+        if size > self.max_bytes:
+            logger.debug(f"Risposta troppo grande per la cache: {key} ({size} bytes)")
+            return
+
+        now = time.monotonic()
+        ttl = self.ttl_for(endpoint)
+        entry = CacheEntry(
+            endpoint=endpoint,
+            value=value,
+            size=size,
+            stored_at=now,
+            expires_at=now + ttl,
+            stale_until=now + ttl + self.stale_ttl,
+        )
+
+        with self._lock:
+            if generation is not None and generation != self._generation(endpoint):
+                logger.debug(f"Risposta scartata, endpoint invalidato: {key}")
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, endpoint: Optional[str] = None) -> int:
+        """
+        Invalida le entry di un endpoint (o tutte).
+
+        Returns:
+            Numero di entry rimosse
+        """
+        with self._lock:
+            if endpoint is None:
+                self._epoch += 1
+            else:
+                self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if endpoint is None or entry.endpoint == endpoint
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def begin_refresh(self, key: str) -> bool:
+        """Segna una entry come in aggiornamento; False se lo è già"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        """Rimuove il flag di aggiornamento in corso"""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self) -> None:
+        """Svuota la cache e azzera le statistiche"""
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self._bytes = 0
+            self._epoch += 1
+            self.hits = self.stale_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiche di utilizzo della cache"""
+        with self._lock:
+            served = self.hits + self.stale_hits
+            lookups = served + self.misses
+            return {
+                "enabled": CACHE_ENABLED,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+    def _generation(self, endpoint: str) -> int:
+        """Generazione corrente (chiamare con il lock acquisito)"""
+        return self._epoch + self._generations.get(endpoint, 0)
+
+    def _remove(self, key: str) -> None:
+        """Rimuove una entry (chiamare con il lock acquisito)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+def _endpoint_ttls() -> Dict[str, float]:
+    """
+    TTL per endpoint letti da WORDPRESS_FIELD_CONFIGS.
+
+    Con il webhook configurato le modifiche invalidano la cache via push,
+    quindi i TTL diventano lunghi (CACHE_WEBHOOK_TTL).
+    """
+    ttls: Dict[str, float] = {
+        endpoint: float(config["cache_ttl"])  # type: ignore[arg-type]
+        for endpoint, config in WORDPRESS_FIELD_CONFIGS.items()
+        if "cache_ttl" in config
+    }
+    if WEBHOOK_SECRET:
+        return {endpoint: max(ttl, CACHE_WEBHOOK_TTL) for endpoint, ttl in ttls.items()}
+    return ttls
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """Restituisce la cache delle risposte condivisa dal processo"""
+    return _response_cache
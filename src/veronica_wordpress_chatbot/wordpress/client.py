@@ -3,15 +3,91 @@ WordPress API client - optimized requests and endpoints
 """
 
 import json
-from typing import Any, Dict, List, Optional
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 import requests
 
-from ..config import DEFAULT_REQUEST_PARAMS, REQUEST_TIMEOUT, WORDPRESS_FIELD_CONFIGS
+from ..config import (
+    CACHE_ENABLED,
+    CONDITIONAL_GET_ENABLED,
+    DEFAULT_REQUEST_PARAMS,
+    ITER_MAX_CONCURRENCY,
+    ITER_PER_PAGE,
+    REQUEST_TIMEOUT,
+    RETRY_MAX_ATTEMPTS,
+    WORDPRESS_FIELD_CONFIGS,
+)
 from ..utils.logging_config import setup_logging
+from .cache import FRESH, STALE, ResponseCache, get_response_cache
+from .coalescing import SingleFlight, get_single_flight
+from .fields import PayloadStats, apply_projection, get_payload_stats
+from .hedging import HedgingPolicy, get_hedging_policy
+from .resilience import (
+    RETRYABLE_STATUS,
+    CircuitBreakerRegistry,
+    WordPressUnavailableError,
+    backoff_delay,
+    get_circuit_breakers,
+    retry_allowed,
+    stale_fallback,
+)
+from .revalidation import (
+    RevalidationStore,
+    fingerprint_from,
+    fingerprint_params,
+    get_revalidation_store,
+)
+from .session import get_http_session
 
 logger = setup_logging(__name__)
 
+# Worker per gli aggiornamenti stale-while-revalidate (fuori dal chat path)
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="wp-cache-refresh"
+)
+
+# Termini di una tassonomia in un'unica richiesta (orderby=date non è valido
+# per gli endpoint dei termini)
+TERM_REQUEST_PARAMS: Dict[str, Any] = {
+    "per_page": 100,
+    "orderby": "id",
+    "order": "asc",
+    "_fields": "id,name",
+}
+
+
+def build_request_params(
+    params: Optional[Dict[str, Any]] = None, endpoint: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Unisce i parametri default ottimizzati con quelli della singola chiamata.
+
+    Se viene indicato l'endpoint aggiunge la proiezione ``_fields`` con i
+    soli campi letti da ContentProcessor.
+    """
+    request_params: Dict[str, Any] = DEFAULT_REQUEST_PARAMS.copy()
+
+    if params:
+        request_params.update(params)
+
+    if endpoint:
+        request_params = apply_projection(endpoint, request_params)
+
+    return request_params
+
+
+def _is_transient(error: requests.exceptions.RequestException) -> bool:
+    """True per gli errori per cui ha senso ritentare (timeout, connessione, 5xx)"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRYABLE_STATUS
+    return isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
 
 class OptimizedWordPressClient:
     """Client WordPress ottimizzato con tutti gli endpoint specifici"""
@@ -19,47 +95,469 @@ class OptimizedWordPressClient:
     base_url: str
     wp_api_base: str
     field_configs: Dict[str, Any]
+    session: requests.Session
+    cache: ResponseCache
+    revalidation: RevalidationStore
+    payload_stats: PayloadStats
+    single_flight: SingleFlight
+    breakers: CircuitBreakerRegistry
+    hedging: HedgingPolicy
 
     def __init__(self, base_url: str) -> None:
         self.base_url = base_url.rstrip("/")
         self.wp_api_base = f"{self.base_url}/wp-json/wp/v2"
 
+        # Sessione HTTP condivisa a livello di processo (keep-alive + pool)
+        self.session = get_http_session()
+
+        # Cache delle risposte condivisa tra tutti i client
+        self.cache = get_response_cache()
+
+        # Payload e validator (ETag/Last-Modified) per le richieste condizionali
+        self.revalidation = get_revalidation_store()
+
+        # Byte scaricati per endpoint (misura l'effetto della proiezione _fields)
+        self.payload_stats = get_payload_stats()
+
+        # Coalescing delle richieste identiche in volo (condiviso tra client)
+        self.single_flight = get_single_flight()
+
+        # Circuit breaker per endpoint (condivisi tra client)
+        self.breakers = get_circuit_breakers()
+
+        # Hedging opzionale delle GET lente (latenze recenti per endpoint)
+        self.hedging = get_hedging_policy()
+
         # Field configurations ottimizzate per ogni endpoint
         self.field_configs = WORDPRESS_FIELD_CONFIGS
 
     def _make_request(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None
     ) -> Optional[List[Dict[str, Any]]]:
-        """Effettua richiesta ottimizzata all'API WordPress"""
+        """
+        Effettua richiesta ottimizzata all'API WordPress passando dalla cache.
+
+        Una risposta fresca viene servita dalla cache; una scaduta (ma ancora
+        entro la finestra stale) viene servita subito e aggiornata in background.
+        In caso di miss, richieste identiche concorrenti vengono coalesced.
+
+        Se WordPress non risponde (o il circuit breaker è aperto) viene servito
+        l'ultimo payload valido come StalePayload.
+
+        Raises:
+            WordPressUnavailableError: WordPress non disponibile e nessuna copia
+                in cache da servire
+        """
+        # Aggiungi parametri default ottimizzati e proiezione _fields
+        request_params = build_request_params(params, endpoint)
+
+        key = self.cache.make_key(endpoint, request_params)
+
+        try:
+            if not CACHE_ENABLED:
+                fetched = self.single_flight.do(
+                    key, lambda: self._fetch_resilient(endpoint, request_params)
+                )
+                return fetched[0] if fetched else None
+
+            cached: Optional[List[Dict[str, Any]]]
+            cached, state = self.cache.lookup(key)
+
+            if state == FRESH:
+                logger.debug(f"WordPress cache hit: {key}")
+                return cached
+
+            if state == STALE:
+                if self.cache.begin_refresh(key):
+                    _refresh_executor.submit(
+                        self._refresh, endpoint, key, request_params
+                    )
+                logger.debug(f"WordPress cache stale, refresh in background: {key}")
+                return cached
+
+            # Richieste identiche concorrenti condividono un'unica chiamata upstream
+            fetched = self.single_flight.do(
+                key, lambda: self._fetch_and_store(endpoint, key, request_params)
+            )
+            return fetched[0] if fetched else None
+
+        except WordPressUnavailableError as e:
+            fallback = stale_fallback(self.cache, self.revalidation, key)
+            if fallback is None:
+                raise
+            logger.warning(f"{e} - servita la copia stale in cache")
+            return fallback
+
+    def _fetch_and_store(
+        self, endpoint: str, key: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Scarica la risposta e la salva in cache (eseguito dal solo leader)"""
+        generation = self.cache.generation(endpoint)
+        fetched = self._fetch_resilient(endpoint, request_params)
+        if fetched is not None:
+            data, size = fetched
+            self.cache.store(endpoint, key, data, size, generation)
+        return fetched
+
+    def _refresh(self, endpoint: str, key: str, request_params: Dict[str, Any]) -> None:
+        """Aggiorna in background una entry scaduta della cache"""
+        try:
+            self.single_flight.do(
+                key, lambda: self._fetch_and_store(endpoint, key, request_params)
+            )
+        except WordPressUnavailableError as e:
+            logger.warning(f"Refresh in background fallito: {e}")
+        finally:
+            self.cache.end_refresh(key)
+
+    def _fetch_resilient(
+        self, endpoint: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Esegue ``_fetch`` attraverso il circuit breaker dell'endpoint.
+
+        Gli errori transitori (connessione, 5xx/429) vengono ritentati con
+        backoff e jitter finché ``retry_allowed`` lo consente (niente retry
+        dopo un read timeout, entro RETRY_DEADLINE); gli altri errori HTTP
+        (es. 404) restituiscono None come prima. Ogni uscita, anche per
+        eccezioni inattese, chiude il conto con il circuit breaker.
+
+        Raises:
+            WordPressUnavailableError: circuito aperto o tentativi esauriti
+        """
+        breaker = self.breakers.get(endpoint)
+        if not breaker.allow():
+            raise WordPressUnavailableError(
+                endpoint,
+                f"circuit breaker aperto, riprova tra {breaker.retry_after():.0f}s",
+            )
+
+        settled = False
+        started = time.monotonic()
+        attempt = 1
+        try:
+            while True:
+                try:
+                    fetched = self._fetch(endpoint, request_params)
+                except requests.exceptions.RequestException as e:
+                    if not _is_transient(e):
+                        # L'host risponde: errore applicativo, non guasto del servizio
+                        breaker.record_success()
+                        settled = True
+                        logger.error(f"WordPress API Error for {endpoint}: {e}")
+                        return None
+
+                    delay = backoff_delay(attempt)
+                    if not retry_allowed(
+                        attempt,
+                        time.monotonic() - started,
+                        delay,
+                        timed_out=isinstance(e, requests.exceptions.ReadTimeout),
+                    ):
+                        breaker.record_failure()
+                        settled = True
+                        logger.error(f"WordPress API Error for {endpoint}: {e}")
+                        raise WordPressUnavailableError(endpoint, str(e)) from e
+
+                    logger.warning(
+                        f"WordPress API retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} "
+                        f"per {endpoint} tra {delay:.2f}s: {e}"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                breaker.record_success()
+                settled = True
+                return fetched
+        finally:
+            if not settled:
+                breaker.release()
+
+    def _fetch(
+        self, endpoint: str, request_params: Dict[str, Any]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Esegue la richiesta HTTP verso WordPress con revalidation condizionale.
+
+        Se esiste un payload precedente con ETag/Last-Modified la richiesta è
+        condizionale e un 304 riusa il payload salvato. Se il server non
+        fornisce validator si usa il fingerprint probe prima del download.
+
+        Returns:
+            Tupla (dati, dimensione payload in byte) oppure None se il JSON
+            non è valido
+
+        Raises:
+            requests.exceptions.RequestException: errori HTTP e di rete
+        """
         try:
             url = f"{self.wp_api_base}/{endpoint}"
             logger.debug(f"WordPress API Request: {url}")
 
-            # Aggiungi parametri default ottimizzati
-            default_params = DEFAULT_REQUEST_PARAMS.copy()
+            key = self.cache.make_key(endpoint, request_params)
+            record = self.revalidation.get(key) if CONDITIONAL_GET_ENABLED else None
 
-            if params:
-                default_params.update(params)
+            fingerprint = None
+            if (
+                CONDITIONAL_GET_ENABLED
+                and self.revalidation.uses_fingerprint(endpoint)
+                and not (record and record.has_validators)
+            ):
+                started = time.perf_counter()
+                fingerprint, probe_bytes = self._probe(url, request_params)
+                if record and fingerprint and fingerprint == record.fingerprint:
+                    logger.info(f"WordPress fingerprint invariato: {endpoint}")
+                    payload = self.revalidation.record_reuse(
+                        record,
+                        time.perf_counter() - started,
+                        probe_bytes,
+                        fingerprint=True,
+                    )
+                    return payload, record.size
 
-            response = requests.get(
-                url,
-                params=default_params,  # type: ignore[arg-type]
-                timeout=REQUEST_TIMEOUT,
+            headers = record.conditional_headers() if record else {}
+
+            started = time.perf_counter()
+            response = self.hedging.call(
+                endpoint,
+                lambda: self.session.get(
+                    url,
+                    params=request_params,  # type: ignore[arg-type]
+                    headers=headers,
+                    timeout=REQUEST_TIMEOUT,
+                ),
             )
+            elapsed = time.perf_counter() - started
+
+            if response.status_code == 304 and record is not None:
+                logger.info(f"WordPress API Not Modified: {endpoint}")
+                return self.revalidation.record_reuse(record, elapsed), record.size
+
             response.raise_for_status()
 
             data: List[Dict[str, Any]] = response.json()
+            size = len(response.content)
             item_count = len(data) if isinstance(data, list) else 1
             logger.info(f"WordPress API Success: {endpoint} - {item_count} items")
-            return data
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"WordPress API Error for {endpoint}: {e}")
-            return None
+            self.payload_stats.record(endpoint, size, item_count)
+
+            if CONDITIONAL_GET_ENABLED and isinstance(data, list):
+                self.revalidation.record_download(
+                    endpoint, key, data, size, elapsed, response.headers, fingerprint
+                )
+
+            return data, size
+
         except json.JSONDecodeError as e:
             logger.error(f"JSON Decode Error for {endpoint}: {e}")
             return None
 
+    def _probe(
+        self, url: str, request_params: Dict[str, Any]
+    ) -> Tuple[Optional[str], int]:
+        """
+        Fingerprint probe: una richiesta minima che dice se la collezione
+        è cambiata (X-WP-Total + modified più recente).
+
+        Returns:
+            Tupla (fingerprint o None, byte scaricati dal probe)
+        """
+        try:
+            response = self.session.get(
+                url,
+                params=fingerprint_params(request_params),  # type: ignore[arg-type]
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            return fingerprint_from(response.headers, response.json()), len(
+                response.content
+            )
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"WordPress fingerprint probe fallito: {e}")
+            return None, 0
+
+    def measure_projection(
+        self, endpoint: str, per_page: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Confronta la dimensione della stessa pagina con e senza ``_fields``.
+
+        Scavalca cache e revalidation: serve solo per diagnostica.
+
+        Returns:
+            Dict con byte prima/dopo la proiezione, o None in caso di errore
+        """
+        url = f"{self.wp_api_base}/{endpoint}"
+        full_params = build_request_params({"per_page": per_page})
+        projected_params = build_request_params({"per_page": per_page}, endpoint)
+
+        try:
+            full = self.session.get(
+                url,
+                params=full_params,  # type: ignore[arg-type]
+                timeout=REQUEST_TIMEOUT,
+            )
+            projected = self.session.get(
+                url,
+                params=projected_params,  # type: ignore[arg-type]
+                timeout=REQUEST_TIMEOUT,
+            )
+            full.raise_for_status()
+            projected.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Misura proiezione fallita per {endpoint}: {e}")
+            return None
+
+        items = projected.json()
+        return self.payload_stats.record_measurement(
+            endpoint,
+            len(full.content),
+            len(projected.content),
+            len(items) if isinstance(items, list) else 1,
+        )
+
+    def _fetch_page(
+        self, endpoint: str, request_params: Dict[str, Any], page: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Scarica una singola pagina di una collezione (senza cache).
+
+        Returns:
+            Tupla (item della pagina, numero totale di pagine da X-WP-TotalPages)
+
+        Raises:
+            requests.exceptions.RequestException: se la pagina non è scaricabile
+        """
+        url = f"{self.wp_api_base}/{endpoint}"
+        response = self.session.get(
+            url,
+            params={**request_params, "page": page},  # type: ignore[arg-type]
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        items: List[Dict[str, Any]] = data if isinstance(data, list) else []
+        total_pages = int(response.headers.get("X-WP-TotalPages", 1) or 1)
+
+        self.payload_stats.record(endpoint, len(response.content), len(items))
+        logger.debug(f"WordPress page {page}/{total_pages}: {endpoint}")
+        return items, total_pages
+
+    def iter_collection(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = ITER_PER_PAGE,
+        max_concurrency: int = ITER_MAX_CONCURRENCY,
+        fields: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera tutti gli item di una collezione seguendo X-WP-TotalPages.
+
+        La prima pagina dice quante pagine esistono; le successive vengono
+        scaricate in parallelo (al massimo ``max_concurrency`` alla volta) e
+        restituite in ordine. In memoria restano solo le pagine in volo: se il
+        chiamante interrompe l'iterazione le richieste pendenti vengono
+        cancellate.
+
+        Args:
+            endpoint: Endpoint WordPress (es. "posts")
+            params: Filtri aggiuntivi (search, modified_after, ...)
+            per_page: Item per pagina (massimo 100 per WordPress)
+            max_concurrency: Pagine scaricate in parallelo
+            fields: ``_fields`` esplicito al posto della proiezione dell'endpoint
+                (es. "id" per elencare solo gli ID)
+
+        Raises:
+            requests.exceptions.RequestException: se una pagina fallisce, per
+                non restituire silenziosamente una collezione troncata
+        """
+        max_concurrency = max(1, max_concurrency)
+        if fields:
+            request_params = build_request_params(
+                {**(params or {}), "per_page": per_page, "_fields": fields}
+            )
+        else:
+            request_params = build_request_params(
+                {**(params or {}), "per_page": per_page}, endpoint
+            )
+
+        items, total_pages = self._fetch_page(endpoint, request_params, 1)
+        yield from items
+
+        if total_pages <= 1:
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix=f"wp-iter-{endpoint}",
+        )
+        pending: Deque["Future[Tuple[List[Dict[str, Any]], int]]"] = deque()
+        next_page = 2
+
+        try:
+            while next_page <= total_pages or pending:
+                # Mantieni pieno il pipeline delle pagine in volo
+                while next_page <= total_pages and len(pending) < max_concurrency:
+                    pending.append(
+                        executor.submit(
+                            self._fetch_page, endpoint, request_params, next_page
+                        )
+                    )
+                    next_page += 1
+
+                page_items, _ = pending.popleft().result()
+                yield from page_items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_posts(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutti i post del blog"""
+        return self.iter_collection("posts", params, **kwargs)
+
+    def iter_projects(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutti i progetti del portfolio"""
+        return self.iter_collection("projects", params, **kwargs)
+
+    def iter_certifications(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutte le certificazioni"""
+        return self.iter_collection("certifications", params, **kwargs)
+
+    def iter_work_experiences(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutte le esperienze lavorative"""
+        return self.iter_collection("work-experiences", params, **kwargs)
+
+    def iter_books(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutti i libri"""
+        return self.iter_collection("books", params, **kwargs)
+
+    def iter_tools(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutti gli strumenti personali"""
+        return self.iter_collection("tools", params, **kwargs)
+
+    def iter_stacks(
+        self, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutto lo stack tecnologico"""
+        return self.iter_collection("stacks", params, **kwargs)
+
     def get_posts(
         self, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -101,3 +599,7 @@ class OptimizedWordPressClient:
     ) -> List[Dict[str, Any]]:
         """Recupera stack tecnologico professionale ottimizzato"""
         return self._make_request("stacks", params) or []
+
+    def get_terms(self, taxonomy: str) -> List[Dict[str, Any]]:
+        """Recupera i termini di una tassonomia (es. "tool-category")"""
+        return self._make_request(taxonomy, TERM_REQUEST_PARAMS) or []
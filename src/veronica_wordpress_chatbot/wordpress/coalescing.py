@@ -0,0 +1,117 @@
+"""
+Request coalescing - single-flight for identical in-flight WordPress requests
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _InFlight:
+    """Chiamata in corso condivisa tra leader e follower (path sync)"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalescing thread-safe: richieste concorrenti con la stessa chiave
+    condividono un'unica chiamata upstream e ne ricevono il risultato.
+
+    Il primo thread (leader) esegue la funzione; gli altri (follower)
+    attendono e ricevono lo stesso risultato o la stessa eccezione.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlight] = {}
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Esegue ``fn`` una sola volta per le chiamate concorrenti su ``key``"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _InFlight()
+                self._calls[key] = call
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = fn()
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Versione asyncio di ``do``: le coroutine concorrenti sullo stesso
+        event loop attendono lo stesso task.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            future = self._async_calls.get(loop_key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = asyncio.ensure_future(fn())
+                self._async_calls[loop_key] = future
+                self.leaders += 1
+
+                def _forget(_: "asyncio.Future[Any]") -> None:
+                    with self._lock:
+                        self._async_calls.pop(loop_key, None)
+
+                future.add_done_callback(_forget)
+
+        # shield: la cancellazione di un chiamante non cancella gli altri
+        return await asyncio.shield(future)  # type: ignore[no-any-return]
+
+    def stats(self) -> Dict[str, Any]:
+        """Fan-in: chiamate upstream effettive e chiamate coalesced"""
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                "upstream_calls": self.leaders,
+                "coalesced_calls": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "coalesced_ratio": round(self.coalesced / total, 3) if total else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        """Azzera i contatori"""
+        with self._lock:
+            self.leaders = 0
+            self.coalesced = 0
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Restituisce il coalescer condiviso dal processo"""
+    return _single_flight
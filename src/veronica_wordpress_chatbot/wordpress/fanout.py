@@ -0,0 +1,222 @@
+"""
+Fan-out - parallel WordPress requests with a deadline and partial results
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from ..config import FANOUT_DEADLINE, HTTP_POOL_MAXSIZE
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+PARTIAL_NOTICE = (
+    "WordPress non ha risposto in tempo per alcune sezioni: i risultati sono "
+    "incompleti (vedi missing_sections)."
+)
+
+# Worker condivisi dai fan-out del client sync (creati al primo utilizzo)
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Executor condiviso dai fan-out (dimensionato sul pool HTTP)"""
+    global _fanout_executor
+
+    with _executor_lock:
+        if _fanout_executor is None:
+            _fanout_executor = ThreadPoolExecutor(
+                max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="wp-fanout"
+            )
+        return _fanout_executor
+
+
+class FanOutResult(NamedTuple):
+    """Sezioni completate entro la deadline e sezioni mancanti"""
+
+    results: Dict[str, Any]
+    # Nell'ordine delle chiamate: scadute o fallite
+    missing: List[str]
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+class FanOutStats:
+    """Contatori dei fan-out: quanti sono finiti parziali e per quali sezioni"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.fanouts = 0
+        self.partial = 0
+        self.timeouts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._elapsed = 0.0
+
+    def record(
+        self, timed_out: Iterable[str], failed: Iterable[str], elapsed: float
+    ) -> None:
+        """Registra un fan-out con le sezioni scadute e fallite"""
+        timed_out, failed = list(timed_out), list(failed)
+        with self._lock:
+            self.fanouts += 1
+            self._elapsed += elapsed
+            if timed_out or failed:
+                self.partial += 1
+            for name in timed_out:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+            for name in failed:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.fanouts = self.partial = 0
+            self.timeouts.clear()
+            self.errors.clear()
+            self._elapsed = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "deadline": FANOUT_DEADLINE,
+                "fanouts": self.fanouts,
+                "partial": self.partial,
+                "timeouts": dict(self.timeouts),
+                "errors": dict(self.errors),
+                "avg_ms": (
+                    round(self._elapsed / self.fanouts * 1000, 1)
+                    if self.fanouts
+                    else 0.0
+                ),
+            }
+
+
+_fanout_stats = FanOutStats()
+
+
+def get_fanout_stats() -> FanOutStats:
+    """Restituisce i contatori dei fan-out condivisi dal processo"""
+    return _fanout_stats
+
+
+def _collect(
+    names: List[str],
+    results: Dict[str, Any],
+    errors: Dict[str, BaseException],
+    started: float,
+) -> FanOutResult:
+    """
+    Risultato del fan-out. Se nessuna sezione è arrivata e almeno una è
+    fallita si propaga il primo errore (come per una richiesta singola).
+    """
+    timed_out = [name for name in names if name not in results and name not in errors]
+    if errors and not results:
+        raise errors[next(name for name in names if name in errors)]
+
+    for name in timed_out:
+        logger.warning(f"Fan-out: {name} oltre la deadline, risposta parziale")
+    for name, error in errors.items():
+        logger.warning(f"Fan-out: {name} fallita, risposta parziale: {error}")
+    get_fanout_stats().record(timed_out, errors, time.monotonic() - started)
+
+    return FanOutResult(
+        {name: results[name] for name in names if name in results},
+        [name for name in names if name not in results],
+    )
+
+
+def fan_out(
+    calls: Dict[str, Callable[[], Any]],
+    deadline: Optional[float] = FANOUT_DEADLINE,
+) -> FanOutResult:
+    """
+    Esegue le chiamate in parallelo sull'executor condiviso e aspetta al
+    massimo ``deadline`` secondi (None: tutte). Le chiamate oltre la deadline
+    non vengono interrotte: finiscono in background e popolano la cache per
+    la richiesta successiva.
+
+    Args:
+        calls: Mappa sezione → funzione senza argomenti
+
+    Returns:
+        FanOutResult con le sezioni completate e quelle mancanti
+    """
+    started = time.monotonic()
+    executor = _get_executor()
+    futures: Dict["Future[Any]", str] = {
+        executor.submit(fn): name for name, fn in calls.items()
+    }
+    done, pending = wait(futures, timeout=deadline)
+    for future in pending:
+        future.cancel()
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    for future in done:
+        error = future.exception()
+        if error is None:
+            results[futures[future]] = future.result()
+        else:
+            errors[futures[future]] = error
+
+    return _collect(list(calls), results, errors, started)
+
+
+async def afan_out(
+    calls: Dict[str, Callable[[], Awaitable[Any]]],
+    deadline: Optional[float] = FANOUT_DEADLINE,
+) -> FanOutResult:
+    """
+    Versione asyncio di ``fan_out``: le coroutine oltre la deadline vengono
+    cancellate (le richieste condivise via SingleFlight proseguono per gli
+    altri chiamanti).
+    """
+    started = time.monotonic()
+    tasks: Dict["asyncio.Future[Any]", str] = {
+        asyncio.ensure_future(fn()): name for name, fn in calls.items()
+    }
+    if not tasks:
+        return FanOutResult({}, [])
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    for task in done:
+        error = task.exception()
+        if error is None:
+            results[tasks[task]] = task.result()
+        else:
+            errors[tasks[task]] = error
+
+    return _collect(list(calls), results, errors, started)
+
+
+def with_missing_notice(
+    payload: Dict[str, Any], missing: Iterable[str]
+) -> Dict[str, Any]:
+    """Aggiunge le sezioni mancanti al risultato di un tool se serve"""
+    missing = list(missing)
+    if missing:
+        payload["partial"] = True
+        payload["missing_sections"] = missing
+        payload["partial_notice"] = PARTIAL_NOTICE
+    return payload
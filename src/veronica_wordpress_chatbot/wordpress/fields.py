@@ -0,0 +1,134 @@
+"""
+Field projection - build `_fields` per endpoint and track payload sizes
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    FIELDS_PROJECTION_ENABLED,
+    WORDPRESS_EXTRA_FIELDS,
+    WORDPRESS_FIELD_CONFIGS,
+)
+
+# Campi sempre necessari: identità e revisione (cache, mirror, fingerprint)
+BASE_FIELDS = ("id", "modified")
+
+
+def build_fields_projection(endpoint: str) -> Optional[str]:
+    """
+    Costruisce il parametro ``_fields`` per un endpoint.
+
+    Unisce i campi top-level di WORDPRESS_FIELD_CONFIGS, la tassonomia
+    dell'endpoint (letta dai filtri per categoria di mirror e snapshot), i
+    campi ACF come ``acf.<campo>`` e gli eventuali WORDPRESS_EXTRA_FIELDS.
+
+    Returns:
+        Lista di campi separata da virgole, o None se l'endpoint non è configurato
+    """
+    config = WORDPRESS_FIELD_CONFIGS.get(endpoint)
+    if config is None:
+        return None
+
+    fields: List[str] = list(BASE_FIELDS)
+    fields.extend(f.strip() for f in str(config.get("fields", "")).split(","))
+    if config.get("taxonomy"):
+        fields.append(str(config["taxonomy"]))
+    acf_fields = config.get("acf_fields") or []
+    fields.extend(f"acf.{name}" for name in acf_fields)  # type: ignore[attr-defined]
+    fields.extend(WORDPRESS_EXTRA_FIELDS.get(endpoint, []))
+
+    # Rimuovi duplicati e vuoti mantenendo l'ordine
+    return ",".join(dict.fromkeys(f for f in fields if f))
+
+
+def apply_projection(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aggiunge ``_fields`` ai parametri di richiesta.
+
+    Un ``_fields`` esplicito del chiamante viene unito alla proiezione
+    dell'endpoint invece di sostituirla.
+    """
+    if not FIELDS_PROJECTION_ENABLED:
+        return params
+
+    projection = build_fields_projection(endpoint)
+    if projection is None:
+        return params
+
+    requested = params.get("_fields")
+    if requested:
+        projection = ",".join(
+            dict.fromkeys(projection.split(",") + str(requested).split(","))
+        )
+
+    return {**params, "_fields": projection}
+
+
+class PayloadStats:
+    """Byte scaricati per endpoint, con misura opzionale prima/dopo la proiezione"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._downloads: Dict[str, Dict[str, int]] = {}
+        self._measurements: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, size: int, items: int) -> None:
+        """Registra un download completato"""
+        with self._lock:
+            stats = self._downloads.setdefault(
+                endpoint, {"requests": 0, "bytes": 0, "items": 0}
+            )
+            stats["requests"] += 1
+            stats["bytes"] += size
+            stats["items"] += items
+
+    def record_measurement(
+        self, endpoint: str, full_bytes: int, projected_bytes: int, items: int
+    ) -> Dict[str, Any]:
+        """Registra il confronto tra payload completo e proiettato"""
+        measurement = {
+            "items": items,
+            "bytes_before": full_bytes,
+            "bytes_after": projected_bytes,
+            "reduction": (
+                round(1 - projected_bytes / full_bytes, 3) if full_bytes else 0.0
+            ),
+        }
+        with self._lock:
+            self._measurements[endpoint] = measurement
+        return measurement
+
+    def clear(self) -> None:
+        """Azzera le statistiche"""
+        with self._lock:
+            self._downloads.clear()
+            self._measurements.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiche per endpoint"""
+        with self._lock:
+            endpoints: Dict[str, Any] = {}
+            for endpoint, downloads in self._downloads.items():
+                endpoints[endpoint] = {
+                    **downloads,
+                    "avg_bytes_per_item": (
+                        downloads["bytes"] // downloads["items"]
+                        if downloads["items"]
+                        else 0
+                    ),
+                }
+            for endpoint, measurement in self._measurements.items():
+                endpoints.setdefault(endpoint, {})["projection"] = measurement
+            return {
+                "projection_enabled": FIELDS_PROJECTION_ENABLED,
+                "endpoints": endpoints,
+            }
+
+
+_payload_stats = PayloadStats()
+
+
+def get_payload_stats() -> PayloadStats:
+    """Restituisce le statistiche payload condivise dal processo"""
+    return _payload_stats
@@ -0,0 +1,247 @@
+"""
+Hedged requests - duplicate slow WordPress GETs to cut tail latency
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from ..config import (
+    HEDGING_ENABLED,
+    HEDGING_MAX_RATIO,
+    HEDGING_MIN_DELAY,
+    HEDGING_MIN_SAMPLES,
+    HEDGING_PERCENTILE,
+    HEDGING_WINDOW,
+    HTTP_POOL_MAXSIZE,
+)
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+T = TypeVar("T")
+
+# Worker per le richieste hedged del client sync (creato al primo utilizzo)
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Executor condiviso per primaria e hedge (dimensionato sul pool HTTP)"""
+    global _hedge_executor
+
+    with _executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="wp-hedge"
+            )
+        return _hedge_executor
+
+
+class HedgingPolicy:
+    """
+    Hedging delle GET WordPress.
+
+    Tiene una finestra delle latenze recenti per endpoint: se una richiesta
+    supera il percentile configurato ne parte una seconda identica e vince
+    la prima risposta. Le richieste extra sono limitate a ``max_ratio`` del
+    totale per non raddoppiare il carico su un host già lento.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = HEDGING_ENABLED,
+        percentile: float = HEDGING_PERCENTILE,
+        max_ratio: float = HEDGING_MAX_RATIO,
+        min_samples: int = HEDGING_MIN_SAMPLES,
+        window: int = HEDGING_WINDOW,
+        min_delay: float = HEDGING_MIN_DELAY,
+    ) -> None:
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.budget_exhausted = 0
+
+    def record_latency(self, endpoint: str, seconds: float) -> None:
+        """Aggiunge un campione di latenza per l'endpoint"""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Attesa prima dell'hedge, o None se i campioni non bastano"""
+        with self._lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+
+        if len(samples) < self.min_samples:
+            return None
+
+        index = math.ceil(self.percentile / 100 * len(samples)) - 1
+        return max(samples[min(max(index, 0), len(samples) - 1)], self.min_delay)
+
+    def call(self, endpoint: str, fn: Callable[[], T]) -> T:
+        """
+        Esegue ``fn`` (una GET idempotente) con hedging.
+
+        Nel client sync la richiesta perdente non può essere interrotta:
+        termina in background e restituisce la connessione al pool.
+        """
+        delay = self._start(endpoint)
+        if delay is None:
+            return self._timed(endpoint, fn)
+
+        executor = _get_executor()
+        primary = executor.submit(self._timed, endpoint, fn)
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire(endpoint):
+            return primary.result()
+
+        hedge = executor.submit(self._timed, endpoint, fn)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self._settle(endpoint, future is hedge)
+                    return future.result()
+
+        assert error is not None
+        raise error
+
+    async def acall(self, endpoint: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Versione asyncio di ``call``: la richiesta perdente viene cancellata"""
+        delay = self._start(endpoint)
+        if delay is None:
+            return await self._atimed(endpoint, fn)
+
+        primary = asyncio.ensure_future(self._atimed(endpoint, fn))
+        tasks = [primary]
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._acquire(endpoint):
+                return await primary
+
+            hedge = asyncio.ensure_future(self._atimed(endpoint, fn))
+            tasks.append(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        self._settle(endpoint, task is hedge)
+                        return task.result()
+
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def clear(self) -> None:
+        """Rimuove i campioni e azzera le metriche"""
+        with self._lock:
+            self._latencies.clear()
+            self.requests = self.fired = self.won = self.budget_exhausted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Quante volte l'hedging è partito e quante ha vinto"""
+        with self._lock:
+            samples = {name: len(window) for name, window in self._latencies.items()}
+
+        endpoints = {}
+        for endpoint, count in samples.items():
+            delay = self.hedge_delay(endpoint)
+            endpoints[endpoint] = {
+                "samples": count,
+                "hedge_after": round(delay, 3) if delay is not None else None,
+            }
+
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "percentile": self.percentile,
+                "max_ratio": self.max_ratio,
+                "requests": self.requests,
+                "fired": self.fired,
+                "won": self.won,
+                "budget_exhausted": self.budget_exhausted,
+                "fired_ratio": (
+                    round(self.fired / self.requests, 3) if self.requests else 0.0
+                ),
+                "win_rate": round(self.won / self.fired, 3) if self.fired else 0.0,
+                "endpoints": endpoints,
+            }
+
+    def _start(self, endpoint: str) -> Optional[float]:
+        """Conta la richiesta e restituisce l'attesa prima dell'hedge"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self.requests += 1
+        return self.hedge_delay(endpoint)
+
+    def _acquire(self, endpoint: str) -> bool:
+        """Riserva un hedge se il budget di richieste extra lo consente"""
+        with self._lock:
+            if self.fired + 1 > self.max_ratio * self.requests:
+                self.budget_exhausted += 1
+                return False
+            self.fired += 1
+        logger.debug(f"WordPress hedged request: {endpoint}")
+        return True
+
+    def _settle(self, endpoint: str, hedge_won: bool) -> None:
+        """Registra quale delle due richieste ha risposto per prima"""
+        if hedge_won:
+            with self._lock:
+                self.won += 1
+            logger.info(f"WordPress hedge vincente: {endpoint}")
+
+    def _timed(self, endpoint: str, fn: Callable[[], T]) -> T:
+        """Esegue ``fn`` registrando la latenza in caso di successo"""
+        started = time.perf_counter()
+        result = fn()
+        self.record_latency(endpoint, time.perf_counter() - started)
+        return result
+
+    async def _atimed(self, endpoint: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Versione async di ``_timed``"""
+        started = time.perf_counter()
+        result = await fn()
+        self.record_latency(endpoint, time.perf_counter() - started)
+        return result
+
+
+_hedging_policy = HedgingPolicy()
+
+
+def get_hedging_policy() -> HedgingPolicy:
+    """Restituisce la policy di hedging condivisa dal processo"""
+    return _hedging_policy
@@ -0,0 +1,133 @@
+"""
+HTML to text - single-pass converter used by ContentProcessor
+"""
+
+import re
+from html import unescape
+from typing import List, Optional
+
+# Tag di blocco: separano sempre le parole (paragrafo o a capo con paragraphs)
+_PARAGRAPH_TAGS = frozenset(
+    "p div section article header footer aside main blockquote pre figure "
+    "figcaption table ul ol dl h1 h2 h3 h4 h5 h6 hr".split()
+)
+_LINE_TAGS = frozenset(("br", "li", "dt", "dd", "tr", "td", "th"))
+
+# Tag il cui contenuto non è testo leggibile
+_SKIP_TAGS = frozenset(("script", "style", "noscript", "template", "svg"))
+
+# Marcatori (Unicode private use, non spazi) sostituiti alla fine del testo
+_PARAGRAPH = "\ue000"
+_LINE = "\ue001"
+_BREAKS = re.compile(" ?[\ue000\ue001][\ue000\ue001 ]*")
+
+
+def _breaks(match: "re.Match[str]") -> str:
+    return "\n\n" if _PARAGRAPH in match.group(0) else "\n"
+
+
+def _finish(parts: List[str], paragraphs: bool) -> str:
+    """Decodifica le entità e comprime gli spazi del testo raccolto"""
+    text = " ".join(unescape("".join(parts)).split())
+    if paragraphs:
+        text = _BREAKS.sub(_breaks, text).strip()
+    return text
+
+
+def html_to_text(
+    html: str, max_length: Optional[int] = None, paragraphs: bool = False
+) -> str:
+    """
+    Converte HTML in testo con una sola scansione del documento.
+
+    - rimuove tag e commenti (anche i blocchi Gutenberg) e scarta il
+      contenuto di script/style
+    - decodifica tutte le entità, nominali e numeriche (es. ``&#8217;``)
+    - comprime gli spazi; i tag di blocco separano le parole e con
+      ``paragraphs=True`` diventano paragrafi e a capo
+    - con ``max_length`` si ferma appena il testo supera la lunghezza e lo
+      tronca aggiungendo "..."
+
+    Args:
+        html: Contenuto HTML (es. ``content.rendered`` di WordPress)
+        max_length: Lunghezza massima del testo (None = tutto)
+        paragraphs: Mantiene paragrafi e a capo dei tag di blocco
+    """
+    if not html:
+        return ""
+
+    # Ogni chunk dopo il primo inizia con il contenuto di un tag: "p>testo"
+    chunks = html.split("<")
+    parts: List[str] = [chunks[0]]
+    append = parts.append
+    paragraph_break = _PARAGRAPH if paragraphs else " "
+    line_break = _LINE if paragraphs else " "
+
+    skip_until = ""
+    # Caratteri raccolti: mai meno di quelli del testo finale (entità e spazi
+    # si accorciano), quindi il testo viene misurato solo quando può bastare
+    collected = len(chunks[0])
+    limit = -1 if max_length is None else max_length
+    check_at = limit + 1 if limit >= 0 else -1
+
+    for chunk in chunks[1:]:
+        if skip_until:
+            # Dentro un commento o uno script: cerca la chiusura
+            if skip_until == "-->":
+                end = chunk.find("-->")
+                if end < 0:
+                    continue
+                text = chunk[end + 3 :]
+            else:
+                if chunk[: len(skip_until)].lower() != skip_until:
+                    continue
+                end = chunk.find(">")
+                text = chunk[end + 1 :] if end >= 0 else ""
+            skip_until = ""
+        else:
+            end = chunk.find(">")
+            head = chunk[:end]
+            first = head[:1]
+
+            if end < 0 or not first or not (first.isalpha() or first in "/!?"):
+                # "<" letterale nel testo (es. "a < b")
+                append("<")
+                collected += 1
+                text = chunk
+            elif first in "!?":
+                if head.startswith("!--") and not head.endswith("--"):
+                    comment_end = chunk.find("-->")
+                    if comment_end < 0:
+                        skip_until = "-->"
+                        continue
+                    end = comment_end + 2
+                text = chunk[end + 1 :]
+            else:
+                closing = first == "/"
+                name = (head[1:] if closing else head).split(None, 1)
+                tag = name[0].rstrip("/").lower() if name else ""
+                if tag in _SKIP_TAGS and not closing and not head.endswith("/"):
+                    skip_until = "/" + tag
+                    continue
+                if tag in _PARAGRAPH_TAGS:
+                    append(paragraph_break)
+                    collected += 2
+                elif tag in _LINE_TAGS:
+                    append(line_break)
+                    collected += 1
+                text = chunk[end + 1 :]
+
+        if text:
+            append(text)
+            collected += len(text)
+
+        if 0 <= check_at <= collected:
+            length = len(_finish(parts, paragraphs))
+            if length > limit:
+                break
+            check_at = collected + limit + 1 - length
+
+    text = _finish(parts, paragraphs)
+    if 0 <= limit < len(text):
+        return text[:limit] + "..."
+    return text
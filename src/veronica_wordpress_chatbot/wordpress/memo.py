@@ -0,0 +1,179 @@
+"""
+Processed document cache - memoizes ContentProcessor output per revision
+"""
+
+import functools
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from ..config import PROCESSED_CACHE_MAX_BYTES
+from .records import ContentRecord
+
+Processor = Callable[[Dict[str, Any]], Any]
+_Key = Tuple[str, Hashable, str]
+
+
+def _estimate_size(value: Any) -> int:
+    """Dimensione stimata di un documento processato (byte del JSON)"""
+    if isinstance(value, ContentRecord):
+        # Il JSON calcolato qui viene riusato da dumps_result
+        return len(value.to_json()) + 64
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str)) + 64
+    except (TypeError, ValueError):
+        return 1024
+
+
+class ProcessedCache:
+    """
+    Cache LRU thread-safe dei documenti già processati.
+
+    La chiave è ``(post_type, id, modified)``: una nuova revisione su
+    WordPress cambia ``modified`` e quindi viene processata di nuovo, mentre
+    le richieste successive della stessa revisione non ripuliscono l'HTML.
+    Gli item senza ``id`` o ``modified`` vengono processati senza cache.
+    I documenti restituiti sono condivisi tra le richieste: non modificarli.
+    """
+
+    def __init__(self, max_bytes: int = PROCESSED_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[_Key, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(post_type: str, item: Dict[str, Any]) -> Optional[_Key]:
+        """Chiave della revisione, o None se l'item non la identifica"""
+        item_id = item.get("id")
+        modified = item.get("modified")
+        if item_id is None or not modified:
+            return None
+        return post_type, item_id, str(modified)
+
+    def get_or_process(
+        self, post_type: str, item: Dict[str, Any], processor: Processor
+    ) -> Any:
+        """Documento processato dalla cache, oppure processato e salvato"""
+        key = self.make_key(post_type, item) if self.max_bytes > 0 else None
+        if key is None:
+            with self._lock:
+                self.uncached += 1
+            return processor(item)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        # Fuori dal lock: due thread sulla stessa revisione processano due
+        # volte lo stesso item, senza bloccare gli altri
+        value = processor(item)
+        self._store(key, value)
+        return value
+
+    def prime(
+        self, post_type: str, items: Iterable[Dict[str, Any]], processed: Iterable[Any]
+    ) -> int:
+        """
+        Precarica documenti già processati (es. dallo snapshot offline).
+
+        Returns:
+            Numero di documenti salvati
+        """
+        stored = 0
+        for item, value in zip(items, processed):
+            key = self.make_key(post_type, item)
+            if key is not None:
+                self._store(key, value)
+                stored += 1
+        return stored
+
+    def invalidate(self, post_type: Optional[str] = None) -> int:
+        """Rimuove i documenti di un post type (o tutti)"""
+        with self._lock:
+            keys = [
+                key for key in self._entries if post_type is None or key[0] == post_type
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Svuota la cache e azzera le statistiche"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.uncached = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiche di utilizzo della cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _store(self, key: _Key, value: Any) -> None:
+        """Salva un documento applicando l'eviction LRU"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: _Key) -> None:
+        """Rimuove un documento (chiamare con il lock acquisito)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+_processed_cache = ProcessedCache()
+
+
+def get_processed_cache() -> ProcessedCache:
+    """Restituisce la cache dei documenti processati condivisa dal processo"""
+    return _processed_cache
+
+
+def memoized(post_type: str) -> Callable[[Processor], Processor]:
+    """
+    Decoratore per i metodi ``process_*`` di ContentProcessor: ogni
+    revisione viene processata una sola volta per processo. La funzione
+    originale resta disponibile come ``.uncached``.
+    """
+
+    def decorator(processor: Processor) -> Processor:
+        @functools.wraps(processor)
+        def wrapper(item: Dict[str, Any]) -> Any:
+            return _processed_cache.get_or_process(post_type, item, processor)
+
+        wrapper.uncached = processor  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
@@ -0,0 +1,515 @@
+"""
+Content mirror - local SQLite copy of the WordPress collections with incremental sync
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from ..config import (
+    DEFAULT_REQUEST_PARAMS,
+    MIRROR_PATH,
+    MIRROR_SYNC_INTERVAL,
+    WORDPRESS_FIELD_CONFIGS,
+    Configuration,
+)
+from ..utils.logging_config import setup_logging
+from .async_client import AsyncWordPressClient
+from .client import OptimizedWordPressClient
+from .search_index import fold_accents
+from .taxonomy import ENDPOINT_TAXONOMIES
+
+logger = setup_logging(__name__)
+
+# Collezioni replicate (tutti i post type letti dai tool)
+MIRROR_ENDPOINTS = tuple(WORDPRESS_FIELD_CONFIGS)
+
+# Parametri che il mirror sa risolvere; con altri filtri si va su WordPress
+_TAXONOMY_PARAMS = set(ENDPOINT_TAXONOMIES.values())
+_SUPPORTED_PARAMS = {"per_page", "page", "search", "orderby", "order"}
+_SUPPORTED_PARAMS |= _TAXONOMY_PARAMS
+# Filtri di iter_collection risolti dal mirror (crawl dell'indice di ricerca)
+_COLLECTION_PARAMS = {"modified_after", "orderby", "order"}
+_ORDER_COLUMNS = {"date": "date", "modified": "modified", "title": "title", "id": "id"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    endpoint TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    date TEXT NOT NULL DEFAULT '',
+    modified TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    search_text TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    PRIMARY KEY (endpoint, id)
+);
+CREATE INDEX IF NOT EXISTS items_by_date ON items (endpoint, date DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    endpoint TEXT PRIMARY KEY,
+    max_modified TEXT NOT NULL DEFAULT '',
+    last_full_sync REAL NOT NULL DEFAULT 0,
+    last_sync REAL NOT NULL DEFAULT 0,
+    item_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _rendered(value: Any) -> str:
+    """Testo di un campo WordPress ({"rendered": ...} oppure stringa)"""
+    if isinstance(value, dict):
+        return str(value.get("rendered", ""))
+    return str(value or "")
+
+
+def _row(endpoint: str, item: Dict[str, Any]) -> tuple:
+    """Riga della tabella items per un item WordPress"""
+    title = _rendered(item.get("title"))
+    # Senza accenti, come i termini cercati (vedi query_rewrite)
+    search_text = fold_accents(
+        " ".join(
+            (title, _rendered(item.get("content")), _rendered(item.get("excerpt")))
+        )
+    )
+    return (
+        endpoint,
+        int(item["id"]),
+        str(item.get("date") or ""),
+        str(item.get("modified") or ""),
+        title,
+        search_text,
+        json.dumps(item, ensure_ascii=False),
+    )
+
+
+def _like(term: str) -> str:
+    """Pattern LIKE con escape di % e _"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _term_ids(value: Any) -> List[int]:
+    """ID da un filtro per tassonomia (int, "1,2" oppure lista)"""
+    values = value if isinstance(value, (list, tuple, set)) else str(value).split(",")
+    return [int(v) for v in values if str(v).strip()]
+
+
+class ContentMirror:
+    """
+    Copia SQLite locale delle collezioni WordPress.
+
+    - ``sync_endpoint(full=True)`` scarica l'intera collezione
+    - la sync incrementale chiede solo gli item con ``modified_after``
+      l'ultima modifica vista e confronta gli ID per rilevare le cancellazioni
+    - ``query`` risponde alle stesse richieste dei tool (per_page, page,
+      search, orderby, order e filtri per tassonomia come ``tool-category``)
+      senza passare dalla rete
+    """
+
+    def __init__(
+        self,
+        path: str = MIRROR_PATH,
+        client: Optional[OptimizedWordPressClient] = None,
+    ) -> None:
+        self.path = path
+        self._client = client
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._synced: Set[str] = set()
+        self.last_error: Optional[str] = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            self._synced = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT endpoint FROM sync_state WHERE last_full_sync > 0"
+                )
+            }
+
+    @property
+    def client(self) -> OptimizedWordPressClient:
+        """Client WordPress usato per la sincronizzazione"""
+        if self._client is None:
+            self._client = OptimizedWordPressClient(Configuration().wordpress_base_url)
+        return self._client
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connessione SQLite del thread corrente (WAL: letture non bloccate)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def has_endpoint(self, endpoint: str) -> bool:
+        """True se la collezione è stata sincronizzata almeno una volta"""
+        return endpoint in self._synced
+
+    def query(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Risponde a una richiesta dal mirror.
+
+        Returns:
+            Lista di item come restituiti da WordPress, oppure None se la
+            collezione non è sincronizzata o i parametri non sono supportati
+        """
+        if not self.has_endpoint(endpoint):
+            return None
+
+        params = params or {}
+        if not set(params) <= _SUPPORTED_PARAMS:
+            return None
+
+        request = {**DEFAULT_REQUEST_PARAMS, **params}
+        per_page = int(request["per_page"])
+        page = max(int(request.get("page", 1)), 1)
+        column = _ORDER_COLUMNS.get(str(request["orderby"]), "date")
+        direction = "ASC" if str(request["order"]).lower() == "asc" else "DESC"
+
+        sql = "SELECT data FROM items WHERE endpoint = ?"
+        args: List[Any] = [endpoint]
+        for term in fold_accents(str(request.get("search") or "")).split():
+            sql += " AND search_text LIKE ? ESCAPE '\\'"
+            args.append(_like(term))
+        for taxonomy in _TAXONOMY_PARAMS.intersection(params):
+            ids = _term_ids(params[taxonomy])
+            marks = ", ".join("?" * len(ids)) or "NULL"
+            sql += (
+                " AND EXISTS (SELECT 1 FROM json_each(data, ?)"
+                f" WHERE value IN ({marks}))"
+            )
+            args.append(f'$."{taxonomy}"')
+            args.extend(ids)
+        sql += f" ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?"
+        args.extend((per_page, (page - 1) * per_page))
+
+        rows = self._connection().execute(sql, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def collection(
+        self, endpoint: str, modified_after: str = ""
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Tutti gli item della collezione, dal meno recente, modificati dopo
+        ``modified_after`` se indicato
+
+        Returns:
+            Lista di item, oppure None se la collezione non è sincronizzata
+        """
+        if not self.has_endpoint(endpoint):
+            return None
+
+        sql = "SELECT data FROM items WHERE endpoint = ?"
+        args: List[Any] = [endpoint]
+        if modified_after:
+            sql += " AND modified > ?"
+            args.append(modified_after)
+        sql += " ORDER BY modified ASC, id ASC"
+
+        rows = self._connection().execute(sql, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def sync_endpoint(self, endpoint: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Sincronizza una collezione.
+
+        La prima sync (o ``full=True``) scarica tutto; le successive scaricano
+        solo gli item modificati e rimuovono quelli non più pubblicati.
+
+        Raises:
+            requests.exceptions.RequestException: se WordPress non risponde; il
+                mirror resta invariato
+        """
+        started = time.perf_counter()
+        state = self._state(endpoint)
+        incremental = not full and bool(state and state["max_modified"])
+
+        if incremental:
+            params = {
+                "modified_after": state["max_modified"],  # type: ignore[index]
+                "orderby": "modified",
+                "order": "asc",
+            }
+            changed = list(self.client.iter_collection(endpoint, params))
+            live_ids = {
+                int(item["id"])
+                for item in self.client.iter_collection(endpoint, fields="id")
+            }
+        else:
+            changed = list(self.client.iter_collection(endpoint))
+            live_ids = {int(item["id"]) for item in changed}
+
+        with self._sync_lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_row(endpoint, item) for item in changed],
+            )
+            deleted = self._delete_missing(conn, endpoint, live_ids)
+
+            max_modified, count = conn.execute(
+                "SELECT COALESCE(MAX(modified), ''), COUNT(*) FROM items "
+                "WHERE endpoint = ?",
+                (endpoint,),
+            ).fetchone()
+            now = time.time()
+            conn.execute(
+                "INSERT INTO sync_state VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(endpoint) DO UPDATE SET "
+                "max_modified = excluded.max_modified, "
+                "last_full_sync = MAX(last_full_sync, excluded.last_full_sync), "
+                "last_sync = excluded.last_sync, item_count = excluded.item_count",
+                (endpoint, max_modified, 0 if incremental else now, now, count),
+            )
+
+        self._synced.add(endpoint)
+        result = {
+            "endpoint": endpoint,
+            "mode": "incremental" if incremental else "full",
+            "upserted": len(changed),
+            "deleted": deleted,
+            "items": count,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"Mirror sync {endpoint}: {result}")
+        return result
+
+    def sync(
+        self, endpoints: Iterable[str] = MIRROR_ENDPOINTS, full: bool = False
+    ) -> Dict[str, Any]:
+        """Sincronizza più collezioni; un errore non blocca le altre"""
+        results: Dict[str, Any] = {}
+        for endpoint in endpoints:
+            try:
+                results[endpoint] = self.sync_endpoint(endpoint, full=full)
+            except Exception as e:
+                self.last_error = f"{endpoint}: {e}"
+                logger.error(f"Mirror sync fallita per {endpoint}: {e}")
+                results[endpoint] = {"endpoint": endpoint, "error": str(e)}
+        return results
+
+    def refresh_item(self, endpoint: str, item_id: int) -> bool:
+        """
+        Riscarica un singolo item (dopo un webhook di salvataggio).
+
+        Se WordPress non lo restituisce più (bozza, cestino) viene rimosso.
+
+        Returns:
+            True se l'item è presente nel mirror dopo l'aggiornamento
+        """
+        if not self.has_endpoint(endpoint):
+            return False
+
+        items = list(self.client.iter_collection(endpoint, {"include": item_id}))
+
+        if not items:
+            self.invalidate(endpoint, item_id)
+            return False
+
+        with self._sync_lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_row(endpoint, item) for item in items],
+            )
+        return True
+
+    def invalidate(self, endpoint: str, item_id: Optional[int] = None) -> int:
+        """
+        Rimuove un item (o un'intera collezione) dal mirror.
+
+        Returns:
+            Numero di item rimossi
+        """
+        with self._sync_lock, self._connection() as conn:
+            if item_id is None:
+                cursor = conn.execute(
+                    "DELETE FROM items WHERE endpoint = ?", (endpoint,)
+                )
+                conn.execute("DELETE FROM sync_state WHERE endpoint = ?", (endpoint,))
+                self._synced.discard(endpoint)
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM items WHERE endpoint = ? AND id = ?",
+                    (endpoint, item_id),
+                )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Item e ultima sincronizzazione per collezione"""
+        rows = self._connection().execute(
+            "SELECT endpoint, item_count, last_full_sync, last_sync FROM sync_state"
+        )
+        return {
+            "path": self.path,
+            "endpoints": {
+                endpoint: {
+                    "items": count,
+                    "last_full_sync": last_full or None,
+                    "last_sync": last_sync or None,
+                }
+                for endpoint, count, last_full, last_sync in rows
+            },
+            "last_error": self.last_error,
+        }
+
+    def close(self) -> None:
+        """Chiude la connessione del thread corrente"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _state(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Stato di sincronizzazione della collezione"""
+        sql = "SELECT max_modified, last_full_sync FROM sync_state WHERE endpoint = ?"
+        row = self._connection().execute(sql, (endpoint,)).fetchone()
+        if row is None:
+            return None
+        return {"max_modified": row[0], "last_full_sync": row[1]}
+
+    @staticmethod
+    def _delete_missing(
+        conn: sqlite3.Connection, endpoint: str, live_ids: Set[int]
+    ) -> int:
+        """Rimuove gli item non più presenti su WordPress"""
+        rows = conn.execute("SELECT id FROM items WHERE endpoint = ?", (endpoint,))
+        stored = {row[0] for row in rows}
+        missing = stored - live_ids
+
+        if missing and not live_ids:
+            # Una collezione vuota di colpo è più probabilmente un errore lato
+            # WordPress che una cancellazione di massa: non toccare il mirror
+            logger.warning(
+                f"Mirror: {endpoint} vuoto su WordPress, cancellazioni ignorate"
+            )
+            return 0
+
+        conn.executemany(
+            "DELETE FROM items WHERE endpoint = ? AND id = ?",
+            [(endpoint, item_id) for item_id in missing],
+        )
+        return len(missing)
+
+
+class MirrorWordPressClient(OptimizedWordPressClient):
+    """
+    Client con la stessa interfaccia di OptimizedWordPressClient che legge
+    dal mirror SQLite; le richieste non coperte vanno su WordPress.
+    """
+
+    def __init__(self, base_url: str, mirror: Optional["ContentMirror"] = None) -> None:
+        super().__init__(base_url)
+        self.mirror = mirror or get_content_mirror()
+
+    def _make_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Legge dal mirror se possibile, altrimenti da WordPress"""
+        mirrored = self.mirror.query(endpoint, params)
+        if mirrored is not None:
+            logger.debug(f"WordPress mirror hit: {endpoint}")
+            return mirrored
+        return super()._make_request(endpoint, params)
+
+    def iter_collection(  # type: ignore[override]
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera la collezione dal mirror (es. il crawl dell'indice di ricerca),
+        con ``modified_after`` e ``fields``; altri filtri e collezioni non
+        ancora sincronizzate vanno su WordPress
+        """
+        items = None
+        if set(params or {}) <= _COLLECTION_PARAMS:
+            modified_after = str((params or {}).get("modified_after") or "")
+            items = self.mirror.collection(endpoint, modified_after)
+        if items is None:
+            yield from super().iter_collection(endpoint, params, **kwargs)
+            return
+
+        logger.debug(f"WordPress mirror hit: {endpoint} (collezione)")
+        fields = kwargs.get("fields")
+        if fields:
+            keys = {field.split(".")[0] for field in str(fields).split(",")}
+            items = [
+                {key: value for key, value in item.items() if key in keys}
+                for item in items
+            ]
+        yield from items
+
+
+class AsyncMirrorWordPressClient(AsyncWordPressClient):
+    """Versione async di MirrorWordPressClient (le query SQLite sono sub-ms)"""
+
+    def __init__(self, base_url: str, mirror: Optional["ContentMirror"] = None) -> None:
+        super().__init__(base_url)
+        self.mirror = mirror or get_content_mirror()
+
+    async def _make_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Legge dal mirror se possibile, altrimenti da WordPress"""
+        mirrored = self.mirror.query(endpoint, params)
+        if mirrored is not None:
+            logger.debug(f"WordPress mirror hit: {endpoint}")
+            return mirrored
+        return await super()._make_request(endpoint, params)
+
+
+_content_mirror: Optional[ContentMirror] = None
+_mirror_lock = threading.Lock()
+_sync_thread: Optional[threading.Thread] = None
+_sync_stop = threading.Event()
+
+
+def get_content_mirror() -> ContentMirror:
+    """Restituisce il mirror condiviso dal processo (aperto al primo utilizzo)"""
+    global _content_mirror
+
+    with _mirror_lock:
+        if _content_mirror is None:
+            _content_mirror = ContentMirror()
+        return _content_mirror
+
+
+def start_mirror_sync(interval: float = MIRROR_SYNC_INTERVAL) -> None:
+    """
+    Avvia la sincronizzazione in background: sync iniziale (full per le
+    collezioni mai scaricate), poi incrementale ogni ``interval`` secondi.
+    """
+    global _sync_thread
+
+    if _sync_thread is not None and _sync_thread.is_alive():
+        return
+
+    def _run() -> None:
+        mirror = get_content_mirror()
+        while not _sync_stop.is_set():
+            mirror.sync()
+            _sync_stop.wait(interval)
+
+    _sync_stop.clear()
+    _sync_thread = threading.Thread(target=_run, name="wp-mirror-sync", daemon=True)
+    _sync_thread.start()
+
+
+def stop_mirror_sync() -> None:
+    """Ferma la sincronizzazione in background"""
+    global _sync_thread
+
+    _sync_stop.set()
+    if _sync_thread is not None:
+        _sync_thread.join(timeout=5)
+        _sync_thread = None
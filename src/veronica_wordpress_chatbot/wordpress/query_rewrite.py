@@ -0,0 +1,207 @@
+"""
+Query rewriting - keyword queries for WordPress ``search`` from free text
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, NamedTuple
+
+from ..config import SEARCH_QUERY_MAX_TERMS, SEARCH_SYNONYMS
+from .search_index import STOPWORDS, stem
+
+# Parole da conversazione che non identificano un contenuto ("hai scritto
+# articoli su...", "tell me about projects on...")
+QUERY_NOISE = frozenset(
+    """
+    articolo articoli post blog contenuto contenuti sito veronica schembri
+    scritto scritta scritti parlato parla parlano lavorato fatto usato usi usa
+    utilizzato conosci sai puoi potresti dimmi cerca cerco trova mostra mostrami
+    vorrei sapere qualcosa qualche esperienza argomento riguardo riguarda tema
+    sull sugli sulla sui quale quali tuo tua tuoi tue perche quanto quanti
+    dell nell dall all cos quest quell
+    article articles posts content site written write wrote talk talked worked
+    work used use know can could tell me show find search looking something any
+    some topic regarding your you i my did does
+    """.split()
+)
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+_SENTENCE_END_RE = re.compile(r"(?:^|[.!?:]\s*)$")
+_MIN_STEM = 4
+# Secondi entro cui una ricerca dopo una ricerca vuota conta come nuovo tentativo
+RETRY_WINDOW = 60.0
+
+
+def fold(text: str) -> str:
+    """Testo senza accenti, maiuscole conservate ("Perché" → "Perche")"""
+    normalized = unicodedata.normalize("NFKD", text)
+    return normalized.encode("ascii", "ignore").decode("ascii")
+
+
+def _variant_pattern(variant: str) -> str:
+    """Pattern di una variante: parole separate da spazi o trattini"""
+    words = _TOKEN_RE.findall(fold(variant))
+    return r"[\s\-]+".join(re.escape(word) for word in words)
+
+
+def _normalize(text: str) -> str:
+    """Forma di confronto: minuscolo, senza accenti, parole separate da spazio"""
+    return " ".join(_TOKEN_RE.findall(fold(text).lower()))
+
+
+# Variante → termine del sito; anche il termine stesso, per uniformarne la
+# forma ("llm" → "LLM")
+_SYNONYMS: Dict[str, str] = {
+    _normalize(variant): term
+    for term, variants in SEARCH_SYNONYMS.items()
+    for variant in (term, *variants)
+}
+# Varianti più lunghe prima: "large language models" vince su "language model"
+_SYNONYM_RE = re.compile(
+    r"\b(?:"
+    + "|".join(
+        _variant_pattern(variant)
+        for variant in sorted(_SYNONYMS, key=len, reverse=True)
+    )
+    + r")\b",
+    re.IGNORECASE,
+)
+
+
+class Keyword(NamedTuple):
+    """Parola chiave estratta da una query"""
+
+    position: int
+    text: str
+    # 2 = termine del dizionario dei sinonimi, 1 = nome proprio, 0 = parola
+    priority: int
+
+
+def extract_keywords(query: str) -> List[Keyword]:
+    """
+    Parole chiave di una query nell'ordine in cui compaiono: sinonimi
+    ricondotti al termine del sito, poi le altre parole senza accenti,
+    stopword e parole da conversazione, ridotte alla radice ("agenti" →
+    "agent") tranne i nomi propri.
+    """
+    text = fold(query)
+    keywords: List[Keyword] = []
+    seen = set()
+
+    def add(position: int, term: str, priority: int) -> None:
+        if term.lower() not in seen:
+            seen.add(term.lower())
+            keywords.append(Keyword(position, term, priority))
+
+    def replace(match: "re.Match[str]") -> str:
+        add(match.start(), _SYNONYMS[_normalize(match.group(0))], 2)
+        return " " * len(match.group(0))
+
+    text = _SYNONYM_RE.sub(replace, text)
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group(0)
+        lowered = token.lower()
+        if len(lowered) < 2 or lowered in STOPWORDS or lowered in QUERY_NOISE:
+            continue
+        if _is_proper_noun(token, text[: match.start()]):
+            add(match.start(), token, 1)
+            continue
+        stemmed = stem(lowered)
+        add(match.start(), stemmed if len(stemmed) >= _MIN_STEM else token, 0)
+
+    keywords.sort(key=lambda keyword: keyword.position)
+    return keywords
+
+
+def _is_proper_noun(token: str, before: str) -> bool:
+    """
+    Nome proprio o sigla: maiuscole interne o cifre (LangGraph, GPT4) oppure
+    iniziale maiuscola non a inizio frase ("uso Obsidian")
+    """
+    if token[1:] != token[1:].lower() or any(char.isdigit() for char in token):
+        return True
+    return token[0].isupper() and not _SENTENCE_END_RE.search(before)
+
+
+def rewrite_query(query: str, max_terms: int = SEARCH_QUERY_MAX_TERMS) -> str:
+    """
+    Query per ``search`` di WordPress: al massimo ``max_terms`` parole chiave
+    (WordPress le cerca tutte, in AND), preferendo i termini del dizionario e
+    i nomi propri. Se non resta nessuna parola chiave la query è invariata.
+    """
+    keywords = extract_keywords(query)
+    if not keywords:
+        return query.strip()
+    chosen = sorted(keywords, key=lambda keyword: -keyword.priority)[:max_terms]
+    chosen.sort(key=lambda keyword: keyword.position)
+    return " ".join(keyword.text for keyword in chosen)
+
+
+def expand_query(query: str) -> str:
+    """Query con i termini del sito aggiunti ai sinonimi trovati (per BM25)"""
+    words = set(_normalize(query).split())
+    canonical = [
+        keyword.text
+        for keyword in extract_keywords(query)
+        if keyword.priority == 2 and not set(_normalize(keyword.text).split()) <= words
+    ]
+    return " ".join([query, *canonical]) if canonical else query
+
+
+class QueryStats:
+    """
+    Contatori delle ricerche testuali: quante query sono state riscritte,
+    quante non hanno trovato nulla e quante ricerche sono arrivate entro
+    RETRY_WINDOW secondi da una ricerca vuota (il modello che riprova con
+    altre parole; stima a livello di processo).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_empty = float("-inf")
+        self.searches = 0
+        self.rewritten = 0
+        self.empty = 0
+        self.retries = 0
+
+    def record(self, query: str, rewritten: str, results: int) -> None:
+        """Registra una ricerca e il numero di risultati"""
+        now = time.monotonic()
+        with self._lock:
+            self.searches += 1
+            if rewritten != query.strip():
+                self.rewritten += 1
+            if now - self._last_empty < RETRY_WINDOW:
+                self.retries += 1
+            if results:
+                self._last_empty = float("-inf")
+            else:
+                self.empty += 1
+                self._last_empty = now
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last_empty = float("-inf")
+            self.searches = self.rewritten = self.empty = self.retries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "rewritten": self.rewritten,
+                "empty": self.empty,
+                "retries": self.retries,
+                "empty_rate": (
+                    round(self.empty / self.searches, 3) if self.searches else 0.0
+                ),
+            }
+
+
+_query_stats = QueryStats()
+
+
+def get_query_stats() -> QueryStats:
+    """Restituisce i contatori delle ricerche condivisi dal processo"""
+    return _query_stats
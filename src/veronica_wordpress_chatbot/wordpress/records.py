@@ -0,0 +1,204 @@
+"""
+Content records - compact immutable types produced by ContentProcessor
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, Tuple, Type
+
+
+class ContentRecord(Mapping):
+    """
+    Base dei record processati (dataclass frozen con ``__slots__``).
+
+    Un record occupa meno memoria di un dict con le stesse chiavi ed è
+    immutabile, quindi può essere condiviso dalla cache dei documenti
+    processati. Resta leggibile come mapping (``record["title"]``,
+    ``dict(record)``) e serializza ogni revisione in JSON una sola volta.
+    """
+
+    __slots__ = ("_json",)
+
+    _FIELDS: Tuple[str, ...] = ()
+    _values: Callable[[Any], Tuple[Any, ...]]
+    # JSON in cache nello slot, assegnato da to_json
+    _json: str
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Chiamato anche per la classe ricreata da dataclass(slots=True)
+        if "__dataclass_fields__" in cls.__dict__:
+            cls._prepare()
+
+    @classmethod
+    def _prepare(cls) -> None:
+        declared = fields(cls)  # type: ignore[arg-type]
+        cls._FIELDS = tuple(field.name for field in declared)
+        getter = attrgetter(*cls._FIELDS)
+        cls._values = staticmethod(  # type: ignore[assignment]
+            getter if len(cls._FIELDS) > 1 else lambda record: (getter(record),)
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict con i campi nell'ordine di dichiarazione"""
+        return dict(zip(self._FIELDS, self._values(self)))
+
+    def to_json(self) -> str:
+        """JSON del record (calcolato al primo utilizzo, poi riusato)"""
+        try:
+            return self._json
+        except AttributeError:
+            encoded = json.dumps(self.to_dict())
+            object.__setattr__(self, "_json", encoded)
+            return encoded
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContentRecord":
+        """Ricostruisce il record da ``to_dict`` (es. dallo snapshot)"""
+        values = {name: data[name] for name in cls._FIELDS if name in data}
+        if "categories" in values:
+            values["categories"] = tuple(values["categories"])
+        return cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class PostRecord(ContentRecord):
+    """Articolo del blog"""
+
+    title: str
+    content_preview: str
+    excerpt: str
+    link: str
+    date: str
+    type: str = "article"
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectRecord(ContentRecord):
+    """Progetto del portfolio"""
+
+    title: str
+    description: str
+    repository: str
+    external_url: str
+    frontend_url: str
+    preview_text: str
+    link: str
+    date: str
+    type: str = "project"
+
+
+@dataclass(frozen=True, slots=True)
+class CertificationRecord(ContentRecord):
+    """Certificazione o corso"""
+
+    title: str
+    issuer: str
+    description: str
+    start_date: str
+    end_date: str
+    course_link: str
+    project_link: str
+    date: str
+    type: str = "certification"
+
+
+@dataclass(frozen=True, slots=True)
+class WorkExperienceRecord(ContentRecord):
+    """Esperienza lavorativa"""
+
+    title: str
+    company: str
+    role: str
+    description: str
+    start_date: str
+    end_date: str
+    date: str
+    type: str = "work_experience"
+
+
+@dataclass(frozen=True, slots=True)
+class BookRecord(ContentRecord):
+    """Libro letto e recensito"""
+
+    title: str
+    author: str
+    external_link: str
+    review: str
+    date: str
+    type: str = "book"
+
+
+@dataclass(frozen=True, slots=True)
+class ToolRecord(ContentRecord):
+    """Strumento personale"""
+
+    title: str
+    description: str
+    categories: Tuple[str, ...]
+    date: str
+    type: str = "tool"
+
+
+@dataclass(frozen=True, slots=True)
+class StackRecord(ContentRecord):
+    """Tecnologia dello stack professionale"""
+
+    title: str
+    description: str
+    categories: Tuple[str, ...]
+    date: str
+    type: str = "stack"
+
+
+# Record prodotto da ContentProcessor per ogni endpoint WordPress
+ENDPOINT_RECORDS: Dict[str, Type[ContentRecord]] = {
+    "posts": PostRecord,
+    "projects": ProjectRecord,
+    "certifications": CertificationRecord,
+    "work-experiences": WorkExperienceRecord,
+    "books": BookRecord,
+    "tools": ToolRecord,
+    "stacks": StackRecord,
+}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ContentRecord):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} non serializzabile in JSON")
+
+
+def dumps_result(value: Any) -> str:
+    """
+    ``json.dumps`` per i risultati dei tool che contengono record.
+
+    L'output è identico a ``json.dumps`` sui dict equivalenti, ma ogni record
+    riusa il JSON già calcolato: solo l'involucro del risultato viene
+    serializzato a ogni chiamata.
+    """
+    if isinstance(value, ContentRecord):
+        return value.to_json()
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            return json.dumps(value, default=_default)
+        members = (
+            f"{json.dumps(key)}: {dumps_result(item)}" for key, item in value.items()
+        )
+        return "{" + ", ".join(members) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(dumps_result(item) for item in value) + "]"
+    return json.dumps(value)
@@ -0,0 +1,250 @@
+"""
+WordPress resilience - per-endpoint circuit breaker, jittered retries, stale fallback
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    REQUEST_READ_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_DEADLINE,
+    RETRY_MAX_ATTEMPTS,
+)
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Stati del circuit breaker
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Status HTTP per cui ha senso riprovare una GET idempotente
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+STALE_NOTICE = (
+    "WordPress non è raggiungibile: questi contenuti provengono dall'ultima "
+    "copia valida in cache e potrebbero non essere aggiornati."
+)
+
+
+class WordPressUnavailableError(Exception):
+    """WordPress non risponde e non esiste una copia in cache da servire"""
+
+    def __init__(self, endpoint: str, reason: str) -> None:
+        super().__init__(f"WordPress non disponibile per {endpoint}: {reason}")
+        self.endpoint = endpoint
+        self.reason = reason
+
+
+class StalePayload(list):  # type: ignore[type-arg]
+    """Lista di item servita dalla cache dopo un errore upstream"""
+
+    stale = True
+
+
+def is_stale(data: Any) -> bool:
+    """True se i dati provengono dal fallback stale"""
+    return getattr(data, "stale", False)
+
+
+def with_stale_notice(payload: Dict[str, Any], *sources: Any) -> Dict[str, Any]:
+    """Aggiunge il marker ``stale`` al risultato di un tool se serve"""
+    if any(is_stale(source) for source in sources):
+        payload["stale"] = True
+        payload["stale_notice"] = STALE_NOTICE
+    return payload
+
+
+def backoff_delay(attempt: int) -> float:
+    """Attesa prima del tentativo successivo: exponential backoff con full jitter"""
+    ceiling = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def retry_allowed(
+    attempt: int, elapsed: float, delay: float, timed_out: bool = False
+) -> bool:
+    """
+    True se dopo un errore transitorio può partire un altro tentativo: mai
+    dopo un read timeout, al massimo RETRY_MAX_ATTEMPTS tentativi e senza
+    superare RETRY_DEADLINE con backoff e timeout del tentativo successivo
+    """
+    return (
+        not timed_out
+        and attempt < RETRY_MAX_ATTEMPTS
+        and elapsed + delay + REQUEST_READ_TIMEOUT <= RETRY_DEADLINE
+    )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker di un singolo endpoint.
+
+    Dopo ``failure_threshold`` errori consecutivi il circuito si apre e le
+    richieste falliscono subito per ``reset_timeout`` secondi; poi una sola
+    richiesta di prova (half-open) decide se richiuderlo o riaprirlo.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.opened_count = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Stato corrente (un circuito aperto scaduto è half-open)"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def allow(self) -> bool:
+        """True se la richiesta può partire; in half-open passa una sola prova"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+
+            if state == CLOSED:
+                return True
+
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._state = HALF_OPEN
+                self._trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Richiesta riuscita: chiude il circuito"""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit breaker chiuso: {self.endpoint}")
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """
+        Richiesta finita senza esito sul servizio (errore non HTTP): libera la
+        prova half-open senza cambiare stato
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Richiesta fallita (dopo i retry): apre il circuito oltre la soglia"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened_count += 1
+                    logger.warning(
+                        f"Circuit breaker aperto: {self.endpoint} "
+                        f"({self._failures} errori consecutivi)"
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Secondi mancanti alla prossima richiesta di prova"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            elapsed = time.monotonic() - self._opened_at
+            return max(self.reset_timeout - elapsed, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Stato e contatori del breaker"""
+        retry_after = self.retry_after()
+        with self._lock:
+            return {
+                "state": self._current_state(time.monotonic()),
+                "consecutive_failures": self._failures,
+                "opened_count": self.opened_count,
+                "rejected": self.rejected,
+                "retry_after": round(retry_after, 1),
+            }
+
+    def _current_state(self, now: float) -> str:
+        """Stato effettivo (chiamare con il lock acquisito)"""
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+
+class CircuitBreakerRegistry:
+    """Un circuit breaker per endpoint, creato alla prima richiesta"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Breaker dell'endpoint"""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+            return breaker
+
+    def open_endpoints(self) -> List[str]:
+        """Endpoint con il circuito non chiuso"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return sorted(b.endpoint for b in breakers if b.state != CLOSED)
+
+    def clear(self) -> None:
+        """Rimuove tutti i breaker (stato chiuso ovunque)"""
+        with self._lock:
+            self._breakers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Stato di tutti i breaker"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {endpoint: breaker.stats() for endpoint, breaker in breakers.items()}
+
+
+def stale_fallback(cache: Any, revalidation: Any, key: str) -> Optional[StalePayload]:
+    """
+    Ultimo payload valido per la chiave: entry in cache (anche scaduta)
+    oppure payload salvato per la revalidation.
+    """
+    entry = cache.peek(key)
+    if entry is not None:
+        return StalePayload(entry.value)
+
+    record = revalidation.get(key)
+    if record is not None:
+        return StalePayload(record.payload)
+
+    return None
+
+
+_circuit_breakers = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Restituisce i circuit breaker condivisi dal processo"""
+    return _circuit_breakers
@@ -0,0 +1,199 @@
+"""
+Conditional GET revalidation - ETag / Last-Modified validators and fingerprint probes
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from ..config import REVALIDATION_MAX_ENTRIES
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+
+@dataclass
+class ValidatedPayload:
+    """Ultimo payload scaricato per endpoint+params con i suoi validator"""
+
+    payload: List[Dict[str, Any]]
+    size: int
+    download_seconds: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    @property
+    def has_validators(self) -> bool:
+        """True se il server ha fornito ETag o Last-Modified"""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Header per la richiesta condizionale"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class RevalidationStore:
+    """
+    Payload e validator per richiesta, con metriche di byte e tempo risparmiati.
+
+    Quando il server risponde senza ETag/Last-Modified l'endpoint viene
+    marcato per il "fingerprint probe": una richiesta minima
+    (``per_page=1`` ordinata per ``modified``) il cui ``X-WP-Total`` più la
+    data di modifica più recente dice se la collezione è cambiata.
+    """
+
+    def __init__(self, max_entries: int = REVALIDATION_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, ValidatedPayload]" = OrderedDict()
+        self._fingerprint_endpoints: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+        self.not_modified = 0
+        self.fingerprint_matches = 0
+        self.full_downloads = 0
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+    def get(self, key: str) -> Optional[ValidatedPayload]:
+        """Record salvato per la chiave (aggiorna l'ordine LRU)"""
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+            return record
+
+    def uses_fingerprint(self, endpoint: str) -> bool:
+        """True se l'endpoint non fornisce validator HTTP"""
+        return self._fingerprint_endpoints.get(endpoint, False)
+
+    def record_download(
+        self,
+        endpoint: str,
+        key: str,
+        payload: List[Dict[str, Any]],
+        size: int,
+        seconds: float,
+        headers: Mapping[str, str],
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        """Salva payload e validator di una risposta 200 completa"""
+        record = ValidatedPayload(
+            payload=payload,
+            size=size,
+            download_seconds=seconds,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            fingerprint=fingerprint,
+        )
+
+        with self._lock:
+            self.full_downloads += 1
+            self._fingerprint_endpoints[endpoint] = not record.has_validators
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def record_reuse(
+        self,
+        record: ValidatedPayload,
+        seconds: float,
+        probe_bytes: int = 0,
+        fingerprint: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Registra il riuso del payload (304 o fingerprint invariato)"""
+        with self._lock:
+            if fingerprint:
+                self.fingerprint_matches += 1
+            else:
+                self.not_modified += 1
+            self.bytes_saved += max(record.size - probe_bytes, 0)
+            self.seconds_saved += max(record.download_seconds - seconds, 0.0)
+        return record.payload
+
+    def invalidate(self, endpoint: str) -> int:
+        """
+        Rimuove i payload salvati per un endpoint (dopo un webhook).
+
+        Returns:
+            Numero di record rimossi
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._records
+                if key == endpoint or key.startswith(f"{endpoint}?")
+            ]
+            for key in keys:
+                del self._records[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Rimuove tutti i record e azzera le metriche"""
+        with self._lock:
+            self._records.clear()
+            self._fingerprint_endpoints.clear()
+            self.not_modified = self.fingerprint_matches = self.full_downloads = 0
+            self.bytes_saved = 0
+            self.seconds_saved = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Metriche di revalidation"""
+        with self._lock:
+            return {
+                "entries": len(self._records),
+                "not_modified": self.not_modified,
+                "fingerprint_matches": self.fingerprint_matches,
+                "full_downloads": self.full_downloads,
+                "bytes_saved": self.bytes_saved,
+                "seconds_saved": round(self.seconds_saved, 3),
+                "fingerprint_endpoints": sorted(
+                    endpoint
+                    for endpoint, enabled in self._fingerprint_endpoints.items()
+                    if enabled
+                ),
+            }
+
+
+def fingerprint_params(request_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parametri per il probe: stessi filtri della richiesta originale ma un
+    solo item, ordinato per data di modifica e con il solo campo ``modified``.
+    """
+    params = {
+        key: value
+        for key, value in request_params.items()
+        if key not in ("per_page", "page", "orderby", "order", "_fields")
+    }
+    params.update(
+        {"per_page": 1, "orderby": "modified", "order": "desc", "_fields": "modified"}
+    )
+    return params
+
+
+def fingerprint_from(headers: Mapping[str, str], data: Any) -> Optional[str]:
+    """Fingerprint della collezione: X-WP-Total + modified più recente"""
+    total = headers.get("X-WP-Total")
+    if total is None:
+        return None
+
+    newest = ""
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        newest = data[0].get("modified", "")
+
+    return f"{total}:{newest}"
+
+
+_revalidation_store = RevalidationStore()
+
+
+def get_revalidation_store() -> RevalidationStore:
+    """Restituisce lo store di revalidation condiviso dal processo"""
+    return _revalidation_store
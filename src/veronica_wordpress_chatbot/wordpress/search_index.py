@@ -0,0 +1,528 @@
+"""
+Search index - in-process BM25 inverted index over the processed content
+"""
+
+import functools
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from ..config import SEARCH_INDEX_REFRESH, WORDPRESS_FIELD_CONFIGS
+from ..utils.logging_config import setup_logging
+from .html_text import html_to_text
+from .processor import ENDPOINT_PROCESSORS
+from .records import ContentRecord
+
+if TYPE_CHECKING:
+    from .client import OptimizedWordPressClient
+
+logger = setup_logging(__name__)
+
+# Collezioni indicizzate (tutti i post type processati)
+SEARCH_INDEX_ENDPOINTS = tuple(WORDPRESS_FIELD_CONFIGS)
+
+# Parametri BM25 standard; il titolo conta come TITLE_WEIGHT occorrenze
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Parole funzionali italiane e inglesi. "ai" non è una stopword: per questo
+# sito è quasi sempre "AI" e non la preposizione articolata
+STOPWORDS = frozenset(
+    """
+    il lo la gli le un una uno di da in con su per tra fra ed al allo alla agli
+    alle del dello della dei degli delle dal dallo dalla dai dagli dalle nel
+    nello nella nei negli nelle sul sullo sulla sui sugli sulle che chi cui non
+    come anche ma se sono sei siamo era ho hai ha hanno mi ti si ci vi ne questo
+    questa questi queste quello quella quelli quelle suo sua suoi sue mio mia
+    cosa quale quali quando dove piu molto tutto tutti tutte
+    the an and or of to on for with by from is are was were be been this that
+    these those as at its into about what which who how do does did has have
+    """.split()
+)
+
+# Suffissi rimossi dallo stemmer leggero dopo il plurale inglese in "-s" (il
+# più lungo che lascia almeno _MIN_STEM caratteri): forme flesse comuni in
+# italiano e inglese
+_SUFFIXES = tuple(
+    sorted(
+        """
+        amenti amento imenti imento azioni azione uzioni uzione mente ita
+        ation ment ness ing ed i e a o
+        """.split(),
+        key=len,
+        reverse=True,
+    )
+)
+_MIN_STEM = 3
+
+# Campi dei record che non contengono testo da cercare
+_SKIP_FIELDS = frozenset(
+    """
+    title link date type repository external_url frontend_url course_link
+    project_link external_link start_date end_date
+    """.split()
+)
+
+# Campi troncati da ContentProcessor: nell'indice vale il contenuto completo
+_TRUNCATED_FIELDS = {"posts": "content_preview", "projects": "description"}
+
+# Collezioni non scaricabili: nuovo tentativo in background dopo questi secondi
+FAILED_RETRY_INTERVAL = 60.0
+
+_DocKey = Tuple[str, int]
+
+
+def fold_accents(text: str) -> str:
+    """Minuscolo senza accenti ("Perché" → "perche")"""
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    return normalized.encode("ascii", "ignore").decode("ascii")
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Stemmer leggero italiano/inglese ("agenti", "agents" → "agent")"""
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 4:
+        token = token[:-1]
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Termini indicizzabili di un testo (accent folding, stopword, stemming)"""
+    return [
+        stem(token)
+        for token in _TOKEN_RE.findall(fold_accents(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _rendered(value: Any) -> str:
+    """Testo di un campo WordPress ({"rendered": ...} oppure stringa)"""
+    if isinstance(value, dict):
+        return str(value.get("rendered", ""))
+    return str(value or "")
+
+
+class SearchHit(NamedTuple):
+    """Risultato di una ricerca"""
+
+    score: float
+    endpoint: str
+    id: int
+    record: ContentRecord
+
+
+class SearchIndex:
+    """
+    Indice invertito in memoria con ranking BM25 su tutti i tipi di contenuto.
+
+    Ogni documento è un item processato (titolo con peso TITLE_WEIGHT, testo
+    completo e campi del record), identificato da ``(endpoint, id)``: ``add``
+    e ``remove`` aggiornano solo le posting del documento. ``sync`` scarica
+    le collezioni la prima volta e poi solo gli item modificati
+    (``modified_after``) più l'elenco degli ID per rilevare le cancellazioni.
+    """
+
+    def __init__(
+        self,
+        endpoints: Iterable[str] = SEARCH_INDEX_ENDPOINTS,
+        refresh_interval: float = SEARCH_INDEX_REFRESH,
+    ) -> None:
+        self.endpoints = tuple(endpoints)
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[_DocKey, int]] = {}
+        self._doc_terms: Dict[_DocKey, Tuple[str, ...]] = {}
+        self._lengths: Dict[_DocKey, int] = {}
+        self._records: Dict[_DocKey, ContentRecord] = {}
+        # Testo indicizzato, riusato dall'indice semantico
+        self._texts: Dict[_DocKey, str] = {}
+        self._total_length = 0
+        # Normalizzazione BM25 per lunghezza, ricalcolata dopo le modifiche
+        self._norms: Optional[Dict[_DocKey, float]] = None
+
+        self._max_modified: Dict[str, str] = {}
+        self._synced_at: Dict[str, float] = {}
+        # Ultimo tentativo per collezione ed errore dell'ultimo tentativo fallito
+        self._attempted_at: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._sync_lock = threading.Lock()
+        self._refreshing = False
+        # Incrementato a ogni modifica dei documenti
+        self.generation = 0
+
+        self.searches = 0
+        self.search_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    @property
+    def built(self) -> bool:
+        """True se ogni collezione è stata scaricata (o tentata) almeno una volta"""
+        return all(endpoint in self._attempted_at for endpoint in self.endpoints)
+
+    @property
+    def ready(self) -> bool:
+        """
+        True dopo il primo tentativo su tutte le collezioni se almeno una è
+        indicizzata: le collezioni fallite vengono ritentate in background
+        """
+        return self.built and bool(self._synced_at)
+
+    def is_stale(self) -> bool:
+        """
+        True se una collezione non viene aggiornata da refresh_interval o se
+        una collezione fallita è da ritentare (FAILED_RETRY_INTERVAL)
+        """
+        now = time.monotonic()
+        retry_interval = min(FAILED_RETRY_INTERVAL, self.refresh_interval)
+        for endpoint in self.endpoints:
+            if endpoint in self._errors:
+                if now - self._attempted_at[endpoint] >= retry_interval:
+                    return True
+            elif (
+                now - self._synced_at.get(endpoint, -math.inf) >= self.refresh_interval
+            ):
+                return True
+        return False
+
+    def add(self, endpoint: str, item: Dict[str, Any]) -> None:
+        """Indicizza (o reindicizza) un item raw di WordPress"""
+        if item.get("id") is None:
+            return
+        record = ENDPOINT_PROCESSORS[endpoint](item)
+        key = (endpoint, int(item["id"]))
+
+        title = str(record.get("title", ""))
+        body = self._body(endpoint, item, record)
+        counts = Counter(tokenize(title) * TITLE_WEIGHT)
+        counts.update(tokenize(body))
+
+        with self._lock:
+            self._remove(key)
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[key] = count
+            length = sum(counts.values())
+            self._doc_terms[key] = tuple(counts)
+            self._lengths[key] = length
+            self._records[key] = record
+            self._texts[key] = f"{title}\n{body}"
+            self._total_length += length
+            self._norms = None
+            self.generation += 1
+
+            modified = str(item.get("modified") or "")
+            if modified > self._max_modified.get(endpoint, ""):
+                self._max_modified[endpoint] = modified
+
+    def remove(self, endpoint: str, item_id: int) -> bool:
+        """Rimuove un documento; False se non era indicizzato"""
+        with self._lock:
+            return self._remove((endpoint, int(item_id)))
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        endpoints: Optional[Iterable[str]] = None,
+    ) -> List[SearchHit]:
+        """
+        Documenti più rilevanti per ``query`` (BM25), ordinati per punteggio
+        su tutti i tipi di contenuto.
+
+        Args:
+            query: Testo della ricerca
+            limit: Numero massimo di risultati
+            endpoints: Limita la ricerca ad alcune collezioni
+        """
+        started = time.perf_counter()
+        allowed = set(endpoints) if endpoints is not None else None
+        terms = dict.fromkeys(tokenize(query))
+
+        with self._lock:
+            total = len(self._records)
+            if not terms or not total:
+                return []
+            norms = self._norms if self._norms is not None else self._compute_norms()
+            scores: Dict[_DocKey, float] = {}
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                frequency = len(postings)
+                idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                for key, count in postings.items():
+                    if allowed is not None and key[0] not in allowed:
+                        continue
+                    scores[key] = scores.get(key, 0.0) + weight * count / (
+                        count + norms[key]
+                    )
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1])
+            hits = [
+                SearchHit(round(score, 4), key[0], key[1], self._records[key])
+                for key, score in best
+            ]
+            self.searches += 1
+            self.search_seconds += time.perf_counter() - started
+        return hits
+
+    def documents(self) -> List[Tuple[_DocKey, ContentRecord, str]]:
+        """Documenti indicizzati ``(chiave, record, testo)``, ordinati per chiave"""
+        with self._lock:
+            return [
+                (key, self._records[key], self._texts[key])
+                for key in sorted(self._records)
+            ]
+
+    def sync_endpoint(
+        self, client: "OptimizedWordPressClient", endpoint: str, full: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Aggiorna l'indice di una collezione.
+
+        Raises:
+            requests.exceptions.RequestException: se WordPress non risponde;
+                l'indice della collezione resta invariato
+        """
+        started = time.perf_counter()
+        incremental = not full and endpoint in self._max_modified
+
+        if incremental:
+            params = {
+                "modified_after": self._max_modified[endpoint],
+                "orderby": "modified",
+                "order": "asc",
+            }
+            changed = list(client.iter_collection(endpoint, params))
+            live_ids = {
+                int(item["id"])
+                for item in client.iter_collection(endpoint, fields="id")
+            }
+        else:
+            changed = list(client.iter_collection(endpoint))
+            live_ids = {int(item["id"]) for item in changed if "id" in item}
+
+        for item in changed:
+            self.add(endpoint, item)
+        with self._lock:
+            deleted = [
+                key
+                for key in self._records
+                if key[0] == endpoint and key[1] not in live_ids
+            ]
+            for key in deleted:
+                self._remove(key)
+        self._synced_at[endpoint] = self._attempted_at[endpoint] = time.monotonic()
+        self._errors.pop(endpoint, None)
+
+        return {
+            "endpoint": endpoint,
+            "mode": "incremental" if incremental else "full",
+            "upserted": len(changed),
+            "deleted": len(deleted),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def sync(
+        self, client: "OptimizedWordPressClient", full: bool = False
+    ) -> Dict[str, Any]:
+        """Aggiorna tutte le collezioni; un errore non blocca le altre"""
+        with self._sync_lock:
+            return self._sync_all(client, full)
+
+    def ensure(self, client: "OptimizedWordPressClient") -> bool:
+        """
+        Prepara l'indice per una ricerca.
+
+        La prima volta indicizza le collezioni nel thread chiamante; in seguito
+        le collezioni scadute e quelle fallite vengono aggiornate in background
+        mentre le ricerche usano l'indice corrente (stale-while-revalidate):
+        una collezione che continua a fallire non riporta il download sul chat
+        path. Se l'indice è già in costruzione (warm-up all'avvio o un'altra
+        ricerca) non attende: restituisce False e il chiamante usa la ricerca
+        di WordPress.
+
+        Returns:
+            True se l'indice può rispondere (vedi ``ready``)
+        """
+        if not self.built:
+            if not self._sync_lock.acquire(blocking=False):
+                return self.ready
+            try:
+                # Ricerche concorrenti: solo la prima costruisce l'indice
+                if not self.built:
+                    self._sync_all(client, full=False)
+            finally:
+                self._sync_lock.release()
+
+        if self.is_stale():
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    _refresh_executor.submit(self._refresh, client)
+        return self.ready
+
+    def invalidate(self, endpoint: str, item_id: Optional[int] = None) -> int:
+        """
+        Segna la collezione da riallineare alla prossima ricerca e rimuove
+        subito l'item indicato (es. cancellato su WordPress).
+
+        Returns:
+            Numero di documenti rimossi
+        """
+        if endpoint in self._synced_at:
+            self._synced_at[endpoint] = -math.inf
+        if item_id is None:
+            return 0
+        return int(self.remove(endpoint, item_id))
+
+    def clear(self) -> None:
+        """Svuota l'indice e azzera le statistiche"""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._lengths.clear()
+            self._records.clear()
+            self._texts.clear()
+            self._total_length = 0
+            self._norms = None
+            self._max_modified.clear()
+            self._synced_at.clear()
+            self._attempted_at.clear()
+            self._errors.clear()
+            self.generation += 1
+            self.searches = 0
+            self.search_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Dimensione dell'indice e latenza media delle ricerche"""
+        with self._lock:
+            documents: Counter = Counter(key[0] for key in self._records)
+            return {
+                "ready": self.ready,
+                "failed_endpoints": dict(self._errors),
+                "documents": len(self._records),
+                "terms": len(self._postings),
+                "per_endpoint": dict(documents),
+                "searches": self.searches,
+                "avg_search_us": (
+                    round(self.search_seconds / self.searches * 1e6, 1)
+                    if self.searches
+                    else 0.0
+                ),
+            }
+
+    def _sync_all(
+        self, client: "OptimizedWordPressClient", full: bool
+    ) -> Dict[str, Any]:
+        """Aggiorna tutte le collezioni (chiamare con _sync_lock acquisito)"""
+        results: Dict[str, Any] = {}
+        for endpoint in self.endpoints:
+            try:
+                results[endpoint] = self.sync_endpoint(client, endpoint, full)
+            except Exception as e:
+                # Ritentata in background (vedi is_stale), non a ogni ricerca
+                self._attempted_at[endpoint] = time.monotonic()
+                self._errors[endpoint] = str(e)
+                logger.error(f"Indicizzazione {endpoint} fallita: {e}")
+                results[endpoint] = {"endpoint": endpoint, "error": str(e)}
+        logger.info(f"Indice di ricerca aggiornato: {len(self)} documenti")
+        return results
+
+    def _refresh(self, client: "OptimizedWordPressClient") -> None:
+        """Aggiornamento in background delle collezioni"""
+        try:
+            self.sync(client)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _compute_norms(self) -> Dict[_DocKey, float]:
+        """k1 * (1 - b + b * len / avgdl) per documento (con il lock acquisito)"""
+        average = self._total_length / len(self._lengths)
+        self._norms = {
+            key: BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+            for key, length in self._lengths.items()
+        }
+        return self._norms
+
+    def _remove(self, key: _DocKey) -> bool:
+        """Rimuove le posting di un documento (chiamare con il lock acquisito)"""
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(key, 0)
+        self._records.pop(key, None)
+        self._texts.pop(key, None)
+        self._norms = None
+        self.generation += 1
+        return True
+
+    @staticmethod
+    def _body(endpoint: str, item: Dict[str, Any], record: ContentRecord) -> str:
+        """Testo indicizzato oltre al titolo"""
+        truncated = _TRUNCATED_FIELDS.get(endpoint)
+        parts: List[str] = []
+        if truncated:
+            parts.append(html_to_text(_rendered(item.get("content"))))
+
+        for name, value in record.items():
+            if name in _SKIP_FIELDS or name == truncated:
+                continue
+            if isinstance(value, str):
+                parts.append(value)
+            elif isinstance(value, tuple):
+                parts.extend(str(entry) for entry in value)
+        return " ".join(parts)
+
+
+# Worker per l'aggiornamento incrementale (fuori dal chat path)
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wp-search")
+
+_search_index = SearchIndex()
+
+
+def get_search_index() -> SearchIndex:
+    """Restituisce l'indice di ricerca condiviso dal processo"""
+    return _search_index
+
+
+def warm_search_index(client: "OptimizedWordPressClient") -> None:
+    """Costruisce l'indice in background (all'avvio dell'applicazione)"""
+    _refresh_executor.submit(_search_index.sync, client)
@@ -0,0 +1,533 @@
+"""
+Semantic index - dense vectors in a NumPy matrix with top-k cosine similarity
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from ..config import (
+    SEMANTIC_DIMENSIONS,
+    SEMANTIC_EMBEDDER,
+    SEMANTIC_EMBEDDING_MODEL,
+    SEMANTIC_INDEX_PATH,
+)
+from ..utils.logging_config import setup_logging
+from .records import ContentRecord
+from .search_index import SearchHit, SearchIndex, get_search_index, tokenize
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from .client import OptimizedWordPressClient
+
+logger = setup_logging(__name__)
+
+# Versione del file di metadati (.json) che accompagna le matrici .npy
+SEMANTIC_INDEX_FORMAT = 1
+
+# Similarità minima perché un documento sia un risultato
+MIN_SIMILARITY = 0.05
+
+_DocKey = Tuple[str, int]
+
+
+class Embedder(Protocol):
+    """
+    Trasforma testi in vettori float32 normalizzati (similarità = prodotto
+    scalare). ``fit`` restituisce lo stato appreso sul corpus (matrici salvate
+    accanto ai vettori) e i vettori dei documenti; ``embed`` usa quello stato.
+    """
+
+    name: str
+
+    def fit(self, texts: Sequence[str]) -> Tuple[Dict[str, Any], Any]: ...
+
+    def embed(self, texts: Sequence[str], state: Mapping[str, Any]) -> Any: ...
+
+
+def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+    """Righe a norma unitaria (le righe nulle restano nulle)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return cast("np.ndarray", matrix / np.maximum(norms, 1e-12))
+
+
+@functools.lru_cache(maxsize=65536)
+def _term_buckets(term: str, buckets: int) -> Tuple[int, ...]:
+    """Bucket del termine e dei suoi trigrammi di caratteri ("#agent#")"""
+    padded = f"#{term}#"
+    grams = [f"w:{term}"] + [padded[i : i + 3] for i in range(len(padded) - 2)]
+    return tuple(zlib.crc32(gram.encode()) % buckets for gram in grams)
+
+
+class HashedNgramEmbedder:
+    """
+    Embedder offline su CPU: termini (con accent folding, stopword e stemming
+    dell'indice BM25) e i loro trigrammi di caratteri vengono hashati in
+    ``buckets`` colonne pesate TF-IDF; una SVD troncata del corpus (LSA) li
+    proietta in ``dimensions`` componenti, così termini che compaiono negli
+    stessi documenti ("LLM", "modelli linguistici") finiscono vicini.
+    """
+
+    def __init__(
+        self, dimensions: int = SEMANTIC_DIMENSIONS, buckets: int = 1 << 14
+    ) -> None:
+        self.dimensions = dimensions
+        self.buckets = buckets
+        self.name = f"hashed-{buckets}-{dimensions}"
+
+    def features(self, text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Bucket e peso (1 + log tf) delle feature di un testo"""
+        terms = tokenize(text)
+        buckets: List[int] = []
+        counts: List[int] = []
+        # Conteggi per termine distinto, poi sommati per bucket in NumPy
+        for term, count in Counter(terms).items():
+            grams = _term_buckets(term, self.buckets)
+            buckets.extend(grams)
+            counts.extend([count] * len(grams))
+
+        columns, inverse = np.unique(
+            np.array(buckets, dtype=np.int64), return_inverse=True
+        )
+        frequency = np.bincount(inverse, weights=counts, minlength=len(columns))
+        return columns, (1 + np.log(frequency)).astype(np.float32)
+
+    def fit(self, texts: Sequence[str]) -> Tuple[Dict[str, Any], "np.ndarray"]:
+        """IDF e componenti SVD del corpus, più i vettori dei documenti"""
+        features = [self.features(text) for text in texts]
+        total = len(features)
+
+        frequency = np.zeros(self.buckets, dtype=np.float32)
+        for columns, _ in features:
+            frequency[columns] += 1
+        idf = (np.log((1 + total) / (1 + frequency)) + 1).astype(np.float32)
+
+        matrix = np.zeros((total, self.buckets), dtype=np.float32)
+        for row, (columns, weights) in enumerate(features):
+            matrix[row, columns] = weights * idf[columns]
+        matrix = _normalize(matrix)
+
+        # SVD tramite la matrice di Gram (documenti × documenti): il corpus ha
+        # molte meno righe che colonne. Al massimo metà delle componenti: con
+        # rango pieno la proiezione riproduce TF-IDF senza generalizzare
+        rank = min(self.dimensions, max(1, total // 2))
+        values, vectors = np.linalg.eigh((matrix @ matrix.T).astype(np.float64))
+        order = np.argsort(values)[::-1][:rank]
+        order = order[values[order] > 1e-8]
+        singular = np.sqrt(values[order])
+        components = ((matrix.T @ vectors[:, order]) / singular).astype(np.float32)
+
+        state = {"idf": idf, "components": components}
+        return state, _normalize(matrix @ components)
+
+    def embed(self, texts: Sequence[str], state: Mapping[str, Any]) -> "np.ndarray":
+        """Vettori dei testi nello spazio appreso con ``fit``"""
+        idf, components = state["idf"], state["components"]
+        vectors = np.zeros((len(texts), components.shape[1]), dtype=np.float32)
+        for row, text in enumerate(texts):
+            columns, weights = self.features(text)
+            if len(columns):
+                vectors[row] = (weights * idf[columns]) @ components[columns]
+        return _normalize(vectors)
+
+
+class LangChainEmbedder:
+    """Adattatore per un modello ``langchain_core.embeddings.Embeddings``"""
+
+    def __init__(self, embeddings: Any, name: str) -> None:
+        self.embeddings = embeddings
+        self.name = name
+
+    def fit(self, texts: Sequence[str]) -> Tuple[Dict[str, Any], "np.ndarray"]:
+        vectors = self.embeddings.embed_documents(list(texts))
+        return {}, _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def embed(self, texts: Sequence[str], state: Mapping[str, Any]) -> "np.ndarray":
+        vectors = [self.embeddings.embed_query(text) for text in texts]
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def make_embedder(name: str = SEMANTIC_EMBEDDER) -> Embedder:
+    """Embedder configurato (WORDPRESS_SEMANTIC_EMBEDDER)"""
+    if name == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        return LangChainEmbedder(
+            OpenAIEmbeddings(model=SEMANTIC_EMBEDDING_MODEL),
+            f"openai-{SEMANTIC_EMBEDDING_MODEL}",
+        )
+    return HashedNgramEmbedder()
+
+
+class _Matrix:
+    """Vettori dei documenti e stato dell'embedder (sostituiti in blocco)"""
+
+    __slots__ = ("fingerprint", "vectors", "state", "keys", "records", "codes", "rows")
+
+    def __init__(
+        self,
+        fingerprint: str,
+        vectors: "np.ndarray",
+        state: Mapping[str, Any],
+        documents: Sequence[Tuple[_DocKey, ContentRecord, str]],
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.vectors = vectors
+        self.state = state
+        self.keys = [key for key, _, _ in documents]
+        self.records = [record for _, record, _ in documents]
+        endpoints = sorted({key[0] for key in self.keys})
+        self.codes = {endpoint: code for code, endpoint in enumerate(endpoints)}
+        # Codice dell'endpoint di ogni riga, per filtrare per collezione
+        self.rows = np.array(
+            [self.codes[endpoint] for endpoint, _ in self.keys], dtype=np.int16
+        )
+
+
+class SemanticIndex:
+    """
+    Ricerca semantica sui documenti dell'indice di ricerca.
+
+    I vettori stanno in un'unica matrice float32 contigua (documenti ×
+    dimensioni, righe normalizzate): una query è un prodotto matrice-vettore
+    e ``search_many`` risponde a più query con un solo prodotto matriciale.
+    Con ``path`` la matrice e lo stato dell'embedder vengono salvati in file
+    .npy aperti con ``mmap_mode="r"``: i worker che vedono gli stessi
+    documenti (stessa impronta) riusano i file invece di ricalcolarli e
+    condividono le pagine in memoria. Quando i documenti cambiano la matrice
+    viene ricostruita in background mentre le ricerche usano la precedente.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        path: str = SEMANTIC_INDEX_PATH,
+        source: Optional[SearchIndex] = None,
+    ) -> None:
+        self.embedder = embedder if embedder is not None else make_embedder()
+        self.path = path
+        self._source = source if source is not None else get_search_index()
+
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._matrix: Optional[_Matrix] = None
+        self._generation = -1
+        self._rebuilding = False
+
+        self.builds = 0
+        self.loads = 0
+        self.searches = 0
+        self.search_seconds = 0.0
+
+    @property
+    def available(self) -> bool:
+        """False se NumPy non è installato"""
+        return np is not None
+
+    @property
+    def ready(self) -> bool:
+        return self._matrix is not None
+
+    def ensure(self, client: "OptimizedWordPressClient") -> bool:
+        """
+        Prepara l'indice per una ricerca: la prima volta costruisce (o carica
+        dal disco) la matrice nel thread chiamante, in seguito la ricostruisce
+        in background quando i documenti dell'indice di ricerca cambiano.
+
+        Returns:
+            True se la ricerca semantica è utilizzabile
+        """
+        if not self.available or not self._source.ensure(client):
+            return False
+        if self._generation == self._source.generation:
+            return self.ready
+
+        if not self.ready:
+            with self._build_lock:
+                if not self.ready:
+                    self._rebuild()
+            return self.ready
+
+        with self._lock:
+            if self._rebuilding:
+                return True
+            self._rebuilding = True
+        _build_executor.submit(self._refresh)
+        return True
+
+    def rebuild(self) -> None:
+        """Allinea la matrice ai documenti correnti dell'indice di ricerca"""
+        with self._build_lock:
+            self._rebuild()
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        endpoints: Optional[Iterable[str]] = None,
+    ) -> List[SearchHit]:
+        """Documenti più simili a ``query`` (similarità coseno)"""
+        return self.search_many([query], limit, endpoints)[0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        limit: int = 5,
+        endpoints: Optional[Iterable[str]] = None,
+    ) -> List[List[SearchHit]]:
+        """
+        Top-k per più query con un solo prodotto matriciale.
+
+        Args:
+            queries: Testi delle ricerche
+            limit: Numero massimo di risultati per query
+            endpoints: Limita la ricerca ad alcune collezioni
+        """
+        matrix = self._matrix
+        if matrix is None or not matrix.keys or not queries:
+            return [[] for _ in queries]
+
+        started = time.perf_counter()
+        embedded = self.embedder.embed(queries, matrix.state)
+        scores = embedded @ matrix.vectors.T
+
+        if endpoints is not None:
+            codes = [matrix.codes[e] for e in endpoints if e in matrix.codes]
+            allowed = np.isin(matrix.rows, codes)
+            scores = np.where(allowed, scores, -np.inf)
+
+        results = [self._top(matrix, row, limit) for row in scores]
+        with self._lock:
+            self.searches += len(queries)
+            self.search_seconds += time.perf_counter() - started
+        return results
+
+    def clear(self) -> None:
+        """Scarta la matrice in memoria (i file restano) e azzera le statistiche"""
+        with self._lock:
+            self._matrix = None
+            self._generation = -1
+            self.builds = self.loads = self.searches = 0
+            self.search_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Dimensione della matrice e latenza media delle ricerche"""
+        matrix = self._matrix
+        return {
+            "available": self.available,
+            "ready": matrix is not None,
+            "embedder": self.embedder.name,
+            "documents": len(matrix.keys) if matrix is not None else 0,
+            "dimensions": int(matrix.vectors.shape[1]) if matrix is not None else 0,
+            "memory_mapped": matrix is not None
+            and isinstance(matrix.vectors, np.memmap),
+            "builds": self.builds,
+            "loads": self.loads,
+            "searches": self.searches,
+            "avg_search_us": (
+                round(self.search_seconds / self.searches * 1e6, 1)
+                if self.searches
+                else 0.0
+            ),
+        }
+
+    def _rebuild(self) -> None:
+        """Costruisce o carica la matrice (chiamare con _build_lock acquisito)"""
+        generation = self._source.generation
+        documents = self._source.documents()
+        fingerprint = self._fingerprint(documents)
+
+        current = self._matrix
+        if current is None or current.fingerprint != fingerprint:
+            # Un altro worker può aver già salvato la matrice degli stessi documenti
+            matrix = self._load(fingerprint, documents) if self.path else None
+            if matrix is not None:
+                self.loads += 1
+            else:
+                matrix = self._build(fingerprint, documents)
+            self._matrix = matrix
+        self._generation = generation
+
+    def _build(
+        self,
+        fingerprint: str,
+        documents: Sequence[Tuple[_DocKey, ContentRecord, str]],
+    ) -> _Matrix:
+        """Calcola i vettori dei documenti e li salva (se c'è un path)"""
+        started = time.perf_counter()
+        if documents:
+            state, vectors = self.embedder.fit([text for _, _, text in documents])
+        else:
+            state, vectors = {}, np.zeros((0, 0), dtype=np.float32)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.builds += 1
+        logger.info(
+            f"Indice semantico: {len(documents)} documenti in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+
+        if self.path:
+            try:
+                return self._save(fingerprint, vectors, state, documents)
+            except OSError as e:
+                logger.warning(f"Indice semantico non salvato in {self.path}: {e}")
+        return _Matrix(fingerprint, vectors, state, documents)
+
+    def _save(
+        self,
+        fingerprint: str,
+        vectors: "np.ndarray",
+        state: Mapping[str, Any],
+        documents: Sequence[Tuple[_DocKey, ContentRecord, str]],
+    ) -> _Matrix:
+        """Scrive i file .npy e i metadati (per ultimi), poi li apre in mmap"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        files = {}
+        for name, array in {"vectors": vectors, **state}.items():
+            filename = f"{self.path}.{fingerprint[:16]}.{name}.npy"
+            temporary = f"{filename}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as handle:
+                np.save(handle, np.ascontiguousarray(array))
+            os.replace(temporary, filename)
+            files[name] = os.path.basename(filename)
+
+        meta = {
+            "format": SEMANTIC_INDEX_FORMAT,
+            "fingerprint": fingerprint,
+            "embedder": self.embedder.name,
+            "files": files,
+            "keys": [list(key) for key, _, _ in documents],
+        }
+        temporary = f"{self.path}.json.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+        os.replace(temporary, f"{self.path}.json")
+        self._remove_stale_files(set(files.values()))
+
+        matrix = self._load(fingerprint, documents)
+        if matrix is None:
+            raise OSError("file salvati non leggibili")
+        return matrix
+
+    def _load(
+        self,
+        fingerprint: str,
+        documents: Sequence[Tuple[_DocKey, ContentRecord, str]],
+    ) -> Optional[_Matrix]:
+        """Apre in mmap i file salvati se corrispondono ai documenti correnti"""
+        directory = os.path.dirname(self.path)
+        try:
+            with open(f"{self.path}.json", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            if (
+                meta.get("format") != SEMANTIC_INDEX_FORMAT
+                or meta.get("fingerprint") != fingerprint
+            ):
+                return None
+            arrays = {
+                name: np.load(os.path.join(directory, filename), mmap_mode="r")
+                for name, filename in meta["files"].items()
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        vectors = arrays.pop("vectors")
+        if len(vectors) != len(documents):
+            return None
+        return _Matrix(fingerprint, vectors, arrays, documents)
+
+    def _remove_stale_files(self, keep: set) -> None:
+        """Cancella le matrici di impronte precedenti (i mmap aperti restano validi)"""
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        for filename in os.listdir(directory):
+            if (
+                filename.startswith(prefix)
+                and filename.endswith(".npy")
+                and filename not in keep
+            ):
+                try:
+                    os.remove(os.path.join(directory, filename))
+                except OSError:
+                    pass
+
+    def _fingerprint(
+        self, documents: Sequence[Tuple[_DocKey, ContentRecord, str]]
+    ) -> str:
+        """Impronta di embedder e documenti: uguale in tutti i worker allineati"""
+        digest = hashlib.blake2b(self.embedder.name.encode(), digest_size=16)
+        for (endpoint, item_id), _, text in documents:
+            digest.update(f"\0{endpoint}\0{item_id}\0{text}".encode())
+        return digest.hexdigest()
+
+    def _top(
+        self, matrix: _Matrix, scores: "np.ndarray", limit: int
+    ) -> List[SearchHit]:
+        """I ``limit`` documenti con similarità più alta (argpartition)"""
+        count = min(limit, len(scores))
+        if count <= 0:
+            return []
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best])]
+        return [
+            SearchHit(
+                round(float(scores[row]), 4),
+                matrix.keys[row][0],
+                matrix.keys[row][1],
+                matrix.records[row],
+            )
+            for row in best
+            if scores[row] >= MIN_SIMILARITY and matrix.keys[row] in self._source
+        ]
+
+    def _refresh(self) -> None:
+        """Ricostruzione in background dopo una modifica dei documenti"""
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Ricostruzione indice semantico fallita: {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+
+# Worker per la costruzione della matrice (fuori dal chat path)
+_build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wp-semantic")
+
+_semantic_index = SemanticIndex()
+
+
+def get_semantic_index() -> SemanticIndex:
+    """Restituisce l'indice semantico condiviso dal processo"""
+    return _semantic_index
+
+
+def warm_semantic_index(client: "OptimizedWordPressClient") -> None:
+    """Costruisce (o carica dal disco) l'indice in background all'avvio"""
+    _build_executor.submit(_semantic_index.ensure, client)
@@ -0,0 +1,153 @@
+"""
+Shared HTTP transport - process-wide pooled keep-alive session for WordPress
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_USER_AGENT
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+_session: Optional[requests.Session] = None
+_adapter: Optional[HTTPAdapter] = None
+_session_lock = threading.Lock()
+
+# Un client async per event loop: i pool httpx sono legati al loop che li crea
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Restituisce la sessione HTTP condivisa da tutti i client WordPress.
+
+    La sessione viene creata una sola volta per processo: le connessioni
+    TCP+TLS restano aperte (keep-alive) e vengono riutilizzate tra tool call,
+    evitando handshake e lookup DNS ripetuti verso lo stesso host.
+
+    Returns:
+        requests.Session con connection pool configurato
+    """
+    global _session, _adapter
+
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=0,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
+                {"User-Agent": HTTP_USER_AGENT, "Connection": "keep-alive"}
+            )
+
+            _adapter = adapter
+            _session = session
+            logger.info(
+                f"HTTP session condivisa creata (pool_maxsize={HTTP_POOL_MAXSIZE})"
+            )
+
+    return _session
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Statistiche del connection pool condiviso.
+
+    Un "hit" è una richiesta servita su una connessione già aperta,
+    un "miss" è una richiesta che ha dovuto aprire una nuova connessione.
+
+    Returns:
+        Dict con richieste totali, hit, miss e dettaglio per host
+    """
+    if _adapter is None:
+        return {"requests": 0, "hits": 0, "misses": 0, "hosts": {}}
+
+    hosts: Dict[str, Dict[str, int]] = {}
+    total_requests = 0
+    total_connections = 0
+
+    pools = _adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        requests_count = pool.num_requests
+        connections_count = pool.num_connections
+        total_requests += requests_count
+        total_connections += connections_count
+        hosts[f"{pool.scheme}://{pool.host}"] = {
+            "requests": requests_count,
+            "hits": max(requests_count - connections_count, 0),
+            "misses": connections_count,
+        }
+
+    return {
+        "requests": total_requests,
+        "hits": max(total_requests - total_connections, 0),
+        "misses": total_connections,
+        "pool_maxsize": HTTP_POOL_MAXSIZE,
+        "hosts": hosts,
+    }
+
+
+def close_http_session() -> None:
+    """Chiude la sessione condivisa (shutdown o test)"""
+    global _session, _adapter
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _adapter = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Restituisce il client httpx condiviso per l'event loop corrente.
+
+    Tutte le richieste async dello stesso loop condividono un unico
+    connection pool keep-alive, quindi molte richieste WordPress possono
+    essere in volo contemporaneamente senza occupare un thread ciascuna.
+
+    Returns:
+        httpx.AsyncClient con limiti di pool configurati
+    """
+    loop = asyncio.get_running_loop()
+
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            ),
+            headers={"User-Agent": HTTP_USER_AGENT},
+        )
+        _async_clients[loop] = client
+        logger.info(
+            f"HTTP client async condiviso creato (max_connections={HTTP_POOL_MAXSIZE})"
+        )
+
+    return client
+
+
+async def close_async_http_client() -> None:
+    """Chiude il client async associato all'event loop corrente"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,468 @@
+"""
+Content snapshot - offline bundle of every WordPress collection, served without network
+
+Uso:
+    python -m src.veronica_wordpress_chatbot.wordpress.snapshot export [--output PATH]
+    python -m src.veronica_wordpress_chatbot.wordpress.snapshot info [PATH]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+
+from ..config import (
+    DEFAULT_REQUEST_PARAMS,
+    SNAPSHOT_PATH,
+    WORDPRESS_FIELD_CONFIGS,
+    Configuration,
+)
+from ..utils.logging_config import setup_logging
+from .async_client import AsyncWordPressClient
+from .client import OptimizedWordPressClient
+from .memo import get_processed_cache
+from .processor import ENDPOINT_PROCESSORS
+from .records import ENDPOINT_RECORDS
+from .search_index import fold_accents
+
+try:
+    import msgpack  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    msgpack = None
+
+logger = setup_logging(__name__)
+
+SNAPSHOT_ENDPOINTS = tuple(WORDPRESS_FIELD_CONFIGS)
+
+# Header: magic, versione del formato, codec, lunghezza dell'indice JSON.
+# Seguono l'indice e un blocco zlib per endpoint ({"items", "processed"})
+SNAPSHOT_MAGIC = b"VWPSNP"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<6sHBI")
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_ORDER_KEYS = ("date", "modified", "title", "id")
+
+
+class SnapshotFormatError(ValueError):
+    """Bundle non leggibile (file estraneo, versione o codec non supportati)"""
+
+
+def _encode(value: Any, codec: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return cast(bytes, msgpack.packb(value, use_bin_type=True))
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _decode(raw: bytes, codec: int) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise SnapshotFormatError("Snapshot msgpack ma msgpack non è installato")
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+def _rendered(value: Any) -> str:
+    """Testo di un campo WordPress ({"rendered": ...} oppure stringa)"""
+    if isinstance(value, dict):
+        return str(value.get("rendered", ""))
+    return str(value or "")
+
+
+def _search_text(item: Dict[str, Any]) -> str:
+    """Testo su cui cercare (come ``search`` di WordPress: titolo e contenuto)"""
+    return fold_accents(
+        " ".join(
+            _rendered(item.get(field)) for field in ("title", "content", "excerpt")
+        )
+    )
+
+
+def _id_set(value: Any) -> set:
+    """ID da un filtro WordPress (int, "1,2" oppure lista)"""
+    if isinstance(value, (list, tuple, set)):
+        values: Iterable[Any] = value
+    else:
+        values = str(value).split(",")
+    return {int(v) for v in values if str(v).strip()}
+
+
+def write_snapshot(
+    path: str,
+    collections: Dict[str, List[Dict[str, Any]]],
+    base_url: str = "",
+    use_msgpack: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Scrive il bundle in modo atomico (file temporaneo + rename).
+
+    Args:
+        path: File di destinazione
+        collections: Mappa endpoint → item raw come restituiti da WordPress
+        base_url: Sito di origine (solo informativo)
+        use_msgpack: Forza il codec; di default msgpack se installato
+
+    Returns:
+        Indice del bundle
+    """
+    if use_msgpack is None:
+        use_msgpack = msgpack is not None
+    codec = CODEC_MSGPACK if use_msgpack else CODEC_JSON
+
+    blocks: List[bytes] = []
+    endpoints: Dict[str, Any] = {}
+    offset = 0
+    for endpoint, items in collections.items():
+        processor = ENDPOINT_PROCESSORS.get(endpoint)
+        block = zlib.compress(
+            _encode(
+                {
+                    "items": items,
+                    "processed": (
+                        [processor(item).to_dict() for item in items]
+                        if processor
+                        else []
+                    ),
+                },
+                codec,
+            ),
+            9,
+        )
+        endpoints[endpoint] = {
+            "offset": offset,
+            "length": len(block),
+            "items": len(items),
+            "max_modified": max(
+                (str(item.get("modified") or "") for item in items), default=""
+            ),
+        }
+        blocks.append(block)
+        offset += len(block)
+
+    index = {
+        "version": SNAPSHOT_VERSION,
+        "codec": "msgpack" if codec == CODEC_MSGPACK else "json",
+        "base_url": base_url,
+        "created_at": time.time(),
+        "endpoints": endpoints,
+    }
+    index_raw = json.dumps(index).encode()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, codec, len(index_raw)))
+        f.write(index_raw)
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, path)
+    return index
+
+
+def export_snapshot(
+    path: str = SNAPSHOT_PATH,
+    client: Optional[OptimizedWordPressClient] = None,
+    endpoints: Iterable[str] = SNAPSHOT_ENDPOINTS,
+    use_msgpack: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Scarica tutte le collezioni da WordPress e le salva nel bundle.
+
+    Raises:
+        requests.exceptions.RequestException: se una collezione non è
+            scaricabile (nessun bundle parziale viene scritto)
+    """
+    client = client or OptimizedWordPressClient(Configuration().wordpress_base_url)
+    collections = {
+        endpoint: list(client.iter_collection(endpoint)) for endpoint in endpoints
+    }
+    index = write_snapshot(path, collections, client.base_url, use_msgpack)
+    logger.info(f"Snapshot WordPress scritto in {path}: {index['endpoints']}")
+    return index
+
+
+class ContentSnapshot:
+    """
+    Bundle in sola lettura mappato in memoria.
+
+    Header e indice vengono letti all'apertura; il blocco di un endpoint
+    viene decompresso solo al primo accesso, così l'avvio non dipende dalla
+    dimensione del bundle.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._collections: Dict[str, Dict[str, Any]] = {}
+
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # file vuoto
+            self._file.close()
+            raise SnapshotFormatError(f"Snapshot vuoto: {path}") from e
+
+        try:
+            magic, version, codec, index_length = _HEADER.unpack_from(self._map)
+        except struct.error as e:
+            self.close()
+            raise SnapshotFormatError(f"Snapshot troncato: {path}") from e
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self.close()
+            raise SnapshotFormatError(
+                f"{path} non è uno snapshot v{SNAPSHOT_VERSION} valido"
+            )
+
+        self.codec = codec
+        start = _HEADER.size
+        self.index: Dict[str, Any] = json.loads(self._map[start : start + index_length])
+        self._data_start = start + index_length
+
+    @property
+    def endpoints(self) -> Tuple[str, ...]:
+        """Endpoint contenuti nel bundle"""
+        return tuple(self.index["endpoints"])
+
+    def _collection(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Blocco decompresso dell'endpoint (None se non presente)"""
+        entry = self.index["endpoints"].get(endpoint)
+        if entry is None:
+            return None
+
+        with self._lock:
+            collection = self._collections.get(endpoint)
+            if collection is None:
+                start = self._data_start + entry["offset"]
+                raw = zlib.decompress(self._map[start : start + entry["length"]])
+                collection = _decode(raw, self.codec)
+                collection["search_text"] = [
+                    _search_text(item) for item in collection["items"]
+                ]
+                self._collections[endpoint] = collection
+                # I tool non ripuliscono l'HTML: i documenti sono già processati
+                record = ENDPOINT_RECORDS.get(endpoint)
+                if record is not None:
+                    get_processed_cache().prime(
+                        endpoint,
+                        collection["items"],
+                        (record.from_dict(doc) for doc in collection["processed"]),
+                    )
+            return collection
+
+    def items(self, endpoint: str) -> List[Dict[str, Any]]:
+        """Item raw dell'endpoint, nell'ordine di WordPress"""
+        collection = self._collection(endpoint)
+        return list(collection["items"]) if collection else []
+
+    def processed(self, endpoint: str) -> List[Dict[str, Any]]:
+        """Item già passati da ContentProcessor all'esportazione"""
+        collection = self._collection(endpoint)
+        return list(collection["processed"]) if collection else []
+
+    def query(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Risponde a una richiesta come farebbe la REST API di WordPress.
+
+        Supporta per_page, page, search, include, orderby, order,
+        modified_after/modified_before e i filtri per tassonomia
+        (es. ``categories`` o ``tool-category``); gli altri parametri sono
+        ignorati.
+
+        Returns:
+            Lista di item raw, oppure None se l'endpoint non è nel bundle
+        """
+        collection = self._collection(endpoint)
+        if collection is None:
+            return None
+
+        request = {**DEFAULT_REQUEST_PARAMS, **(params or {})}
+        terms = fold_accents(str(request.pop("search", "") or "")).split()
+        include = _id_set(request.pop("include")) if "include" in request else None
+        modified_after = str(request.pop("modified_after", "") or "")
+        modified_before = str(request.pop("modified_before", "") or "")
+
+        items = collection["items"]
+        taxonomies = {
+            key: _id_set(value)
+            for key, value in request.items()
+            if items and isinstance(items[0].get(key), list)
+        }
+
+        matches = [
+            item
+            for item, text in zip(items, collection["search_text"])
+            if all(term in text for term in terms)
+            and (include is None or int(item["id"]) in include)
+            and (not modified_after or str(item.get("modified", "")) > modified_after)
+            and (not modified_before or str(item.get("modified", "")) < modified_before)
+            and all(
+                values & set(item.get(key) or ()) for key, values in taxonomies.items()
+            )
+        ]
+
+        orderby = str(request.get("orderby", "date"))
+        key = orderby if orderby in _ORDER_KEYS else "date"
+        reverse = str(request.get("order", "desc")).lower() != "asc"
+        matches.sort(
+            key=lambda item: (
+                _rendered(item.get(key)) if key == "title" else item.get(key) or "",
+                item.get("id", 0),
+            ),
+            reverse=reverse,
+        )
+
+        per_page = int(request.get("per_page", 10))
+        page = max(int(request.get("page", 1)), 1)
+        return matches[(page - 1) * per_page : page * per_page]
+
+    def stats(self) -> Dict[str, Any]:
+        """Informazioni sul bundle"""
+        return {
+            "path": self.path,
+            "bytes": len(self._map),
+            "codec": self.index["codec"],
+            "base_url": self.index["base_url"],
+            "created_at": self.index["created_at"],
+            "endpoints": {
+                endpoint: {
+                    "items": entry["items"],
+                    "max_modified": entry["max_modified"],
+                    "loaded": endpoint in self._collections,
+                }
+                for endpoint, entry in self.index["endpoints"].items()
+            },
+        }
+
+    def close(self) -> None:
+        """Rilascia il mapping e il file"""
+        if getattr(self, "_map", None) is not None and not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+
+class SnapshotWordPressClient(OptimizedWordPressClient):
+    """
+    Client con la stessa interfaccia di OptimizedWordPressClient che risponde
+    solo dal bundle: nessuna richiesta di rete, risultati deterministici.
+    """
+
+    def __init__(
+        self, base_url: str, snapshot: Optional[ContentSnapshot] = None
+    ) -> None:
+        super().__init__(base_url)
+        self.snapshot = snapshot or get_content_snapshot()
+
+    def _make_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Legge dal bundle (None se l'endpoint non è stato esportato)"""
+        result = self.snapshot.query(endpoint, params)
+        if result is None:
+            logger.warning(f"Endpoint {endpoint} assente dallo snapshot")
+        return result
+
+    def iter_collection(  # type: ignore[override]
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """Itera tutti gli item dell'endpoint che rispettano i filtri"""
+        total = len(self.snapshot.items(endpoint)) or 1
+        request = {**(params or {}), "per_page": total, "page": 1}
+        yield from self.snapshot.query(endpoint, request) or []
+
+
+class AsyncSnapshotWordPressClient(AsyncWordPressClient):
+    """Versione async di SnapshotWordPressClient"""
+
+    def __init__(
+        self, base_url: str, snapshot: Optional[ContentSnapshot] = None
+    ) -> None:
+        super().__init__(base_url)
+        self.snapshot = snapshot or get_content_snapshot()
+
+    async def _make_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Legge dal bundle (None se l'endpoint non è stato esportato)"""
+        result = self.snapshot.query(endpoint, params)
+        if result is None:
+            logger.warning(f"Endpoint {endpoint} assente dallo snapshot")
+        return result
+
+
+_content_snapshot: Optional[ContentSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_content_snapshot() -> ContentSnapshot:
+    """
+    Restituisce il bundle condiviso dal processo (aperto al primo utilizzo).
+
+    Raises:
+        FileNotFoundError: se il bundle non è stato generato
+        SnapshotFormatError: se il file non è un bundle valido
+    """
+    global _content_snapshot
+
+    with _snapshot_lock:
+        if _content_snapshot is None:
+            _content_snapshot = ContentSnapshot()
+            logger.info(f"Snapshot WordPress caricato: {SNAPSHOT_PATH}")
+        return _content_snapshot
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: esporta o ispeziona lo snapshot"""
+    parser = argparse.ArgumentParser(description="Snapshot offline dei contenuti")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Scarica WordPress nel bundle")
+    export.add_argument("--output", default=SNAPSHOT_PATH)
+    export.add_argument("--base-url", default=Configuration().wordpress_base_url)
+    export.add_argument(
+        "--endpoints", default=",".join(SNAPSHOT_ENDPOINTS), help="Lista CSV"
+    )
+    export.add_argument(
+        "--json", action="store_true", help="Usa JSON anche se msgpack è installato"
+    )
+
+    info = commands.add_parser("info", help="Mostra il contenuto del bundle")
+    info.add_argument("path", nargs="?", default=SNAPSHOT_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        index = export_snapshot(
+            args.output,
+            OptimizedWordPressClient(args.base_url),
+            [e.strip() for e in args.endpoints.split(",") if e.strip()],
+            use_msgpack=False if args.json else None,
+        )
+        size = os.path.getsize(args.output)
+        print(f"✅ Snapshot scritto in {args.output} ({size} byte, {index['codec']})")
+        for endpoint, entry in index["endpoints"].items():
+            print(f"   {endpoint}: {entry['items']} item")
+        return 0
+
+    snapshot = ContentSnapshot(args.path)
+    try:
+        print(json.dumps(snapshot.stats(), indent=2, ensure_ascii=False))
+    finally:
+        snapshot.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
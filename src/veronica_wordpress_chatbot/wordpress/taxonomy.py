@@ -0,0 +1,214 @@
+"""
+Taxonomy terms - cached ID → name lookup for WordPress category taxonomies
+"""
+
+import asyncio
+import html
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import TAXONOMY_CACHE_TTL, WORDPRESS_FIELD_CONFIGS
+from ..utils.logging_config import setup_logging
+from .memo import get_processed_cache
+
+if TYPE_CHECKING:
+    from .async_client import AsyncWordPressClient
+    from .client import OptimizedWordPressClient
+
+logger = setup_logging(__name__)
+
+# Tassonomia delle categorie di ogni endpoint (es. "tools" → "tool-category")
+ENDPOINT_TAXONOMIES: Dict[str, str] = {
+    endpoint: str(config["taxonomy"])
+    for endpoint, config in WORDPRESS_FIELD_CONFIGS.items()
+    if config.get("taxonomy")
+}
+TAXONOMY_ENDPOINTS = {
+    taxonomy: endpoint for endpoint, taxonomy in ENDPOINT_TAXONOMIES.items()
+}
+
+
+class _Terms:
+    """Termini di una tassonomia con l'indice per la ricerca per nome"""
+
+    __slots__ = ("names", "index", "loaded_at")
+
+    def __init__(self, names: Dict[int, str]) -> None:
+        self.names = names
+        # (nome in minuscolo, ID) per risolvere i filtri per categoria
+        self.index: List[Tuple[str, int]] = [
+            (name.lower(), term_id) for term_id, name in names.items()
+        ]
+        self.loaded_at: Optional[float] = None
+
+
+def _seed(taxonomy: str) -> _Terms:
+    """Termini noti da WORDPRESS_FIELD_CONFIGS (prima del primo download)"""
+    config = WORDPRESS_FIELD_CONFIGS.get(TAXONOMY_ENDPOINTS.get(taxonomy, ""), {})
+    categories: Dict[Any, Any] = config.get("categories") or {}  # type: ignore
+    return _Terms({int(term_id): str(name) for term_id, name in categories.items()})
+
+
+class TaxonomyCache:
+    """
+    Cache thread-safe dei termini delle tassonomie WordPress.
+
+    I termini di una tassonomia vengono scaricati in blocco con una sola
+    richiesta (``get_terms``) e riusati per ``ttl`` secondi; la risoluzione
+    ID → nome è un lookup su un dict già pronto. Finché una tassonomia non è
+    stata scaricata, o se WordPress non risponde, valgono i termini noti in
+    WORDPRESS_FIELD_CONFIGS. Quando i nomi cambiano i documenti processati
+    dell'endpoint vengono invalidati, perché contengono i nomi risolti.
+    """
+
+    def __init__(self, ttl: float = TAXONOMY_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._terms: Dict[str, _Terms] = {
+            taxonomy: _seed(taxonomy) for taxonomy in TAXONOMY_ENDPOINTS
+        }
+
+        self.loads = 0
+        self.failures = 0
+
+    def is_fresh(self, taxonomy: str) -> bool:
+        """True se i termini sono stati scaricati da meno di ``ttl`` secondi"""
+        terms = self._terms.get(taxonomy)
+        return (
+            terms is not None
+            and terms.loaded_at is not None
+            and time.monotonic() - terms.loaded_at < self.ttl
+        )
+
+    def names(self, taxonomy: str, term_ids: Iterable[Any]) -> Tuple[str, ...]:
+        """Nomi dei termini (``Categoria N`` per gli ID sconosciuti)"""
+        terms = self._terms.get(taxonomy)
+        lookup = terms.names if terms is not None else {}
+        return tuple(
+            lookup.get(term_id) or f"Categoria {term_id}" for term_id in term_ids
+        )
+
+    def resolve(self, taxonomy: str, query: str) -> Optional[Tuple[int, ...]]:
+        """
+        ID dei termini il cui nome contiene ``query`` (case-insensitive, come
+        il filtro sui nomi delle categorie dei documenti processati).
+
+        Returns:
+            Tupla di ID (vuota se nessun termine corrisponde), oppure None se
+            della tassonomia non si conosce nessun termine
+        """
+        terms = self._terms.get(taxonomy)
+        if terms is None or not terms.names:
+            return None
+        needle = query.strip().lower()
+        return tuple(term_id for text, term_id in terms.index if needle in text)
+
+    def update(self, taxonomy: str, items: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Sostituisce i termini di una tassonomia con quelli scaricati.
+
+        Returns:
+            True se i nomi sono cambiati rispetto a quelli in uso
+        """
+        # WordPress restituisce i nomi con le entità HTML (es. "&amp;")
+        names = {
+            int(item["id"]): html.unescape(str(item.get("name") or ""))
+            or f"Categoria {item['id']}"
+            for item in items
+            if item.get("id") is not None
+        }
+
+        terms = _Terms(names)
+        terms.loaded_at = time.monotonic()
+
+        with self._lock:
+            previous = self._terms.get(taxonomy)
+            changed = previous is None or previous.names != names
+            self._terms[taxonomy] = terms
+            self.loads += 1
+
+        endpoint = TAXONOMY_ENDPOINTS.get(taxonomy)
+        if changed and endpoint:
+            get_processed_cache().invalidate(endpoint)
+        return changed
+
+    def ensure(
+        self, client: "OptimizedWordPressClient", taxonomies: Iterable[str]
+    ) -> None:
+        """Scarica i termini delle tassonomie scadute (best effort)"""
+        for taxonomy in taxonomies:
+            if self.is_fresh(taxonomy):
+                continue
+            try:
+                items = client.get_terms(taxonomy)
+            except Exception as e:
+                items = None
+                logger.warning(f"Termini {taxonomy} non disponibili: {e}")
+            self._apply(taxonomy, items)
+
+    async def aensure(
+        self, client: "AsyncWordPressClient", taxonomies: Iterable[str]
+    ) -> None:
+        """Versione async di ``ensure``: le tassonomie scadute in parallelo"""
+        stale = [taxonomy for taxonomy in taxonomies if not self.is_fresh(taxonomy)]
+
+        async def fetch(taxonomy: str) -> Any:
+            try:
+                return await client.get_terms(taxonomy)
+            except Exception as e:
+                logger.warning(f"Termini {taxonomy} non disponibili: {e}")
+                return None
+
+        results = await asyncio.gather(*(fetch(taxonomy) for taxonomy in stale))
+        for taxonomy, items in zip(stale, results):
+            self._apply(taxonomy, items)
+
+    def invalidate(self, taxonomy: Optional[str] = None) -> None:
+        """Forza un nuovo download alla prossima ``ensure``"""
+        with self._lock:
+            for name, terms in self._terms.items():
+                if taxonomy is None or name == taxonomy:
+                    terms.loaded_at = None
+
+    def clear(self) -> None:
+        """Torna ai termini noti e azzera le statistiche"""
+        with self._lock:
+            self._terms = {taxonomy: _seed(taxonomy) for taxonomy in TAXONOMY_ENDPOINTS}
+            self.loads = self.failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Termini in uso per tassonomia"""
+        with self._lock:
+            return {
+                "ttl": self.ttl,
+                "loads": self.loads,
+                "failures": self.failures,
+                "taxonomies": {
+                    taxonomy: {
+                        "terms": len(terms.names),
+                        "fresh": self.is_fresh(taxonomy),
+                    }
+                    for taxonomy, terms in self._terms.items()
+                },
+            }
+
+    def _apply(self, taxonomy: str, items: Any) -> None:
+        """Applica il risultato di ``get_terms``; in caso di errore riprova dopo ttl"""
+        if isinstance(items, list) and items:
+            self.update(taxonomy, items)
+            return
+
+        # Nessun termine: restano quelli in uso, senza ritentare a ogni chiamata
+        with self._lock:
+            self.failures += 1
+            terms = self._terms.setdefault(taxonomy, _seed(taxonomy))
+            terms.loaded_at = time.monotonic()
+
+
+_taxonomy_cache = TaxonomyCache()
+
+
+def get_taxonomy_cache() -> TaxonomyCache:
+    """Restituisce la cache dei termini condivisa dal processo"""
+    return _taxonomy_cache
@@ -0,0 +1,172 @@
+"""
+WordPress webhook - signed change notifications that invalidate cached content
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config import (
+    MIRROR_ENABLED,
+    WEBHOOK_SECRET,
+    WEBHOOK_TOLERANCE,
+    WORDPRESS_FIELD_CONFIGS,
+)
+from ..utils.logging_config import setup_logging
+from .cache import get_response_cache
+from .revalidation import get_revalidation_store
+from .search_index import get_search_index
+
+logger = setup_logging(__name__)
+
+# Azioni inviate dal plugin WordPress
+SAVE_ACTIONS = {"save", "update", "publish"}
+DELETE_ACTIONS = {"delete", "trash", "unpublish"}
+
+# Post type WordPress → endpoint REST (es. "post" → "posts")
+POST_TYPE_ENDPOINTS: Dict[str, str] = {
+    **{endpoint.rstrip("s"): endpoint for endpoint in WORDPRESS_FIELD_CONFIGS},
+    **{endpoint: endpoint for endpoint in WORDPRESS_FIELD_CONFIGS},
+}
+
+
+def sign_payload(body: bytes, timestamp: str, secret: str = WEBHOOK_SECRET) -> str:
+    """Firma ``sha256=<hex>`` di ``<timestamp>.<body>`` (come nel plugin PHP)"""
+    message = timestamp.encode() + b"." + body
+    digest = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(
+    body: bytes,
+    timestamp: Optional[str],
+    signature: Optional[str],
+    secret: str = WEBHOOK_SECRET,
+    now: Optional[float] = None,
+) -> bool:
+    """
+    Verifica firma HMAC e freschezza del timestamp (anti replay).
+
+    Returns:
+        True se la richiesta proviene dal plugin con il secret condiviso
+    """
+    if not secret or not timestamp or not signature:
+        return False
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        return False
+
+    current = time.time() if now is None else now
+    if abs(current - sent_at) > WEBHOOK_TOLERANCE:
+        return False
+
+    expected = sign_payload(body, timestamp, secret)
+    return hmac.compare_digest(expected, signature)
+
+
+def resolve_endpoint(post_type: str, rest_base: Optional[str] = None) -> Optional[str]:
+    """Endpoint REST interessato dall'evento, o None se non è in cache"""
+    for candidate in (rest_base, post_type):
+        if candidate and candidate in POST_TYPE_ENDPOINTS:
+            return POST_TYPE_ENDPOINTS[candidate]
+    return None
+
+
+class WebhookStats:
+    """Contatori degli eventi ricevuti"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.events = 0
+        self.ignored = 0
+        self.rejected = 0
+        self.last_event: Optional[Dict[str, Any]] = None
+
+    def record(self, event: Optional[Dict[str, Any]]) -> None:
+        """Registra un evento applicato (None = ignorato)"""
+        with self._lock:
+            if event is None:
+                self.ignored += 1
+            else:
+                self.events += 1
+                self.last_event = {**event, "received_at": time.time()}
+
+    def record_rejected(self) -> None:
+        """Registra una richiesta con firma non valida"""
+        with self._lock:
+            self.rejected += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiche webhook"""
+        with self._lock:
+            return {
+                "enabled": bool(WEBHOOK_SECRET),
+                "events": self.events,
+                "ignored": self.ignored,
+                "rejected": self.rejected,
+                "last_event": self.last_event,
+            }
+
+
+_webhook_stats = WebhookStats()
+
+
+def get_webhook_stats() -> WebhookStats:
+    """Restituisce le statistiche webhook condivise dal processo"""
+    return _webhook_stats
+
+
+def invalidate_content(
+    post_type: str, post_id: int, action: str, rest_base: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Invalida i contenuti interessati da una modifica su WordPress.
+
+    Rimuove le risposte in cache e i payload di revalidation del solo
+    endpoint modificato; gli altri restano validi. Nell'indice di ricerca un
+    item cancellato viene rimosso subito e la collezione viene riallineata
+    alla ricerca successiva.
+
+    Returns:
+        Riepilogo dell'invalidazione, o None se il post type non è gestito
+    """
+    endpoint = resolve_endpoint(post_type, rest_base)
+    if endpoint is None:
+        logger.debug(f"Webhook ignorato per post type non gestito: {post_type}")
+        _webhook_stats.record(None)
+        return None
+
+    event = {
+        "endpoint": endpoint,
+        "id": post_id,
+        "action": action,
+        "cache_entries": get_response_cache().invalidate(endpoint),
+        "revalidation_records": get_revalidation_store().invalidate(endpoint),
+        "search_documents": get_search_index().invalidate(
+            endpoint, post_id if action in DELETE_ACTIONS else None
+        ),
+    }
+    logger.info(f"Webhook WordPress: {event}")
+    _webhook_stats.record(event)
+    return event
+
+
+def refresh_mirror_item(endpoint: str, post_id: int, action: str) -> None:
+    """Aggiorna il mirror SQLite per l'item modificato (in background)"""
+    if not MIRROR_ENABLED:
+        return
+
+    from .mirror import get_content_mirror
+
+    mirror = get_content_mirror()
+    try:
+        if action in DELETE_ACTIONS:
+            mirror.invalidate(endpoint, post_id)
+        else:
+            mirror.refresh_item(endpoint, post_id)
+    except Exception as e:
+        logger.error(f"Aggiornamento mirror fallito per {endpoint}/{post_id}: {e}")
@@ -2,6 +2,28 @@
 LangGraph workflow module
 """
 
+from .checkpointer import (
+    SqliteCheckpointer,
+    create_checkpointer,
+    get_sqlite_checkpointer,
+    start_checkpoint_vacuum,
+    stop_checkpoint_vacuum,
+)
 from .graph import create_graph, get_graph
+from .history import HistoryManager, get_history_manager, trim_history
+from .registry import ModelRegistry, get_model_registry
 
-__all__ = ["create_graph", "get_graph"]
+__all__ = [
+    "create_graph",
+    "get_graph",
+    "ModelRegistry",
+    "get_model_registry",
+    "HistoryManager",
+    "get_history_manager",
+    "trim_history",
+    "SqliteCheckpointer",
+    "create_checkpointer",
+    "get_sqlite_checkpointer",
+    "start_checkpoint_vacuum",
+    "stop_checkpoint_vacuum",
+]
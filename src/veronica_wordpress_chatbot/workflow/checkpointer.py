@@ -0,0 +1,542 @@
+"""
+Checkpointer - LangGraph conversations persisted in SQLite with pruning and TTL
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from ..config import (
+    CHECKPOINT_COMPRESS_MIN_BYTES,
+    CHECKPOINT_KEEP,
+    CHECKPOINT_PATH,
+    CHECKPOINT_TTL,
+    CHECKPOINT_VACUUM_INTERVAL,
+)
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_by_updated ON threads (updated);
+"""
+
+# Suffisso del tipo serializzato per i payload compressi con zlib
+_ZLIB = "+zlib"
+
+
+class SqliteCheckpointer(BaseCheckpointSaver):
+    """
+    Checkpointer LangGraph su SQLite locale (WAL: più worker sullo stesso
+    database, letture non bloccate dalle scritture).
+
+    - Checkpoint e scritture pendenti serializzati con il serde di LangGraph
+      (msgpack) e compressi con zlib sopra CHECKPOINT_COMPRESS_MIN_BYTES
+    - Per ogni thread restano solo gli ultimi ``keep`` checkpoint: LangGraph
+      riprende la conversazione dall'ultimo, gli altri servono solo alla
+      history
+    - ``vacuum`` cancella i thread inattivi da più di ``ttl`` secondi e
+      restituisce lo spazio libero al filesystem (vacuum incrementale)
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_PATH,
+        keep: int = CHECKPOINT_KEEP,
+        ttl: float = CHECKPOINT_TTL,
+        compress_min_bytes: int = CHECKPOINT_COMPRESS_MIN_BYTES,
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.keep = max(1, keep)
+        self.ttl = ttl
+        self.compress_min_bytes = compress_min_bytes
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.puts = 0
+        self.pruned = 0
+        self.expired = 0
+        self.last_vacuum: Optional[float] = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            # Solo per database nuovi: deve precedere la creazione delle tabelle
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connessione SQLite del thread corrente (WAL: letture non bloccate)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Serializzazione
+    # ------------------------------------------------------------------
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        """Valore serializzato (tipo, bytes), compresso se grande"""
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= self.compress_min_bytes:
+            return type_ + _ZLIB, zlib.compress(data, 1)
+        return type_, data
+
+    def _loads(self, type_: str, data: bytes) -> Any:
+        """Inverso di ``_dumps``"""
+        if type_.endswith(_ZLIB):
+            type_, data = type_[: -len(_ZLIB)], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    # ------------------------------------------------------------------
+    # BaseCheckpointSaver
+    # ------------------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Checkpoint richiesto dal config (l'ultimo del thread se senza ID)"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        conn = self._connection()
+        sql = (
+            "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint,"
+            " metadata_type, metadata FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        args: List[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id:
+            sql += " AND checkpoint_id = ?"
+            args.append(checkpoint_id)
+        else:
+            sql += " ORDER BY checkpoint_id DESC LIMIT 1"
+
+        row = conn.execute(sql, args).fetchone()
+        if row is None:
+            return None
+        return self._tuple(conn, thread_id, checkpoint_ns, row)
+
+    def _tuple(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Tuple[Any, ...],
+    ) -> CheckpointTuple:
+        """CheckpointTuple da una riga di checkpoints, con le scritture pendenti"""
+        checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata = row
+        writes = conn.execute(
+            "SELECT task_id, channel, type, value FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        return CheckpointTuple(
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            self._loads(type_, checkpoint),
+            self._loads(metadata_type, metadata),
+            (
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            [
+                (task_id, channel, self._loads(value_type, value))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """Checkpoint dal più recente, filtrati per thread, metadata e ``before``"""
+        sql = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+            " type, checkpoint, metadata_type, metadata FROM checkpoints WHERE 1 = 1"
+        )
+        args: List[Any] = []
+        if config is not None:
+            configurable = config["configurable"]
+            sql += " AND thread_id = ?"
+            args.append(configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                sql += " AND checkpoint_ns = ?"
+                args.append(configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                sql += " AND checkpoint_id = ?"
+                args.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            sql += " AND checkpoint_id < ?"
+            args.append(before_id)
+        sql += " ORDER BY checkpoint_id DESC"
+
+        conn = self._connection()
+        returned = 0
+        for thread_id, checkpoint_ns, *row in conn.execute(sql, args).fetchall():
+            if limit is not None and returned >= limit:
+                return
+            item = self._tuple(conn, thread_id, checkpoint_ns, tuple(row))
+            if filter and any(
+                item.metadata.get(key) != value for key, value in filter.items()
+            ):
+                continue
+            returned += 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Salva un checkpoint e pota i più vecchi del thread"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, data = self._dumps(checkpoint)
+        metadata_type, metadata_data = self._dumps(metadata)
+
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns,"
+                " checkpoint_id, parent_checkpoint_id, type, checkpoint,"
+                " metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    type_,
+                    data,
+                    metadata_type,
+                    metadata_data,
+                ),
+            )
+            conn.execute(
+                "INSERT INTO threads (thread_id, updated) VALUES (?, ?)"
+                " ON CONFLICT(thread_id) DO UPDATE SET updated = excluded.updated",
+                (thread_id, time.time()),
+            )
+            pruned = self._prune(conn, thread_id, checkpoint_ns)
+
+        with self._stats_lock:
+            self.puts += 1
+            self.pruned += pruned
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _prune(self, conn: sqlite3.Connection, thread_id: str, ns: str) -> int:
+        """Cancella i checkpoint oltre gli ultimi ``keep`` e le loro scritture"""
+        pruned = conn.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " AND checkpoint_id < (SELECT checkpoint_id FROM checkpoints"
+            "  WHERE thread_id = ? AND checkpoint_ns = ?"
+            "  ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?)",
+            (thread_id, ns, thread_id, ns, self.keep - 1),
+        ).rowcount
+        if pruned:
+            conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ?"
+                " AND checkpoint_id < (SELECT MIN(checkpoint_id) FROM checkpoints"
+                "  WHERE thread_id = ? AND checkpoint_ns = ?)",
+                (thread_id, ns, thread_id, ns),
+            )
+        return pruned
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Salva le scritture pendenti di un task legate al checkpoint corrente"""
+        configurable = config["configurable"]
+        # Scritture speciali (errori, interrupt): l'ultima vince
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        rows = [
+            (
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self._dumps(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO writes"
+                " (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel,"
+                " type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Cancella checkpoint e scritture di un thread"""
+        with self._connection() as conn:
+            self._delete_threads(conn, [thread_id])
+
+    @staticmethod
+    def _delete_threads(conn: sqlite3.Connection, thread_ids: List[str]) -> None:
+        args = [(thread_id,) for thread_id in thread_ids]
+        conn.executemany("DELETE FROM checkpoints WHERE thread_id = ?", args)
+        conn.executemany("DELETE FROM writes WHERE thread_id = ?", args)
+        conn.executemany("DELETE FROM threads WHERE thread_id = ?", args)
+
+    # Versioni async (graph.ainvoke/astream): SQLite fuori dall'event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # ------------------------------------------------------------------
+    # Manutenzione
+    # ------------------------------------------------------------------
+
+    def vacuum(self) -> Dict[str, Any]:
+        """
+        Cancella i thread inattivi da più di ``ttl`` secondi, restituisce le
+        pagine libere al filesystem e tronca il WAL.
+        """
+        started = time.perf_counter()
+        cutoff = time.time() - self.ttl
+
+        with self._connection() as conn:
+            expired = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated < ?", (cutoff,)
+                )
+            ]
+            if expired:
+                self._delete_threads(conn, expired)
+
+        conn = self._connection()
+        freed = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+        with self._stats_lock:
+            self.expired += len(expired)
+            self.last_vacuum = time.time()
+
+        if expired or freed:
+            logger.info(
+                f"Checkpointer: {len(expired)} thread scaduti, {freed} pagine "
+                f"liberate in {time.perf_counter() - started:.3f}s"
+            )
+        return {"expired": len(expired), "freed_pages": freed}
+
+    def clear(self) -> None:
+        """Cancella tutte le conversazioni"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM checkpoints")
+            conn.execute("DELETE FROM writes")
+            conn.execute("DELETE FROM threads")
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connection()
+        threads = conn.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+        checkpoints = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        with self._stats_lock:
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "threads": threads,
+                "checkpoints": checkpoints,
+                "size_bytes": page_count * page_size,
+                "keep_per_thread": self.keep,
+                "ttl": self.ttl,
+                "puts": self.puts,
+                "pruned": self.pruned,
+                "expired": self.expired,
+                "last_vacuum": self.last_vacuum,
+            }
+
+
+_checkpointers: Dict[str, SqliteCheckpointer] = {}
+_checkpointers_lock = threading.Lock()
+
+
+def get_sqlite_checkpointer(path: str = CHECKPOINT_PATH) -> SqliteCheckpointer:
+    """Checkpointer SQLite condiviso dai grafi del processo (uno per database)"""
+    with _checkpointers_lock:
+        checkpointer = _checkpointers.get(path)
+        if checkpointer is None:
+            checkpointer = _checkpointers[path] = SqliteCheckpointer(path)
+        return checkpointer
+
+
+def create_checkpointer(backend: str, path: str = CHECKPOINT_PATH) -> Any:
+    """
+    Checkpointer per ``create_graph``: SQLite persistente oppure MemorySaver
+    (backend "memory", conversazioni perse al riavvio)
+    """
+    if backend == "memory":
+        return MemorySaver()
+    if backend != "sqlite":
+        raise ValueError(f"CHECKPOINT_BACKEND non valido: {backend!r}")
+    return get_sqlite_checkpointer(path)
+
+
+_vacuum_thread: Optional[threading.Thread] = None
+_vacuum_stop = threading.Event()
+
+
+def start_checkpoint_vacuum(
+    path: str = CHECKPOINT_PATH, interval: float = CHECKPOINT_VACUUM_INTERVAL
+) -> None:
+    """Avvia la manutenzione in background del checkpointer SQLite"""
+    global _vacuum_thread
+
+    if _vacuum_thread is not None and _vacuum_thread.is_alive():
+        return
+
+    def _run() -> None:
+        checkpointer = get_sqlite_checkpointer(path)
+        while not _vacuum_stop.wait(interval):
+            try:
+                checkpointer.vacuum()
+            except sqlite3.Error as e:
+                logger.warning(f"Manutenzione checkpointer fallita: {e}")
+
+    _vacuum_stop.clear()
+    _vacuum_thread = threading.Thread(
+        target=_run, name="checkpoint-vacuum", daemon=True
+    )
+    _vacuum_thread.start()
+
+
+def stop_checkpoint_vacuum() -> None:
+    """Ferma la manutenzione in background"""
+    global _vacuum_thread
+
+    _vacuum_stop.set()
+    if _vacuum_thread is not None:
+        _vacuum_thread.join(timeout=5)
+        _vacuum_thread = None
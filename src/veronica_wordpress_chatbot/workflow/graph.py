@@ -2,23 +2,30 @@
 LangGraph workflow - Graph creation and export
 """
 
-from typing import Any, Dict, List, Literal
+import time
+from typing import Any, Dict, List, Literal, Tuple
 
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.runnables.config import RunnableConfig
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 
 # carica .env subito
 load_dotenv()
 
-from ..config import Configuration  # noqa: E402
+from ..config import (  # noqa: E402
+    CHECKPOINT_BACKEND,
+    CHECKPOINT_PATH,
+    Configuration,
+)
 from ..models import InputState, State  # noqa: E402
 from ..tools import TOOLS  # noqa: E402
-from ..utils.prompts import create_system_prompt  # noqa: E402
+from .checkpointer import create_checkpointer  # noqa: E402
+from .history import get_history_manager, summary_message  # noqa: E402
+from .registry import get_model_registry  # noqa: E402
 
 
 def should_continue(state: State) -> Literal["tools", "__end__"]:
@@ -32,23 +39,18 @@ def should_continue(state: State) -> Literal["tools", "__end__"]:
     return "__end__"
 
 
-def call_model(state: State, config: RunnableConfig) -> Dict[str, List[BaseMessage]]:
+def _prepare_model_call(
+    state: State, config: RunnableConfig
+) -> Tuple[Any, List[BaseMessage]]:
     """
-    Nodo principale del modello - Pattern ReAct (Reasoning step)
-
-    Questo nodo viene chiamato ogni volta che il grafo deve ragionare:
-    1. Filtra la configurazione per evitare parametri interni LangGraph
-    2. Inizializza il modello LLM con tools (bind_tools abilita tool calling)
-    3. Gestisce il system prompt (aggiunge solo se non presente)
-    4. Invoca il modello e ritorna la risposta
-
-    Args:
-        state: State del grafo contenente messaggi e configurazione
-        config: RunnableConfig con parametri (thread_id, model, ecc.)
+    Modello con tools e messaggi da inviare (system prompt in testa): la
+    parte comune di call_model e acall_model
 
     Returns:
-        Dict con nuovo messaggio da aggiungere allo state
+        Tupla (modello con tools, messaggi)
     """
+    started = time.perf_counter()
+
     # Estrai configurazione e filtra parametri interni LangGraph
     # LangGraph passa: thread_id, __langgraph_step, ecc.
     # Configuration accetta solo: model, wordpress_base_url
@@ -72,15 +74,10 @@ def call_model(state: State, config: RunnableConfig) -> Dict[str, List[BaseMessa
         Configuration(**filtered_params) if filtered_params else Configuration()
     )
 
-    # Inizializza il modello LLM con tools
-    # temperature=0.1: risposte deterministiche (poco creative)
-    # streaming=True: preparato per streaming futuro (non usato ora)
-    model = ChatOpenAI(model=configuration.model, temperature=0.1, streaming=True)
-
-    # bind_tools() è CRUCIALE per ReAct pattern!
-    # Permette al modello di vedere i 9 tools disponibili e decidere autonomamente
-    # quali chiamare in base al contesto della conversazione
-    model_with_tools = model.bind_tools(TOOLS)
+    # Modello LLM con i 10 tools collegati (vedi ModelRegistry.bound_model):
+    # ChatOpenAI e bind_tools(TOOLS) solo al primo step con questa configurazione
+    registry = get_model_registry()
+    model_with_tools = registry.bound_model(ChatOpenAI, configuration.model)
 
     messages = state["messages"]
 
@@ -88,9 +85,45 @@ def call_model(state: State, config: RunnableConfig) -> Dict[str, List[BaseMessa
     # System prompt deve essere PRIMO messaggio sempre
     # - Primo turno: messages vuoto → aggiungi system prompt
     # - Turni successivi (dopo tool call): system prompt già presente → skip
-    if not messages or not isinstance(messages[0], SystemMessage):
-        system_message = SystemMessage(content=create_system_prompt())
-        messages = [system_message] + messages
+    # - Template riletti solo se modificati su disco
+    if messages and isinstance(messages[0], SystemMessage):
+        system_messages, messages = [messages[0]], messages[1:]
+    else:
+        system_messages = [SystemMessage(content=registry.system_prompt())]
+
+    # Turni già riassunti in background (vedi HistoryManager.schedule_summary)
+    summary = state.get("summary")
+    if summary:
+        system_messages.append(summary_message(summary))
+
+    # History entro il budget di token, output dei tool già usati compattati
+    thread_id = configurable.get("thread_id", "default")
+    messages = system_messages + get_history_manager().prepare(thread_id, messages)
+
+    registry.record_step(time.perf_counter() - started)
+
+    return model_with_tools, messages
+
+
+def call_model(state: State, config: RunnableConfig) -> Dict[str, List[BaseMessage]]:
+    """
+    Nodo principale del modello - Pattern ReAct (Reasoning step)
+
+    Questo nodo viene chiamato ogni volta che il grafo deve ragionare:
+    1. Filtra la configurazione per evitare parametri interni LangGraph
+    2. Prende dal registry il modello LLM con tools (bind_tools abilita tool
+       calling), costruito una sola volta per configurazione
+    3. Gestisce il system prompt (aggiunge solo se non presente)
+    4. Invoca il modello e ritorna la risposta
+
+    Args:
+        state: State del grafo contenente messaggi e configurazione
+        config: RunnableConfig con parametri (thread_id, model, ecc.)
+
+    Returns:
+        Dict con nuovo messaggio da aggiungere allo state
+    """
+    model_with_tools, messages = _prepare_model_call(state, config)
 
     # Invoca il modello con tutto lo storico conversazione
     # Il modello può decidere di:
@@ -105,6 +138,18 @@ def call_model(state: State, config: RunnableConfig) -> Dict[str, List[BaseMessa
     return {"messages": [response]}
 
 
+async def acall_model(
+    state: State, config: RunnableConfig
+) -> Dict[str, List[BaseMessage]]:
+    """
+    Versione async di call_model (usata da graph.ainvoke): la chiamata al
+    modello non blocca l'event loop
+    """
+    model_with_tools, messages = _prepare_model_call(state, config)
+    response = await model_with_tools.ainvoke(messages)
+    return {"messages": [response]}
+
+
 def create_graph() -> Any:
     """Crea il grafo LangGraph con pattern ReAct"""
 
@@ -114,7 +159,8 @@ def create_graph() -> Any:
     )
 
     # Aggiungi nodi
-    builder.add_node("agent", call_model)
+    # invoke usa call_model, ainvoke acall_model
+    builder.add_node("agent", RunnableLambda(call_model, afunc=acall_model))
     builder.add_node("tools", ToolNode(TOOLS))
 
     # Imposta entry point
@@ -128,9 +174,10 @@ def create_graph() -> Any:
     # Edge da tools a agent (continua il ciclo)
     builder.add_edge("tools", "agent")
 
-    # Compila con memory per persistenza stato
-    memory = MemorySaver()
-    graph = builder.compile(checkpointer=memory)
+    # Compila con il checkpointer per persistenza stato (SQLite: condiviso
+    # dai worker, sopravvive ai riavvii, potato per thread e con TTL)
+    checkpointer = create_checkpointer(CHECKPOINT_BACKEND, CHECKPOINT_PATH)
+    graph = builder.compile(checkpointer=checkpointer)
 
     return graph
 
@@ -0,0 +1,411 @@
+"""
+History management - token budget, compacted tool outputs and rolling summary
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables.config import RunnableConfig
+from langchain_openai import ChatOpenAI
+
+from ..config import (
+    HISTORY_KEEP_TURNS,
+    HISTORY_SUMMARY_ENABLED,
+    HISTORY_TOKEN_BUDGET,
+    HISTORY_TOOL_PREVIEW_CHARS,
+    Configuration,
+)
+from ..utils.logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+# Thread di cui vengono tenute le metriche (i meno recenti escono per primi)
+MAX_THREADS = 1000
+
+# Caratteri per token (stima per testo italiano/inglese con tokenizer OpenAI)
+CHARS_PER_TOKEN = 4
+# Token fissi per messaggio (ruolo e separatori del formato chat)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Caratteri di ogni messaggio riportati nella richiesta di riassunto
+SUMMARY_MESSAGE_CHARS = 1000
+
+SUMMARY_PROMPT = """Aggiorna il riassunto di una conversazione tra un utente e \
+l'assistente AI di Veronica Schembri.
+Scrivi in italiano, al massimo 150 parole. Conserva argomenti, richieste \
+dell'utente e fatti citati nelle risposte (titoli, progetti, link) che possono \
+servire nei turni successivi; ometti saluti e formule di cortesia.
+
+Riassunto attuale:
+{summary}
+
+Nuovi messaggi da includere:
+{transcript}
+
+Riassunto aggiornato:"""
+
+
+def _text(message: Any) -> str:
+    """Testo di un messaggio (content stringa o lista di parti)"""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+            if isinstance(part, (str, dict))
+        )
+    return ""
+
+
+def estimate_tokens(messages: Sequence[Any]) -> int:
+    """
+    Token stimati di una lista di messaggi: caratteri / 4 più un costo fisso
+    per messaggio, argomenti delle tool call inclusi. Abbastanza precisa per
+    un budget e senza costi sul critical path (nessun tokenizer).
+    """
+    total = 0
+    for message in messages:
+        chars = len(_text(message))
+        tool_calls = getattr(message, "tool_calls", None)
+        if isinstance(tool_calls, list):
+            for tool_call in tool_calls:
+                chars += len(str(tool_call.get("name", "")))
+                chars += len(json.dumps(tool_call.get("args", {}), default=str))
+        total += chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def split_turns(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """
+    Divide la history in turni: ogni turno inizia con un messaggio
+    dell'utente e contiene tool call, output dei tool e risposta
+    """
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def compact_tool_output(
+    message: ToolMessage, preview_chars: int = HISTORY_TOOL_PREVIEW_CHARS
+) -> ToolMessage:
+    """
+    Output di un tool già usato per una risposta precedente, ridotto a
+    un'anteprima: il modello sa cosa era stato trovato, senza il JSON completo
+    """
+    content = message.content
+    if not isinstance(content, str) or len(content) <= preview_chars:
+        return message
+    return message.model_copy(
+        update={
+            "content": (
+                f"{content[:preview_chars]}… [output già usato in un turno "
+                f"precedente, {len(content) - preview_chars} caratteri omessi]"
+            )
+        }
+    )
+
+
+class TrimmedHistory(NamedTuple):
+    """History da inviare al modello e cosa è stato tolto"""
+
+    messages: List[BaseMessage]
+    tokens_full: int
+    tokens_sent: int
+    compacted: int
+    dropped_turns: int
+
+
+def trim_history(
+    messages: Sequence[BaseMessage],
+    budget: int = HISTORY_TOKEN_BUDGET,
+    preview_chars: int = HISTORY_TOOL_PREVIEW_CHARS,
+) -> TrimmedHistory:
+    """
+    History entro il budget di token:
+
+    1. Gli output dei tool dei turni precedenti diventano anteprime (quelli
+       del turno corrente restano completi: il modello li sta usando)
+    2. Se la history supera ancora il budget, i turni più vecchi vengono
+       esclusi interi (tool call e output restano sempre in coppia)
+
+    Il turno corrente viene sempre inviato, anche se da solo supera il budget.
+    """
+    turns = split_turns(messages)
+    tokens_full = estimate_tokens(messages)
+
+    compacted = 0
+    for turn in turns[:-1]:
+        for index, message in enumerate(turn):
+            if isinstance(message, ToolMessage):
+                compact = compact_tool_output(message, preview_chars)
+                if compact is not message:
+                    turn[index] = compact
+                    compacted += 1
+
+    sizes = [estimate_tokens(turn) for turn in turns]
+    dropped = 0
+    while len(turns) - dropped > 1 and sum(sizes[dropped:]) > budget:
+        dropped += 1
+
+    kept = [message for turn in turns[dropped:] for message in turn]
+    return TrimmedHistory(kept, tokens_full, sum(sizes[dropped:]), compacted, dropped)
+
+
+def summary_message(summary: str) -> SystemMessage:
+    """Riassunto dei turni precedenti, inviato dopo il system prompt"""
+    return SystemMessage(
+        content=f"Riassunto della conversazione precedente con l'utente:\n{summary}"
+    )
+
+
+def _transcript(messages: Sequence[BaseMessage]) -> str:
+    """Domande e risposte da riassumere (senza tool call e output dei tool)"""
+    lines = []
+    for message in messages:
+        text = _text(message).strip()
+        if not text:
+            continue
+        if isinstance(message, HumanMessage):
+            lines.append(f"Utente: {text[:SUMMARY_MESSAGE_CHARS]}")
+        elif isinstance(message, AIMessage):
+            lines.append(f"Assistente: {text[:SUMMARY_MESSAGE_CHARS]}")
+    return "\n".join(lines)
+
+
+def _checkpoint_id(snapshot: Any) -> Optional[str]:
+    """Id del checkpoint da cui è stato letto lo state"""
+    config = getattr(snapshot, "config", None) or {}
+    checkpoint_id = config.get("configurable", {}).get("checkpoint_id")
+    return str(checkpoint_id) if checkpoint_id is not None else None
+
+
+class HistoryManager:
+    """
+    Gestione della history delle conversazioni.
+
+    - Critical path: ``prepare`` applica ``trim_history`` ai messaggi inviati
+      al modello a ogni step (lo state del thread non cambia)
+    - Dopo la risposta: ``schedule_summary`` riassume in background i turni
+      oltre gli ultimi ``keep_turns`` e li toglie dallo state, che resta
+      limitato anche nei checkpoint. Con isteresi: il riassunto parte solo
+      oltre ``2 * keep_turns`` turni (o oltre il budget), così i turni vengono
+      riassunti a blocchi e non con una chiamata al modello per ogni risposta
+
+    Metriche per thread: token della history completa, token inviati e
+    risparmiati, output compattati, turni esclusi e riassunti.
+    """
+
+    def __init__(
+        self,
+        budget: int = HISTORY_TOKEN_BUDGET,
+        keep_turns: int = HISTORY_KEEP_TURNS,
+        summarizer: Optional[Callable[[str], str]] = None,
+        enabled: bool = HISTORY_SUMMARY_ENABLED,
+        max_threads: int = MAX_THREADS,
+    ) -> None:
+        self.budget = budget
+        self.keep_turns = max(1, keep_turns)
+        self.summarizer = summarizer or self._openai_summarizer
+        self.enabled = enabled
+        self.max_threads = max_threads
+        self._llm: Any = None
+        self._lock = threading.Lock()
+        self._threads: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self._totals = self._empty_stats()
+        self._pending: Set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            "steps": 0,
+            "tokens_full": 0,
+            "tokens_sent": 0,
+            "tokens_saved": 0,
+            "compacted_tool_outputs": 0,
+            "dropped_turns": 0,
+            "summaries": 0,
+            "summarized_messages": 0,
+            "summaries_skipped": 0,
+        }
+
+    def _record(self, thread_id: str, **counts: int) -> None:
+        """Somma i contatori alle metriche del thread e ai totali"""
+        with self._lock:
+            stats = self._threads.pop(thread_id, None) or self._empty_stats()
+            self._threads[thread_id] = stats
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+            for key, value in counts.items():
+                stats[key] += value
+                self._totals[key] += value
+
+    def prepare(
+        self, thread_id: str, messages: Sequence[BaseMessage]
+    ) -> List[BaseMessage]:
+        """Messaggi della history da inviare al modello in questo step"""
+        trimmed = trim_history(messages, self.budget)
+        self._record(
+            thread_id,
+            steps=1,
+            tokens_full=trimmed.tokens_full,
+            tokens_sent=trimmed.tokens_sent,
+            tokens_saved=trimmed.tokens_full - trimmed.tokens_sent,
+            compacted_tool_outputs=trimmed.compacted,
+            dropped_turns=trimmed.dropped_turns,
+        )
+        return trimmed.messages
+
+    # ------------------------------------------------------------------
+    # Riassunto progressivo
+    # ------------------------------------------------------------------
+
+    def _openai_summarizer(self, prompt: str) -> str:
+        """Riassunto con il modello configurato (senza tools)"""
+        if self._llm is None:
+            self._llm = ChatOpenAI(model=Configuration().model, temperature=0)
+        return _text(self._llm.invoke(prompt)).strip()
+
+    def summarize_thread(self, graph: Any, config: RunnableConfig) -> bool:
+        """
+        Riassume i turni del thread oltre gli ultimi ``keep_turns`` e li
+        toglie dallo state. Non scrive nulla se nel frattempo un nuovo turno
+        ha aggiornato il thread (ci riprova dopo la risposta successiva)
+
+        Returns:
+            True se lo state è stato aggiornato
+        """
+        snapshot = graph.get_state(config)
+        # Conversazione in corso (o interrotta): riprova dopo il prossimo turno
+        if snapshot.next:
+            return False
+
+        values = snapshot.values or {}
+        messages = values.get("messages", [])
+        turns = split_turns(messages)
+        if len(turns) <= self.keep_turns or not self._needs_summary(turns, messages):
+            return False
+
+        folded = [
+            message
+            for turn in turns[: -self.keep_turns]
+            for message in turn
+            if message.id and not isinstance(message, SystemMessage)
+        ]
+        folded_ids: List[str] = [
+            message.id for message in folded if message.id is not None
+        ]
+        if not folded_ids:
+            return False
+
+        previous = values.get("summary") or "(nessuno)"
+        summary = self.summarizer(
+            SUMMARY_PROMPT.format(summary=previous, transcript=_transcript(folded))
+        )
+        if not summary:
+            return False
+
+        # Un turno concorrente ha scritto un nuovo checkpoint mentre il
+        # riassunto era in corso: lo state letto non è più quello attuale
+        current = graph.get_state(config)
+        if current.next or _checkpoint_id(current) != _checkpoint_id(snapshot):
+            thread_id = config.get("configurable", {}).get("thread_id", "default")
+            self._record(thread_id, summaries_skipped=1)
+            return False
+
+        graph.update_state(
+            config,
+            {
+                "summary": summary,
+                "messages": [RemoveMessage(id=message_id) for message_id in folded_ids],
+            },
+            as_node="agent",
+        )
+
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+        self._record(thread_id, summaries=1, summarized_messages=len(folded))
+        return True
+
+    def _needs_summary(
+        self, turns: Sequence[Sequence[BaseMessage]], messages: Sequence[Any]
+    ) -> bool:
+        """Isteresi: oltre 2 * keep_turns turni o oltre il budget di token"""
+        return (
+            len(turns) > 2 * self.keep_turns or estimate_tokens(messages) > self.budget
+        )
+
+    def schedule_summary(self, graph: Any, config: RunnableConfig) -> None:
+        """
+        Riassunto del thread in background, dopo che la risposta è stata
+        inviata (al più uno in corso per thread)
+        """
+        if not self.enabled:
+            return
+
+        thread_id = config.get("configurable", {}).get("thread_id", "default")
+        with self._lock:
+            if thread_id in self._pending:
+                return
+            self._pending.add(thread_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="history-summary"
+                )
+            executor = self._executor
+
+        def _run() -> None:
+            try:
+                self.summarize_thread(graph, config)
+            except Exception as e:
+                logger.warning(f"Riassunto del thread {thread_id} fallito: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(thread_id)
+
+        executor.submit(_run)
+
+    def thread_stats(self, thread_id: str) -> Dict[str, int]:
+        """Metriche di un thread (zero se mai visto)"""
+        with self._lock:
+            return dict(self._threads.get(thread_id) or self._empty_stats())
+
+    def clear(self) -> None:
+        """Azzera le metriche per thread e i totali"""
+        with self._lock:
+            self._threads.clear()
+            self._totals = self._empty_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Configurazione e metriche totali della history"""
+        with self._lock:
+            return {
+                "token_budget": self.budget,
+                "keep_turns": self.keep_turns,
+                "summary_enabled": self.enabled,
+                "threads": len(self._threads),
+                **self._totals,
+            }
+
+
+_history_manager = HistoryManager()
+
+
+def get_history_manager() -> HistoryManager:
+    """Restituisce il gestore della history condiviso dal processo"""
+    return _history_manager
@@ -0,0 +1,142 @@
+"""
+Model registry - LLM client, tool binding and system prompt reused across steps
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+from ..tools import TOOLS
+from ..utils.logging_config import setup_logging
+from ..utils.prompts import create_system_prompt, template_mtimes
+
+logger = setup_logging(__name__)
+
+# Modelli con tool binding tenuti in memoria (uno per configurazione)
+MAX_MODELS = 8
+
+
+def openai_base_url() -> Optional[str]:
+    """Base URL delle API OpenAI letto da ChatOpenAI (None: api.openai.com)"""
+    return os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE")
+
+
+class ModelRegistry:
+    """
+    Oggetti costruiti una volta e riusati a ogni step ReAct.
+
+    - Modello con i tool collegati, per (factory, modello, base URL): il
+      ChatOpenAI resta lo stesso, con il suo client OpenAI e il connection
+      pool, e gli schemi JSON dei tool vengono derivati una sola volta
+    - System prompt, per mtime dei template: i file vengono riletti solo
+      quando cambiano
+
+    Registra anche il tempo speso da ogni step per preparare modello e
+    prompt (overhead prima della chiamata al modello).
+    """
+
+    def __init__(
+        self, tools: Sequence[Any] = TOOLS, max_models: int = MAX_MODELS
+    ) -> None:
+        self.tools = list(tools)
+        self.max_models = max_models
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._prompt: Optional[Tuple[Tuple[Optional[int], Optional[int]], str]] = None
+        self.model_builds = 0
+        self.model_hits = 0
+        self.prompt_builds = 0
+        self.prompt_hits = 0
+        self.steps = 0
+        self._overhead_total = 0.0
+        self._overhead_last = 0.0
+
+    def bound_model(self, factory: Callable[..., Any], model: str) -> Any:
+        """
+        Modello con i tool collegati (``bind_tools``) per la configurazione
+        effettiva; costruito al primo utilizzo.
+
+        Args:
+            factory: Classe del modello (ChatOpenAI)
+            model: Nome del modello
+        """
+        key = (factory, model, openai_base_url())
+        with self._lock:
+            bound = self._models.get(key)
+            if bound is not None:
+                self._models.move_to_end(key)
+                self.model_hits += 1
+                return bound
+
+            # temperature=0.1: risposte deterministiche (poco creative)
+            # streaming=True: token inviati man mano da /chat/stream (astream_chat)
+            llm = factory(model=model, temperature=0.1, streaming=True)
+            # bind_tools() è CRUCIALE per ReAct pattern: il modello vede i tool
+            # e decide autonomamente quali chiamare
+            bound = llm.bind_tools(self.tools)
+
+            self._models[key] = bound
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+            self.model_builds += 1
+            logger.info(f"Modello {model} inizializzato con {len(self.tools)} tools")
+            return bound
+
+    def system_prompt(self) -> str:
+        """System prompt corrente, ricostruito solo se un template è cambiato"""
+        mtimes = template_mtimes()
+        with self._lock:
+            if self._prompt is not None and self._prompt[0] == mtimes:
+                self.prompt_hits += 1
+                return self._prompt[1]
+
+            prompt = create_system_prompt()
+            self._prompt = (mtimes, prompt)
+            self.prompt_builds += 1
+            return prompt
+
+    def record_step(self, overhead: float) -> None:
+        """Registra i secondi spesi da uno step prima di chiamare il modello"""
+        with self._lock:
+            self.steps += 1
+            self._overhead_total += overhead
+            self._overhead_last = overhead
+
+    def clear(self) -> None:
+        """Svuota il registry e azzera le statistiche"""
+        with self._lock:
+            self._models.clear()
+            self._prompt = None
+            self.model_builds = self.model_hits = 0
+            self.prompt_builds = self.prompt_hits = 0
+            self.steps = 0
+            self._overhead_total = self._overhead_last = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Modelli in memoria, hit/build e overhead medio per step"""
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "model_builds": self.model_builds,
+                "model_hits": self.model_hits,
+                "prompt_builds": self.prompt_builds,
+                "prompt_hits": self.prompt_hits,
+                "steps": self.steps,
+                "step_overhead_ms": {
+                    "avg": (
+                        round(self._overhead_total / self.steps * 1000, 3)
+                        if self.steps
+                        else 0.0
+                    ),
+                    "last": round(self._overhead_last * 1000, 3),
+                },
+            }
+
+
+_model_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Restituisce il registry dei modelli condiviso dal processo"""
+    return _model_registry
@@ -21,6 +21,47 @@ def setup_test_env():
     os.environ["ENVIRONMENT"] = "test"
 
 
+@pytest.fixture(autouse=True)
+def clear_processed_cache():
+    """Process-wide caches, indexes, stats, model registry and history metrics"""
+    from src.veronica_wordpress_chatbot.wordpress.fanout import get_fanout_stats
+    from src.veronica_wordpress_chatbot.wordpress.memo import get_processed_cache
+    from src.veronica_wordpress_chatbot.wordpress.query_rewrite import get_query_stats
+    from src.veronica_wordpress_chatbot.wordpress.search_index import get_search_index
+    from src.veronica_wordpress_chatbot.wordpress.semantic_index import (
+        get_semantic_index,
+    )
+    from src.veronica_wordpress_chatbot.wordpress.taxonomy import get_taxonomy_cache
+    from src.veronica_wordpress_chatbot.workflow.history import get_history_manager
+    from src.veronica_wordpress_chatbot.workflow.registry import get_model_registry
+
+    caches = (
+        get_processed_cache(),
+        get_taxonomy_cache(),
+        get_search_index(),
+        get_semantic_index(),
+        get_query_stats(),
+        get_fanout_stats(),
+        get_model_registry(),
+        get_history_manager(),
+    )
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_path(tmp_path):
+    """Database SQLite temporaneo per ogni test (se CHECKPOINT_BACKEND=sqlite)"""
+    path = str(tmp_path / "checkpoints.sqlite3")
+    with patch(
+        "src.veronica_wordpress_chatbot.workflow.graph.CHECKPOINT_PATH", path
+    ), patch("src.veronica_wordpress_chatbot.chatbot.CHECKPOINT_PATH", path):
+        yield path
+
+
 # ========================================
 # WORDPRESS CLIENT MOCKS
 # ========================================
@@ -58,6 +99,66 @@ def mock_wordpress_project() -> Dict[str, Any]:
     }
 
 
+@pytest.fixture
+def mock_project_collection() -> List[Dict[str, Any]]:
+    """Progetti con project-category e un campo fuori dalla proiezione"""
+    return [
+        {
+            "id": 20,
+            "date": "2024-02-01T10:00:00",
+            "modified": "2024-02-01T10:00:00",
+            "title": {"rendered": "Agente RAG"},
+            "content": {"rendered": "<p>LangGraph</p>"},
+            "link": "https://test.example.com/project/rag",
+            "project-category": [7],
+            "acf": {"project_repository": "https://github.com/test/rag"},
+            "yoast_head_json": {"title": "Agente RAG - Veronica Schembri"},
+        },
+        {
+            "id": 21,
+            "date": "2024-01-01T10:00:00",
+            "modified": "2024-01-01T10:00:00",
+            "title": {"rendered": "Sito vetrina"},
+            "content": {"rendered": "<p>WordPress</p>"},
+            "link": "https://test.example.com/project/sito",
+            "project-category": [8],
+        },
+    ]
+
+
+@pytest.fixture
+def fake_wordpress_get():
+    """
+    Factory di ``session.get`` per un WordPress finto che, come la REST API,
+    restituisce solo i campi top-level richiesti con ``_fields``
+    """
+
+    def factory(collection: List[Dict[str, Any]]):
+        def get(url, params=None, **kwargs):
+            fields = {
+                field.split(".")[0]
+                for field in str((params or {}).get("_fields", "")).split(",")
+                if field
+            }
+            items = [
+                {
+                    key: value
+                    for key, value in item.items()
+                    if not fields or key in fields
+                }
+                for item in collection
+            ]
+            response = Mock(
+                status_code=200, headers={"X-WP-TotalPages": "1"}, content=b"[]"
+            )
+            response.json.return_value = items
+            return response
+
+        return get
+
+    return factory
+
+
 @pytest.fixture
 def mock_wordpress_certification() -> Dict[str, Any]:
     """Mock WordPress certification data"""
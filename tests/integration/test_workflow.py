@@ -17,6 +17,7 @@ from src.veronica_wordpress_chatbot.workflow.graph import (
     should_continue,
     call_model
 )
+from src.veronica_wordpress_chatbot.workflow.registry import get_model_registry
 from src.veronica_wordpress_chatbot.models import State, InputState
 from src.veronica_wordpress_chatbot.config import Configuration
 
@@ -255,6 +256,46 @@ class TestCallModelFunction:
         assert call_args.kwargs['model'] == "gpt-4"
 
 
+class TestModelRegistry:
+    """Test reuse of the LLM client, tool binding and system prompt"""
+
+    @patch('src.veronica_wordpress_chatbot.workflow.graph.ChatOpenAI')
+    def test_model_built_once_across_steps(self, mock_chat_openai):
+        """Test that ChatOpenAI and bind_tools run once per configuration"""
+        mock_llm_instance = Mock()
+        mock_llm_with_tools = Mock()
+        mock_llm_with_tools.invoke.return_value = AIMessage(content="Test")
+        mock_llm_instance.bind_tools.return_value = mock_llm_with_tools
+        mock_chat_openai.return_value = mock_llm_instance
+
+        state = {"messages": [HumanMessage(content="Hello")]}
+        for _ in range(3):
+            call_model(state, {"configurable": {}})
+        call_model(state, {"configurable": {"model": "gpt-4"}})
+
+        assert mock_chat_openai.call_count == 2
+        assert mock_llm_instance.bind_tools.call_count == 2
+        stats = get_model_registry().stats()
+        assert stats["model_builds"] == 2
+        assert stats["model_hits"] == 2
+        assert stats["steps"] == 4
+
+    @patch('src.veronica_wordpress_chatbot.workflow.registry.create_system_prompt')
+    @patch('src.veronica_wordpress_chatbot.workflow.registry.template_mtimes')
+    def test_system_prompt_reloaded_when_templates_change(
+        self, mock_mtimes, mock_create_prompt
+    ):
+        """Test that templates are re-read only after they change on disk"""
+        mock_mtimes.side_effect = [(1, 1), (1, 1), (1, 2)]
+        mock_create_prompt.side_effect = ["prompt v1", "prompt v2"]
+        registry = get_model_registry()
+
+        assert registry.system_prompt() == "prompt v1"
+        assert registry.system_prompt() == "prompt v1"
+        assert registry.system_prompt() == "prompt v2"
+        assert mock_create_prompt.call_count == 2
+
+
 class TestWorkflowExecution:
     """Test end-to-end workflow execution"""
 
@@ -360,6 +401,149 @@ class TestWorkflowExecution:
             assert len(result2["messages"]) > len(result1["messages"])
 
 
+class TestAsyncWorkflowExecution:
+    """Test the non-blocking ainvoke path"""
+
+    @patch('src.veronica_wordpress_chatbot.workflow.graph.ChatOpenAI')
+    async def test_ainvoke_uses_async_model(self, mock_chat_openai):
+        """Test that graph.ainvoke awaits the model instead of blocking"""
+        from unittest.mock import AsyncMock
+
+        mock_llm_instance = Mock()
+        mock_llm_with_tools = Mock()
+        mock_llm_with_tools.ainvoke = AsyncMock(side_effect=[
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get_contact_info", "args": {}, "id": "call_1"}]
+            ),
+            AIMessage(content="Ecco i miei contatti..."),
+        ])
+        mock_llm_instance.bind_tools.return_value = mock_llm_with_tools
+        mock_chat_openai.return_value = mock_llm_instance
+
+        graph = create_graph()
+        result = await graph.ainvoke(
+            {"messages": [HumanMessage(content="Come posso contattarti?")]},
+            {"configurable": {"thread_id": "test-async"}}
+        )
+
+        assert result["messages"][-1].content == "Ecco i miei contatti..."
+        assert mock_llm_with_tools.ainvoke.await_count == 2
+        mock_llm_with_tools.invoke.assert_not_called()
+
+    @patch('src.veronica_wordpress_chatbot.workflow.graph.ChatOpenAI')
+    async def test_concurrent_chats_overlap(self, mock_chat_openai):
+        """Test that concurrent conversations share the event loop"""
+        import asyncio
+        import time
+
+        async def slow_model(messages):
+            await asyncio.sleep(0.2)
+            return AIMessage(content="Risposta")
+
+        mock_llm_instance = Mock()
+        mock_llm_with_tools = Mock()
+        mock_llm_with_tools.ainvoke = slow_model
+        mock_llm_instance.bind_tools.return_value = mock_llm_with_tools
+        mock_chat_openai.return_value = mock_llm_instance
+
+        graph = create_graph()
+        started = time.monotonic()
+        await asyncio.gather(*(
+            graph.ainvoke(
+                {"messages": [HumanMessage(content="Ciao!")]},
+                {"configurable": {"thread_id": f"test-concurrent-{i}"}}
+            )
+            for i in range(5)
+        ))
+
+        # Cinque chat da 0.2 s in parallelo, non in serie (1 s)
+        assert time.monotonic() - started < 0.6
+
+
+class TestHistoryManagement:
+    """Test the rolling summary on a real conversation thread"""
+
+    @patch('src.veronica_wordpress_chatbot.workflow.graph.ChatOpenAI')
+    def test_summary_replaces_old_turns(self, mock_chat_openai):
+        """Test that old turns leave the state and reach the model as a summary"""
+        from src.veronica_wordpress_chatbot.workflow.history import HistoryManager
+
+        mock_llm_instance = Mock()
+        mock_llm_with_tools = Mock()
+        # Un nuovo messaggio (con il suo id) per ogni risposta
+        mock_llm_with_tools.invoke.side_effect = (
+            lambda messages: AIMessage(content="Risposta")
+        )
+        mock_llm_instance.bind_tools.return_value = mock_llm_with_tools
+        mock_chat_openai.return_value = mock_llm_instance
+
+        graph = create_graph()
+        config = {"configurable": {"thread_id": "test-summary"}}
+        for question in ("Chi sei?", "Cosa scrivi?", "Ultimo articolo?"):
+            graph.invoke({"messages": [HumanMessage(content=question)]}, config)
+
+        manager = HistoryManager(
+            keep_turns=1, summarizer=lambda prompt: "Domande su Veronica."
+        )
+        assert manager.summarize_thread(graph, config) is True
+
+        state = graph.get_state(config).values
+        assert state["summary"] == "Domande su Veronica."
+        assert [m.content for m in state["messages"]] == [
+            "Ultimo articolo?", "Risposta"
+        ]
+
+        graph.invoke({"messages": [HumanMessage(content="E i progetti?")]}, config)
+
+        sent = mock_llm_with_tools.invoke.call_args[0][0]
+        assert isinstance(sent[1], SystemMessage)
+        assert "Domande su Veronica." in sent[1].content
+        assert sent[2].content == "Ultimo articolo?"
+
+
+class TestStreamingChat:
+    """Test the event stream behind /chat/stream"""
+
+    @patch('src.veronica_wordpress_chatbot.workflow.graph.ChatOpenAI')
+    async def test_astream_chat_emits_tool_progress_and_answer(self, mock_chat_openai):
+        """Test tool-progress events followed by the final answer"""
+        from unittest.mock import AsyncMock
+        from src.veronica_wordpress_chatbot.chatbot import VeronicaChatbot
+
+        mock_llm_instance = Mock()
+        mock_llm_with_tools = Mock()
+        mock_llm_with_tools.ainvoke = AsyncMock(side_effect=[
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get_contact_info", "args": {}, "id": "call_1"}]
+            ),
+            AIMessage(content="Ecco i miei contatti..."),
+        ])
+        mock_llm_instance.bind_tools.return_value = mock_llm_with_tools
+        mock_chat_openai.return_value = mock_llm_instance
+
+        chatbot = VeronicaChatbot()
+        stream = chatbot.astream_chat("Come posso contattarti?", "test-sse")
+        events = [event async for event in stream]
+
+        assert events[0] == {
+            "event": "tool",
+            "data": {
+                "tool": "get_contact_info",
+                "message": "Sto recuperando i contatti…",
+            },
+        }
+        assert events[-1] == {
+            "event": "done",
+            "data": {"response": "Ecco i miei contatti...", "thread_id": "test-sse"},
+        }
+
+        # La conversazione resta nel thread come con chat()
+        state = chatbot.graph.get_state({"configurable": {"thread_id": "test-sse"}})
+        assert state.values["messages"][-1].content == "Ecco i miei contatti..."
+
+
 class TestReActPattern:
     """Test ReAct (Reason-Act-Observe) pattern implementation"""
 
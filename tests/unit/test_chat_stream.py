@@ -0,0 +1,73 @@
+"""
+Unit tests for the streaming chat endpoint
+
+These tests demonstrate:
+- Server-Sent Events framing of the chatbot event stream
+- Same request validation as /chat
+"""
+
+from unittest.mock import patch
+
+CHAT_MODULE = "src.veronica_wordpress_chatbot.api.endpoints.chat"
+
+
+class FakeChatbot:
+    """Chatbot che produce una sequenza fissa di eventi"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def astream_chat(self, message, thread_id="default"):
+        self.calls.append((message, thread_id))
+        yield {
+            "event": "tool",
+            "data": {
+                "tool": "get_portfolio_projects",
+                "message": "Sto cercando nei progetti…",
+            },
+        }
+        yield {"event": "token", "data": {"content": "Ecco "}}
+        yield {"event": "token", "data": {"content": "i progetti"}}
+        yield {
+            "event": "done",
+            "data": {"response": "Ecco i progetti", "thread_id": thread_id},
+        }
+
+
+class TestChatStreamEndpoint:
+    """Test POST /chat/stream"""
+
+    def test_streams_server_sent_events(self, test_client):
+        """Test that chatbot events are sent as SSE in order"""
+        chatbot = FakeChatbot()
+
+        with patch(f"{CHAT_MODULE}.get_chatbot", return_value=chatbot):
+            response = test_client.post(
+                "/chat/stream",
+                json={"message": "Che progetti hai?", "thread_id": "user_123"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.split("\n\n")[:2] == [
+            'event: tool\ndata: {"tool": "get_portfolio_projects", '
+            '"message": "Sto cercando nei progetti…"}',
+            'event: token\ndata: {"content": "Ecco "}',
+        ]
+        assert response.text.endswith(
+            'event: done\ndata: {"response": "Ecco i progetti", '
+            '"thread_id": "user_123"}\n\n'
+        )
+        assert chatbot.calls == [("Che progetti hai?", "user_123")]
+
+    def test_rejects_malicious_message(self, test_client):
+        """Test that the /chat validation also applies to the stream"""
+        chatbot = FakeChatbot()
+
+        with patch(f"{CHAT_MODULE}.get_chatbot", return_value=chatbot):
+            response = test_client.post(
+                "/chat/stream", json={"message": "<script>alert('XSS')</script>"}
+            )
+
+        assert response.status_code == 422
+        assert chatbot.calls == []
@@ -0,0 +1,135 @@
+"""
+Unit tests for the SQLite checkpointer
+
+These tests demonstrate:
+- Checkpoints and pending writes round-trip through SQLite
+- Only the last checkpoints of each thread are kept
+- Idle threads expire after the TTL
+- Large checkpoints are stored compressed
+"""
+
+import time
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.veronica_wordpress_chatbot.workflow import (
+    SqliteCheckpointer,
+    create_checkpointer,
+)
+
+
+def put_turn(checkpointer, thread_id, config=None, messages=()):
+    """Salva un checkpoint come farebbe LangGraph a fine step"""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": list(messages)}
+    config = config or {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    return checkpointer.put(config, checkpoint, {"source": "loop", "step": 1}, {})
+
+
+@pytest.fixture
+def checkpointer(tmp_path):
+    return SqliteCheckpointer(str(tmp_path / "checkpoints.sqlite3"), keep=3)
+
+
+class TestSqliteCheckpointer:
+    """Test the LangGraph saver contract"""
+
+    def test_put_and_get_latest(self, checkpointer):
+        """Test that get_tuple returns the last checkpoint of the thread"""
+        first = put_turn(checkpointer, "t1", messages=["ciao"])
+        second = put_turn(checkpointer, "t1", config=first, messages=["ciao", "ok"])
+
+        saved = checkpointer.get_tuple({"configurable": {"thread_id": "t1"}})
+
+        assert saved.config == second
+        assert saved.checkpoint["channel_values"]["messages"] == ["ciao", "ok"]
+        assert saved.metadata["source"] == "loop"
+        assert saved.parent_config == first
+        assert checkpointer.get_tuple({"configurable": {"thread_id": "t2"}}) is None
+
+    def test_pending_writes(self, checkpointer):
+        """Test that writes are returned with their checkpoint"""
+        config = put_turn(checkpointer, "t1")
+        checkpointer.put_writes(config, [("messages", ["risposta"])], "task-1")
+
+        saved = checkpointer.get_tuple(config)
+
+        assert saved.pending_writes == [("task-1", "messages", ["risposta"])]
+
+    def test_keeps_last_checkpoints_per_thread(self, checkpointer):
+        """Test that older checkpoints are pruned on put"""
+        config = None
+        for _ in range(5):
+            config = put_turn(checkpointer, "t1", config=config)
+        put_turn(checkpointer, "t2")
+
+        history = list(checkpointer.list({"configurable": {"thread_id": "t1"}}))
+
+        assert len(history) == 3
+        assert history[0].config == config
+        assert checkpointer.stats()["pruned"] == 2
+        assert checkpointer.stats()["checkpoints"] == 4
+
+    def test_compresses_large_checkpoints(self, checkpointer):
+        """Test that large checkpoints are compressed and read back intact"""
+        messages = [f"messaggio {i}: " + "lorem ipsum " * 20 for i in range(20)]
+        config = put_turn(checkpointer, "t1", messages=messages)
+
+        sql = "SELECT type, length(checkpoint) FROM checkpoints"
+        stored = checkpointer._connection().execute(sql).fetchone()
+
+        assert stored[0].endswith("+zlib")
+        assert stored[1] < len("".join(messages))
+        saved = checkpointer.get_tuple(config)
+        assert saved.checkpoint["channel_values"]["messages"] == messages
+
+    def test_vacuum_expires_idle_threads(self, checkpointer):
+        """Test that threads idle for longer than the TTL are deleted"""
+        put_turn(checkpointer, "old")
+        put_turn(checkpointer, "new")
+        with checkpointer._connection() as conn:
+            conn.execute(
+                "UPDATE threads SET updated = ? WHERE thread_id = 'old'",
+                (time.time() - checkpointer.ttl - 1,),
+            )
+
+        assert checkpointer.vacuum()["expired"] == 1
+        assert checkpointer.get_tuple({"configurable": {"thread_id": "old"}}) is None
+        assert checkpointer.get_tuple({"configurable": {"thread_id": "new"}})
+
+    async def test_async_round_trip(self, checkpointer):
+        """Test the async methods used by graph.ainvoke"""
+        checkpoint = empty_checkpoint()
+        config = await checkpointer.aput(
+            {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}},
+            checkpoint,
+            {"step": 1},
+            {},
+        )
+
+        saved = await checkpointer.aget_tuple(config)
+        history = [item async for item in checkpointer.alist(config)]
+
+        assert saved.checkpoint["id"] == checkpoint["id"]
+        assert len(history) == 1
+
+
+class TestCreateCheckpointer:
+    """Test the backend selection used by create_graph"""
+
+    def test_memory_backend_is_not_persisted(self, tmp_path):
+        checkpointer = create_checkpointer("memory", str(tmp_path / "unused.sqlite3"))
+        assert isinstance(checkpointer, MemorySaver)
+        assert not (tmp_path / "unused.sqlite3").exists()
+
+    def test_sqlite_is_shared_per_path(self, tmp_path):
+        path = str(tmp_path / "shared.sqlite3")
+        assert create_checkpointer("sqlite", path) is create_checkpointer(
+            "sqlite", path
+        )
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            create_checkpointer("redis")
@@ -0,0 +1,205 @@
+"""
+Unit tests for conversation history management
+
+These tests demonstrate:
+- Tool outputs of previous turns are compacted, current ones are kept
+- Oldest turns are dropped to stay within the token budget
+- Older turns are folded into the rolling summary and removed from the state
+- Summaries run in batches (hysteresis) and never overwrite a newer turn
+- Per-thread metrics on tokens saved
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    RemoveMessage,
+    ToolMessage,
+)
+
+from src.veronica_wordpress_chatbot.workflow import HistoryManager, trim_history
+from src.veronica_wordpress_chatbot.workflow.history import (
+    estimate_tokens,
+    split_turns,
+)
+
+POSTS_JSON = '{"posts": [' + ", ".join(['{"title": "Articolo"}'] * 200) + "]}"
+
+
+def turn(index, tool_output=None):
+    """Un turno: domanda, eventuale tool call con output, risposta"""
+    messages = [HumanMessage(content=f"Domanda {index}", id=f"h{index}")]
+    if tool_output is not None:
+        messages += [
+            AIMessage(
+                content="",
+                id=f"c{index}",
+                tool_calls=[
+                    {"name": "search_blog_posts", "args": {}, "id": f"call{index}"}
+                ],
+            ),
+            ToolMessage(
+                content=tool_output, tool_call_id=f"call{index}", id=f"t{index}"
+            ),
+        ]
+    messages.append(AIMessage(content=f"Risposta {index}", id=f"a{index}"))
+    return messages
+
+
+def snapshot(messages, checkpoint_id="cp1", next=(), **values):
+    """State del thread come restituito da graph.get_state"""
+    return SimpleNamespace(
+        next=next,
+        values={"messages": messages, **values},
+        config={"configurable": {"thread_id": "t1", "checkpoint_id": checkpoint_id}},
+    )
+
+
+class TestTrimHistory:
+    """Test the history sent to the model at each step"""
+
+    def test_split_turns(self):
+        """Test that each turn starts with a user message"""
+        messages = turn(1, POSTS_JSON) + turn(2)
+
+        assert [len(t) for t in split_turns(messages)] == [4, 2]
+
+    def test_compacts_tool_outputs_of_previous_turns(self):
+        """Test that used tool outputs shrink and current ones stay complete"""
+        messages = turn(1, POSTS_JSON) + turn(2, POSTS_JSON)
+
+        trimmed = trim_history(messages, budget=100_000)
+
+        assert trimmed.compacted == 1
+        assert len(trimmed.messages) == len(messages)
+        assert "caratteri omessi" in trimmed.messages[2].content
+        assert trimmed.messages[2].tool_call_id == "call1"
+        assert trimmed.messages[6].content == POSTS_JSON
+        assert trimmed.tokens_sent < trimmed.tokens_full
+        # Lo state originale non viene modificato
+        assert messages[2].content == POSTS_JSON
+
+    def test_drops_oldest_turns_over_budget(self):
+        """Test that whole turns are dropped, oldest first"""
+        messages = [m for i in range(10) for m in turn(i)]
+        budget = estimate_tokens(turn(0)) * 3
+
+        trimmed = trim_history(messages, budget=budget)
+
+        assert trimmed.dropped_turns == 7
+        assert trimmed.messages[0].content == "Domanda 7"
+        assert trimmed.tokens_sent <= budget
+
+    def test_current_turn_always_sent(self):
+        """Test that the current turn is kept even over budget"""
+        messages = turn(1) + turn(2, POSTS_JSON)
+
+        trimmed = trim_history(messages, budget=10)
+
+        assert trimmed.dropped_turns == 1
+        assert trimmed.messages[-2].content == POSTS_JSON
+
+
+class TestHistoryManager:
+    """Test the rolling summary and the per-thread metrics"""
+
+    def test_prepare_records_tokens_saved(self):
+        manager = HistoryManager(budget=100_000)
+
+        manager.prepare("t1", turn(1, POSTS_JSON) + turn(2))
+
+        stats = manager.thread_stats("t1")
+        assert stats["steps"] == 1
+        assert stats["compacted_tool_outputs"] == 1
+        assert stats["tokens_saved"] == stats["tokens_full"] - stats["tokens_sent"] > 0
+        assert manager.stats()["tokens_saved"] == stats["tokens_saved"]
+
+    def test_summarize_folds_old_turns(self):
+        """Test that turns beyond keep_turns become the summary"""
+        summarizer = Mock(return_value="L'utente ha chiesto degli articoli.")
+        manager = HistoryManager(keep_turns=1, summarizer=summarizer)
+        messages = turn(1, POSTS_JSON) + turn(2) + turn(3)
+        graph = Mock()
+        graph.get_state.return_value = snapshot(messages, summary="Saluti.")
+        config = {"configurable": {"thread_id": "t1"}}
+
+        assert manager.summarize_thread(graph, config) is True
+
+        prompt = summarizer.call_args[0][0]
+        assert "Saluti." in prompt
+        assert "Utente: Domanda 1" in prompt
+        assert "Utente: Domanda 2" in prompt
+        assert POSTS_JSON not in prompt
+
+        update = graph.update_state.call_args[0][1]
+        assert update["summary"] == "L'utente ha chiesto degli articoli."
+        assert [m.id for m in update["messages"]] == "h1 c1 t1 a1 h2 a2".split()
+        assert all(isinstance(m, RemoveMessage) for m in update["messages"])
+        assert manager.thread_stats("t1")["summarized_messages"] == 6
+
+    def test_summarize_skips_short_or_running_threads(self):
+        """Test that nothing happens within keep_turns or during a run"""
+        summarizer = Mock()
+        manager = HistoryManager(keep_turns=2, summarizer=summarizer)
+        graph = Mock()
+        config = {"configurable": {"thread_id": "t1"}}
+
+        graph.get_state.return_value = snapshot(turn(1) + turn(2))
+        assert manager.summarize_thread(graph, config) is False
+
+        graph.get_state.return_value = snapshot(
+            [m for i in range(5) for m in turn(i)], next=("tools",)
+        )
+        assert manager.summarize_thread(graph, config) is False
+
+        summarizer.assert_not_called()
+        graph.update_state.assert_not_called()
+
+    def test_summarize_in_batches(self):
+        """Test that summaries wait for 2 * keep_turns turns or the budget"""
+        summarizer = Mock(return_value="Riassunto.")
+        manager = HistoryManager(keep_turns=2, summarizer=summarizer)
+        graph = Mock()
+        config = {"configurable": {"thread_id": "t1"}}
+
+        # Oltre keep_turns ma entro 2 * keep_turns e il budget: nessun riassunto
+        graph.get_state.return_value = snapshot([m for i in range(4) for m in turn(i)])
+        assert manager.summarize_thread(graph, config) is False
+        summarizer.assert_not_called()
+
+        # Oltre 2 * keep_turns: restano solo gli ultimi keep_turns turni
+        graph.get_state.return_value = snapshot([m for i in range(5) for m in turn(i)])
+        assert manager.summarize_thread(graph, config) is True
+        update = graph.update_state.call_args[0][1]
+        assert [m.id for m in update["messages"]] == "h0 a0 h1 a1 h2 a2".split()
+
+        # Oltre il budget anche con pochi turni
+        manager = HistoryManager(budget=10, keep_turns=2, summarizer=summarizer)
+        graph.get_state.return_value = snapshot([m for i in range(3) for m in turn(i)])
+        assert manager.summarize_thread(graph, config) is True
+
+    def test_summarize_skips_when_thread_changed(self):
+        """Test that a turn written during the summary is never overwritten"""
+        manager = HistoryManager(keep_turns=1, summarizer=Mock(return_value="R."))
+        messages = turn(1) + turn(2) + turn(3)
+        graph = Mock()
+        graph.get_state.side_effect = [
+            snapshot(messages, checkpoint_id="cp1"),
+            snapshot(messages + turn(4), checkpoint_id="cp2"),
+        ]
+        config = {"configurable": {"thread_id": "t1"}}
+
+        assert manager.summarize_thread(graph, config) is False
+
+        graph.update_state.assert_not_called()
+        stats = manager.thread_stats("t1")
+        assert stats["summaries"] == 0
+        assert stats["summaries_skipped"] == 1
+
+    def test_schedule_disabled(self):
+        graph = Mock()
+        HistoryManager(enabled=False).schedule_summary(graph, {"configurable": {}})
+
+        graph.get_state.assert_not_called()
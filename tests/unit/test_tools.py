@@ -19,6 +19,9 @@ from src.veronica_wordpress_chatbot.tools import (
     get_certifications,
     get_work_experience,
     get_contact_info,
+    get_tools_and_stack,
+    search_all_content,
+    semantic_search,
     TOOLS
 )
 
@@ -37,6 +40,7 @@ class TestToolRegistry:
             "get_books_and_reading",
             "get_tools_and_stack",
             "search_all_content",
+            "semantic_search",
             "get_contact_info",
         ]
 
@@ -89,6 +93,24 @@ class TestBlogTools:
         # Verify WordPress client was called correctly
         mock_client.get_posts.assert_called_once_with({"per_page": 5, "search": "AI"})
 
+    @patch('src.veronica_wordpress_chatbot.tools.blog_tools.get_wordpress_client')
+    def test_search_blog_posts_rewrites_sentences(
+        self, mock_client_class, mock_wordpress_post
+    ):
+        """Test that a full question becomes a single keyword search"""
+        mock_client = Mock()
+        mock_client.get_posts.return_value = [mock_wordpress_post]
+        mock_client_class.return_value = mock_client
+
+        result = search_blog_posts.invoke(
+            {"query": "Hai scritto qualcosa sui modelli linguistici?", "limit": 5}
+        )
+
+        parsed = json.loads(result)
+
+        assert parsed["search_query"] == "Hai scritto qualcosa sui modelli linguistici?"
+        mock_client.get_posts.assert_called_once_with({"per_page": 5, "search": "LLM"})
+
     @patch('src.veronica_wordpress_chatbot.tools.blog_tools.get_wordpress_client')
     def test_search_blog_posts_without_query(self, mock_client_class, mock_wordpress_post):
         """Test getting latest posts without search query"""
@@ -197,6 +219,40 @@ class TestPortfolioTools:
         mock_client.get_projects.assert_called_once()
 
 
+class TestContentTools:
+    """Test tools and stack tool"""
+
+    @patch('src.veronica_wordpress_chatbot.tools.content_tools.get_wordpress_client')
+    def test_get_tools_and_stack_pushes_category_filter(self, mock_client_class):
+        """Test that the category is sent to WordPress as term IDs"""
+        mock_client = Mock()
+        mock_client.get_terms.return_value = []
+        mock_client.get_stacks.return_value = [
+            {
+                "id": 5,
+                "title": {"rendered": "Docker"},
+                "content": {"rendered": "<p>Container</p>"},
+                "date": "2024-01-01T10:00:00",
+                "stack-category": [92],
+            }
+        ]
+        mock_client_class.return_value = mock_client
+
+        result = get_tools_and_stack.invoke({"category": "devops", "limit": 5})
+
+        parsed = json.loads(result)
+
+        # Nessun termine tool-category corrisponde: i tools non vengono richiesti
+        mock_client.get_tools.assert_not_called()
+        mock_client.get_stacks.assert_called_once_with(
+            {"per_page": 5, "stack-category": "92"}
+        )
+        assert parsed["total_professional"] == 1
+        assert parsed["data"]["professional_stack"][0]["categories"] == [
+            "MLOps & DevOps"
+        ]
+
+
 class TestProfileTools:
     """Test profile-related tools"""
 
@@ -248,6 +304,61 @@ class TestProfileTools:
 class TestSearchTools:
     """Test search and utility tools"""
 
+    @patch('src.veronica_wordpress_chatbot.tools.search_tools.get_wordpress_client')
+    def test_search_all_content_ranked_across_types(
+        self, mock_client_class, mock_wordpress_post, mock_wordpress_project
+    ):
+        """Test that the local index ranks all content types together"""
+        collections = {
+            "posts": [mock_wordpress_post],
+            "projects": [mock_wordpress_project],
+        }
+        mock_client = Mock()
+        mock_client.iter_collection.side_effect = (
+            lambda endpoint, *args, **kwargs: iter(collections.get(endpoint, []))
+        )
+        mock_client_class.return_value = mock_client
+
+        result = search_all_content.invoke({"query": "AI chatbot"})
+
+        parsed = json.loads(result)
+
+        assert parsed["total"] == 2
+        assert [item["type"] for item in parsed["results"]] == ["project", "article"]
+        mock_client.get_posts.assert_not_called()
+
+    @patch('src.veronica_wordpress_chatbot.tools.search_tools.get_semantic_index')
+    @patch('src.veronica_wordpress_chatbot.tools.search_tools.get_wordpress_client')
+    def test_semantic_search_uses_vector_index(
+        self, mock_client_class, mock_semantic_index,
+        mock_wordpress_post, mock_wordpress_project
+    ):
+        """Test that semantic_search answers from the in-memory vector matrix"""
+        pytest.importorskip("numpy")
+        from src.veronica_wordpress_chatbot.wordpress import SemanticIndex
+
+        collections = {
+            "posts": [mock_wordpress_post],
+            "projects": [mock_wordpress_project],
+        }
+        mock_client = Mock()
+        mock_client.iter_collection.side_effect = (
+            lambda endpoint, *args, **kwargs: iter(collections.get(endpoint, []))
+        )
+        mock_client_class.return_value = mock_client
+        index = SemanticIndex(path="")
+        mock_semantic_index.return_value = index
+
+        result = semantic_search.invoke({"query": "chatbot", "limit": 1})
+
+        parsed = json.loads(result)
+
+        assert parsed["total"] == 1
+        assert parsed["results"][0]["type"] in ("article", "project")
+        assert index.stats()["documents"] == 2
+        assert index.stats()["searches"] == 1
+        mock_client.get_posts.assert_not_called()
+
     def test_get_contact_info_returns_json(self):
         """Test that get_contact_info returns proper JSON"""
         result = get_contact_info.invoke({})
@@ -314,6 +425,41 @@ class TestContentProcessor:
         assert "    " not in cleaned
         assert cleaned == "Test content with spaces"
 
+    def test_clean_html_decodes_all_entities(self):
+        """Test that named and numeric entities are decoded"""
+        from src.veronica_wordpress_chatbot.wordpress.processor import ContentProcessor
+
+        html = "<p>L&#8217;arte &egrave; bella&hellip; &#x2014; R&amp;D</p>"
+        cleaned = ContentProcessor.clean_html(html)
+
+        assert cleaned == "L’arte è bella… — R&D"
+
+    def test_clean_html_drops_scripts_and_comments(self):
+        """Test that script/style bodies and Gutenberg comments are removed"""
+        from src.veronica_wordpress_chatbot.wordpress.processor import ContentProcessor
+
+        html = (
+            "<!-- wp:paragraph --><p>Ciao</p><!-- /wp:paragraph -->"
+            "<script>if (a < b) { track(); }</script><style>p { color: red }</style>"
+            "<p>mondo</p>"
+        )
+
+        assert ContentProcessor.clean_html(html) == "Ciao mondo"
+
+    def test_clean_html_max_length_and_paragraphs(self):
+        """Test truncation with ellipsis and optional paragraph breaks"""
+        from src.veronica_wordpress_chatbot.wordpress.processor import ContentProcessor
+
+        html = "<h2>Titolo</h2><p>Primo paragrafo<br>a capo</p><p>Secondo</p>"
+
+        assert ContentProcessor.clean_html(html, 10) == "Titolo Pri..."
+        assert ContentProcessor.clean_html(html, 100) == (
+            "Titolo Primo paragrafo a capo Secondo"
+        )
+        assert ContentProcessor.clean_html(html, paragraphs=True) == (
+            "Titolo\n\nPrimo paragrafo\na capo\n\nSecondo"
+        )
+
     def test_process_post_returns_proper_format(self, mock_wordpress_post):
         """Test that process_post returns correctly formatted dict"""
         from src.veronica_wordpress_chatbot.wordpress.processor import ContentProcessor
@@ -0,0 +1,706 @@
+"""
+Unit tests for the WordPress client transport layer
+
+These tests demonstrate:
+- Process-wide shared HTTP session (keep-alive connection pool)
+- Pool hit/miss accounting
+- Mocking the HTTP layer instead of the network
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    OptimizedWordPressClient,
+    ResponseCache,
+    close_http_session,
+    get_circuit_breakers,
+    get_http_session,
+    get_payload_stats,
+    get_pool_stats,
+    get_response_cache,
+    get_revalidation_store,
+    get_wordpress_client,
+)
+from src.veronica_wordpress_chatbot.wordpress.client import build_request_params
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Each test starts with a brand new shared session and empty cache"""
+    close_http_session()
+    get_response_cache().clear()
+    get_revalidation_store().clear()
+    get_payload_stats().clear()
+    get_circuit_breakers().clear()
+    yield
+    close_http_session()
+    get_response_cache().clear()
+    get_revalidation_store().clear()
+    get_circuit_breakers().clear()
+
+
+def _mock_response(payload, status_code=200, headers=None, content=b"[]"):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    response.content = content
+    return response
+
+
+class TestSharedSession:
+    """Test the pooled HTTP transport shared by all clients"""
+
+    def test_clients_share_same_session(self):
+        """Test that every client reuses the process-wide session"""
+        client_a = get_wordpress_client()
+        client_b = OptimizedWordPressClient("https://test.example.com")
+
+        assert client_a.session is client_b.session
+        assert client_a.session is get_http_session()
+
+    def test_session_mounts_pooled_adapter(self):
+        """Test that the session uses a keep-alive adapter without retries"""
+        session = get_http_session()
+        adapter = session.get_adapter("https://test.example.com")
+
+        assert adapter.max_retries.total == 0
+        assert session.headers["Connection"] == "keep-alive"
+
+    def test_pool_stats_empty_before_requests(self):
+        """Test pool stats before any request"""
+        stats = get_pool_stats()
+
+        assert stats["requests"] == 0
+        assert stats["hits"] == 0
+        assert stats["misses"] == 0
+
+    def test_make_request_uses_shared_session(self):
+        """Test that _make_request goes through the shared session"""
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(
+            client.session, "get", return_value=_mock_response([{"id": 1}])
+        ) as mock_get:
+            posts = client.get_posts({"per_page": 1})
+
+        assert posts == [{"id": 1}]
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0].endswith("/wp-json/wp/v2/posts")
+
+
+class TestResponseCache:
+    """Test the TTL + LRU response cache"""
+
+    def test_key_is_normalized(self):
+        """Test that param order and whitespace do not change the key"""
+        key_a = ResponseCache.make_key("posts", {"per_page": 5, "search": " AI "})
+        key_b = ResponseCache.make_key("posts", {"search": "AI", "per_page": "5"})
+
+        assert key_a == key_b
+
+    def test_fresh_then_stale_then_expired(self):
+        """Test TTL and stale-while-revalidate windows"""
+        cache = ResponseCache(max_bytes=1000, default_ttl=60, stale_ttl=60, ttls={})
+
+        with patch("src.veronica_wordpress_chatbot.wordpress.cache.time") as mock_time:
+            mock_time.monotonic.return_value = 0
+            cache.store("posts", "k", [1], 10)
+
+            assert cache.lookup("k") == ([1], "fresh")
+
+            mock_time.monotonic.return_value = 90
+            assert cache.lookup("k") == ([1], "stale")
+
+            mock_time.monotonic.return_value = 200
+            assert cache.lookup("k") == (None, "miss")
+
+    def test_lru_eviction_respects_memory_cap(self):
+        """Test that least recently used entries are evicted first"""
+        cache = ResponseCache(max_bytes=100, default_ttl=60, stale_ttl=0, ttls={})
+
+        cache.store("posts", "a", ["a"], 40)
+        cache.store("posts", "b", ["b"], 40)
+        cache.lookup("a")  # "a" diventa la più recente
+        cache.store("posts", "c", ["c"], 40)
+
+        assert cache.lookup("b") == (None, "miss")
+        assert cache.lookup("a")[1] == "fresh"
+        assert cache.stats()["evictions"] == 1
+
+    def test_client_serves_second_call_from_cache(self):
+        """Test that identical calls hit WordPress only once"""
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(
+            client.session, "get", return_value=_mock_response([{"id": 1}])
+        ) as mock_get:
+            client.get_projects({"per_page": 10})
+            projects = client.get_projects({"per_page": 10})
+
+        assert projects == [{"id": 1}]
+        mock_get.assert_called_once()
+        assert get_response_cache().stats()["hits"] == 1
+
+    def test_stale_entry_served_and_refreshed(self):
+        """Test that expired entries are served immediately and refreshed"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        key = client.cache.make_key("tools", build_request_params(None, "tools"))
+        client.cache.store("tools", key, [{"id": "old"}], 10)
+        client.cache._entries[key].expires_at = 0
+
+        with patch(
+            "src.veronica_wordpress_chatbot.wordpress.client._refresh_executor"
+        ) as mock_executor:
+            tools = client.get_tools()
+
+        assert tools == [{"id": "old"}]
+        mock_executor.submit.assert_called_once()
+
+
+class TestFieldsProjection:
+    """Test _fields projection built from WORDPRESS_FIELD_CONFIGS"""
+
+    def test_projection_contains_processor_fields(self):
+        """Test that the projection covers what ContentProcessor reads"""
+        from src.veronica_wordpress_chatbot.wordpress import build_fields_projection
+
+        fields = build_fields_projection("projects").split(",")
+
+        assert {"id", "modified", "title", "content", "link", "date"} <= set(fields)
+        assert "acf.project_repository" in fields
+        assert "yoast_head_json" not in fields
+
+    def test_projection_keeps_taxonomy(self):
+        """Test that every endpoint with a taxonomy requests its terms"""
+        from src.veronica_wordpress_chatbot.config import WORDPRESS_FIELD_CONFIGS
+        from src.veronica_wordpress_chatbot.wordpress import build_fields_projection
+
+        for endpoint, config in WORDPRESS_FIELD_CONFIGS.items():
+            if config.get("taxonomy"):
+                fields = build_fields_projection(endpoint).split(",")
+                assert config["taxonomy"] in fields, endpoint
+
+    def test_unknown_endpoint_has_no_projection(self):
+        """Test that endpoints without config are requested unfiltered"""
+        params = build_request_params({"per_page": 1}, "unknown-type")
+
+        assert "_fields" not in params
+
+    def test_explicit_fields_are_merged(self):
+        """Test that caller-provided _fields extend the projection"""
+        params = build_request_params({"_fields": "categories"}, "posts")
+
+        assert params["_fields"].split(",")[-1] == "categories"
+        assert "title" in params["_fields"]
+
+    def test_request_sends_fields_and_records_bytes(self):
+        """Test that requests carry _fields and payload bytes are tracked"""
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(
+            client.session,
+            "get",
+            return_value=_mock_response([{"id": 1}], content=b"x" * 64),
+        ) as mock_get:
+            client.get_certifications({"per_page": 1})
+
+        fields = mock_get.call_args.kwargs["params"]["_fields"]
+        assert "acf.ente_certificazione" in fields
+        stats = get_payload_stats().stats()["endpoints"]["certifications"]
+        assert stats["bytes"] == 64
+        assert stats["items"] == 1
+
+
+class TestPagination:
+    """Test auto-paginating iter_* generators"""
+
+    @staticmethod
+    def _paged_get(total_pages, calls):
+        def get(url, params=None, timeout=None, headers=None):
+            page = params["page"]
+            calls.append(page)
+            return _mock_response(
+                [{"id": page * 10 + i} for i in range(2)],
+                headers={"X-WP-TotalPages": str(total_pages)},
+            )
+
+        return get
+
+    def test_iterates_all_pages_in_order(self):
+        """Test that every page is fetched and items keep page order"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        calls = []
+
+        with patch.object(client.session, "get", side_effect=self._paged_get(4, calls)):
+            ids = [item["id"] for item in client.iter_posts()]
+
+        assert ids == [10, 11, 20, 21, 30, 31, 40, 41]
+        assert sorted(calls) == [1, 2, 3, 4]
+
+    def test_uses_max_per_page_and_projection(self):
+        """Test that pagination requests 100 items per page with _fields"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        calls = []
+
+        with patch.object(
+            client.session, "get", side_effect=self._paged_get(1, calls)
+        ) as mock_get:
+            list(client.iter_books())
+
+        params = mock_get.call_args.kwargs["params"]
+        assert params["per_page"] == 100
+        assert "_fields" in params
+
+    def test_early_stop_skips_remaining_pages(self):
+        """Test that stopping early does not download the whole collection"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        calls = []
+
+        with patch.object(
+            client.session, "get", side_effect=self._paged_get(50, calls)
+        ):
+            iterator = client.iter_projects(max_concurrency=2)
+            first = [next(iterator) for _ in range(3)]
+            iterator.close()
+
+        assert [item["id"] for item in first] == [10, 11, 20]
+        assert max(calls) <= 4
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight requests"""
+
+    def test_concurrent_threads_share_one_call(self):
+        """Test that concurrent identical calls hit upstream once"""
+        import threading
+        import time
+
+        from src.veronica_wordpress_chatbot.wordpress import SingleFlight
+
+        single_flight = SingleFlight()
+        upstream = Mock(side_effect=lambda: time.sleep(0.05) or "result")
+        results = []
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(single_flight.do("k", upstream))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["result"] * 5
+        assert upstream.call_count == 1
+        assert single_flight.stats()["coalesced_calls"] == 4
+
+    def test_errors_propagate_to_followers(self):
+        """Test that the leader's exception reaches every waiter"""
+        from src.veronica_wordpress_chatbot.wordpress import SingleFlight
+
+        single_flight = SingleFlight()
+
+        with pytest.raises(ValueError):
+            single_flight.do("k", Mock(side_effect=ValueError("boom")))
+
+        # La chiave viene liberata: la chiamata successiva riparte da zero
+        assert single_flight.do("k", lambda: "ok") == "ok"
+
+    async def test_concurrent_coroutines_share_one_call(self):
+        """Test the asyncio path of the coalescer"""
+        import asyncio
+
+        from src.veronica_wordpress_chatbot.wordpress import SingleFlight
+
+        single_flight = SingleFlight()
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(
+            *(single_flight.ado("k", upstream) for _ in range(4))
+        )
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert single_flight.stats()["coalesced_calls"] == 3
+
+
+class TestResilience:
+    """Test retries, circuit breaker and stale fallback"""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self):
+        with patch("src.veronica_wordpress_chatbot.wordpress.client.time.sleep"):
+            yield
+
+    @staticmethod
+    def _failing_get(*args, **kwargs):
+        import requests
+
+        raise requests.exceptions.ConnectTimeout("timeout")
+
+    def test_transient_errors_are_retried(self):
+        """Test that a connection error followed by success returns the data"""
+        import requests
+
+        client = OptimizedWordPressClient("https://test.example.com")
+        ok = _mock_response([{"id": 1}])
+
+        with patch.object(
+            client.session,
+            "get",
+            side_effect=[requests.exceptions.ConnectionError("reset"), ok],
+        ) as mock_get:
+            assert client.get_books() == [{"id": 1}]
+
+        assert mock_get.call_count == 2
+        assert get_circuit_breakers().get("books").state == "closed"
+
+    def test_read_timeout_is_not_retried(self):
+        """Test that a slow host costs a single timeout, not one per retry"""
+        import requests
+
+        from src.veronica_wordpress_chatbot.wordpress import WordPressUnavailableError
+
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(
+            client.session,
+            "get",
+            side_effect=requests.exceptions.ReadTimeout("slow"),
+        ) as mock_get:
+            with pytest.raises(WordPressUnavailableError):
+                client.get_books()
+
+        assert mock_get.call_count == 1
+
+    def test_retry_stops_at_deadline(self):
+        """Test that no retry starts once it would exceed the total deadline"""
+        from src.veronica_wordpress_chatbot.wordpress.resilience import (
+            retry_allowed,
+        )
+
+        assert retry_allowed(1, elapsed=0.1, delay=0.2) is True
+        assert retry_allowed(1, elapsed=7.0, delay=0.2) is False
+        assert retry_allowed(1, elapsed=0.1, delay=0.2, timed_out=True) is False
+
+    def test_unexpected_error_releases_half_open_trial(self):
+        """Test that a non-HTTP error does not leave the trial in flight"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        breaker = get_circuit_breakers().get("books")
+        breaker.reset_timeout = 0
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        with patch.object(client, "_fetch", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                client._fetch_resilient("books", {})
+
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+
+    def test_unavailable_without_cache_raises(self):
+        """Test that tools can tell an outage apart from an empty collection"""
+        from src.veronica_wordpress_chatbot.wordpress import WordPressUnavailableError
+
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(client.session, "get", side_effect=self._failing_get):
+            with pytest.raises(WordPressUnavailableError):
+                client.get_posts()
+
+    def test_breaker_opens_and_fails_fast(self):
+        """Test that after the threshold no request reaches WordPress"""
+        from src.veronica_wordpress_chatbot.wordpress import WordPressUnavailableError
+
+        client = OptimizedWordPressClient("https://test.example.com")
+        breaker = get_circuit_breakers().get("posts")
+
+        with patch.object(
+            client.session, "get", side_effect=self._failing_get
+        ) as mock_get:
+            for page in range(breaker.failure_threshold):
+                with pytest.raises(WordPressUnavailableError):
+                    client.get_posts({"page": page + 1})
+            calls = mock_get.call_count
+
+            with pytest.raises(WordPressUnavailableError):
+                client.get_posts({"page": 99})
+
+        assert breaker.state == "open"
+        assert mock_get.call_count == calls
+
+    def test_stale_payload_served_when_unavailable(self):
+        """Test the last good payload is served with the stale marker"""
+        from src.veronica_wordpress_chatbot.wordpress import is_stale
+
+        client = OptimizedWordPressClient("https://test.example.com")
+
+        with patch.object(
+            client.session, "get", return_value=_mock_response([{"id": 1}])
+        ):
+            client.get_tools()
+
+        # Cache scaduta: resta solo l'ultimo payload valido salvato
+        get_response_cache().invalidate("tools")
+
+        with patch.object(client.session, "get", side_effect=self._failing_get):
+            tools = client.get_tools()
+
+        assert tools == [{"id": 1}]
+        assert is_stale(tools)
+
+    def test_breaker_half_open_after_reset_timeout(self):
+        """Test that a successful trial request closes the circuit"""
+        from src.veronica_wordpress_chatbot.wordpress.resilience import CircuitBreaker
+
+        breaker = CircuitBreaker("posts", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # una sola richiesta di prova
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+class TestHedging:
+    """Test hedged requests against slow WordPress responses"""
+
+    @staticmethod
+    def _policy(**overrides):
+        from src.veronica_wordpress_chatbot.wordpress import HedgingPolicy
+
+        options = {"enabled": True, "max_ratio": 1.0, "min_samples": 5}
+        options.update(overrides)
+        policy = HedgingPolicy(**options)
+        for _ in range(5):
+            policy.record_latency("posts", 0.01)
+        return policy
+
+    def test_no_hedge_without_enough_samples(self):
+        """Test that hedging waits for a latency baseline"""
+        from src.veronica_wordpress_chatbot.wordpress import HedgingPolicy
+
+        policy = HedgingPolicy(enabled=True, min_samples=5)
+
+        assert policy.hedge_delay("posts") is None
+        assert policy.call("posts", lambda: "ok") == "ok"
+        assert policy.stats()["fired"] == 0
+
+    def test_slow_primary_is_hedged(self):
+        """Test that the hedge answers when the primary is stuck"""
+        import threading
+
+        policy = self._policy()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)  # la richiesta primaria resta bloccata
+                return "primary"
+            return "hedge"
+
+        try:
+            assert policy.call("posts", fetch) == "hedge"
+        finally:
+            release.set()
+
+        stats = policy.stats()
+        assert stats["fired"] == 1
+        assert stats["won"] == 1
+
+    def test_budget_caps_extra_requests(self):
+        """Test that no hedge fires once the extra-load budget is used"""
+        import time
+
+        policy = self._policy(max_ratio=0.0)
+
+        assert policy.call("posts", lambda: time.sleep(0.1) or "primary") == "primary"
+        assert policy.stats()["fired"] == 0
+        assert policy.stats()["budget_exhausted"] == 1
+
+    async def test_async_loser_is_cancelled(self):
+        """Test the asyncio path: the slower request gets cancelled"""
+        import asyncio
+
+        policy = self._policy()
+        cancelled = []
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(2)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+                return "primary"
+            return "hedge"
+
+        assert await policy.acall("posts", fetch) == "hedge"
+        await asyncio.sleep(0)
+
+        assert cancelled == [1]
+        assert policy.stats()["won"] == 1
+
+
+class TestConditionalGet:
+    """Test ETag / Last-Modified revalidation and fingerprint probes"""
+
+    def test_not_modified_reuses_payload(self):
+        """Test that a 304 reuses the stored payload and sends validators"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        first = _mock_response(
+            [{"id": 1}],
+            headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            content=b"x" * 1000,
+        )
+        not_modified = _mock_response(None, status_code=304)
+
+        with patch.object(
+            client.session, "get", side_effect=[first, not_modified]
+        ) as mock_get:
+            client.get_posts()
+            client.cache.clear()  # forza il ritorno a WordPress
+            posts = client.get_posts()
+
+        assert posts == [{"id": 1}]
+        headers = mock_get.call_args_list[1].kwargs["headers"]
+        assert headers["If-None-Match"] == '"abc"'
+        assert "If-Modified-Since" in headers
+
+        stats = get_revalidation_store().stats()
+        assert stats["not_modified"] == 1
+        assert stats["bytes_saved"] == 1000
+
+    def test_fingerprint_probe_without_validators(self):
+        """Test the X-WP-Total + modified fallback when no validators are sent"""
+        client = OptimizedWordPressClient("https://test.example.com")
+        probe_headers = {"X-WP-Total": "7"}
+        responses = [
+            _mock_response([{"id": 1}], content=b"x" * 500),  # primo download
+            _mock_response([{"modified": "2024-01-01"}], headers=probe_headers),
+            _mock_response([{"id": 1}], content=b"x" * 500),  # fingerprint nuovo
+            _mock_response([{"modified": "2024-01-01"}], headers=probe_headers),
+        ]
+
+        with patch.object(client.session, "get", side_effect=responses) as mock_get:
+            for _ in range(3):
+                client.cache.clear()
+                books = client.get_books()
+
+        assert books == [{"id": 1}]
+        assert mock_get.call_count == 4
+        probe_params = mock_get.call_args_list[3].kwargs["params"]
+        assert probe_params["per_page"] == 1
+        assert probe_params["orderby"] == "modified"
+        assert get_revalidation_store().stats()["fingerprint_matches"] == 1
+
+
+class TestAsyncClient:
+    """Test the asyncio WordPress client"""
+
+    @staticmethod
+    def _client(handler):
+        import httpx
+
+        from src.veronica_wordpress_chatbot.wordpress import AsyncWordPressClient
+
+        transport = httpx.MockTransport(handler)
+        return AsyncWordPressClient(
+            "https://test.example.com",
+            http_client=httpx.AsyncClient(transport=transport),
+        )
+
+    async def test_get_posts_awaitable(self, mock_wordpress_post):
+        """Test that get_posts is awaitable and merges default params"""
+        import httpx
+
+        seen = {}
+
+        def handler(request):
+            seen["url"] = request.url
+            return httpx.Response(200, json=[mock_wordpress_post])
+
+        posts = await self._client(handler).get_posts({"per_page": 3})
+
+        assert posts == [mock_wordpress_post]
+        assert seen["url"].path == "/wp-json/wp/v2/posts"
+        assert seen["url"].params["per_page"] == "3"
+        assert seen["url"].params["orderby"] == "date"
+
+    async def test_client_error_returns_empty_list(self):
+        """Test that non-transient HTTP errors degrade to an empty list"""
+        import httpx
+
+        client = self._client(lambda request: httpx.Response(404))
+
+        assert await client.get_projects() == []
+
+    async def test_server_error_raises_unavailable(self):
+        """Test that exhausted retries surface as WordPressUnavailableError"""
+        import httpx
+
+        from src.veronica_wordpress_chatbot.wordpress import WordPressUnavailableError
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        with pytest.raises(WordPressUnavailableError):
+            await self._client(handler).get_projects()
+
+        assert len(calls) == 2  # primo tentativo + un retry
+
+    async def test_fetch_many_runs_all_requests(self):
+        """Test concurrent fan-out over several endpoints"""
+        import httpx
+
+        def handler(request):
+            endpoint = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=[{"endpoint": endpoint}])
+
+        fetched = await self._client(handler).fetch_many(
+            {"tools": ("tools", None), "stacks": ("stacks", {"per_page": 1})}
+        )
+
+        assert fetched["tools"] == [{"endpoint": "tools"}]
+        assert fetched["stacks"] == [{"endpoint": "stacks"}]
+
+
+class TestAsyncTools:
+    """Test ainvoke implementations of the tools"""
+
+    @patch("src.veronica_wordpress_chatbot.tools.blog_tools.get_async_wordpress_client")
+    async def test_search_blog_posts_ainvoke(self, mock_factory, mock_wordpress_post):
+        """Test that ainvoke uses the async client"""
+        import json
+        from unittest.mock import AsyncMock
+
+        from src.veronica_wordpress_chatbot.tools import search_blog_posts
+
+        mock_client = Mock()
+        mock_client.get_posts = AsyncMock(return_value=[mock_wordpress_post])
+        mock_factory.return_value = mock_client
+
+        result = await search_blog_posts.ainvoke({"query": "AI", "limit": 5})
+
+        parsed = json.loads(result)
+        assert parsed["total"] == 1
+        mock_client.get_posts.assert_awaited_once_with({"per_page": 5, "search": "AI"})
@@ -0,0 +1,143 @@
+"""
+Unit tests for the fan-out of multi-endpoint tools
+
+These tests demonstrate:
+- Concurrent calls: latency is the slowest call, not the sum
+- Partial results when a section misses the deadline
+- Error propagation when no section completes
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.tools import search_all_content
+from src.veronica_wordpress_chatbot.wordpress import (
+    afan_out,
+    fan_out,
+    get_fanout_stats,
+    with_missing_notice,
+)
+
+
+class TestFanOut:
+    """Test the thread-pool fan-out used by the sync tools"""
+
+    def test_calls_run_concurrently(self):
+        """Test that four 0.1 s calls complete in about 0.1 s"""
+
+        def slow(value):
+            time.sleep(0.1)
+            return value
+
+        started = time.monotonic()
+        fetched = fan_out({name: (lambda n=name: slow(n)) for name in "abcd"})
+
+        assert time.monotonic() - started < 0.3
+        assert fetched.results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+        assert not fetched.partial
+
+    def test_deadline_returns_completed_sections(self):
+        """Test that a section over the deadline is reported as missing"""
+        release = threading.Event()
+        try:
+            fetched = fan_out(
+                {"posts": lambda: ["post"], "tools": lambda: release.wait(5)},
+                deadline=0.05,
+            )
+        finally:
+            release.set()
+
+        assert fetched.results == {"posts": ["post"]}
+        assert fetched.missing == ["tools"]
+        assert get_fanout_stats().stats()["timeouts"] == {"tools": 1}
+
+    def test_failed_section_is_missing(self):
+        """Test that one failing section does not fail the whole tool"""
+
+        def fail():
+            raise RuntimeError("boom")
+
+        fetched = fan_out({"posts": lambda: ["post"], "books": fail})
+
+        assert fetched.get("posts") == ["post"]
+        assert fetched.missing == ["books"]
+
+    def test_all_failed_raises(self):
+        """Test that the error propagates when nothing completes"""
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fan_out({"posts": fail, "books": fail})
+
+    def test_missing_notice(self):
+        """Test the partial marker added to tool results"""
+        assert with_missing_notice({"total": 1}, []) == {"total": 1}
+
+        payload = with_missing_notice({"total": 1}, ["tools"])
+        assert payload["partial"] is True
+        assert payload["missing_sections"] == ["tools"]
+
+
+class TestAsyncFanOut:
+    """Test the asyncio fan-out used by ainvoke"""
+
+    async def test_deadline_cancels_pending(self):
+        """Test that coroutines over the deadline are cancelled"""
+        cancelled = asyncio.Event()
+
+        async def fast():
+            return ["post"]
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        fetched = await afan_out({"posts": fast, "tools": slow}, deadline=0.05)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert fetched.results == {"posts": ["post"]}
+        assert fetched.missing == ["tools"]
+
+
+class TestPartialTools:
+    """Test the partial results of a multi-endpoint tool"""
+
+    @patch(
+        "src.veronica_wordpress_chatbot.tools.search_tools.SEARCH_INDEX_ENABLED",
+        False,
+    )
+    @patch("src.veronica_wordpress_chatbot.tools.search_tools.fan_out")
+    @patch("src.veronica_wordpress_chatbot.tools.search_tools.get_wordpress_client")
+    def test_search_all_content_reports_missing_sections(
+        self, mock_client_class, mock_fan_out, mock_wordpress_post
+    ):
+        """Test that search_all_content answers with the types that arrived"""
+        release = threading.Event()
+        mock_client = Mock()
+        mock_client.get_posts.return_value = [mock_wordpress_post]
+        mock_client.get_projects.return_value = []
+        mock_client.get_certifications.return_value = []
+        mock_client.get_tools.side_effect = lambda params: release.wait(5)
+        mock_client_class.return_value = mock_client
+        mock_fan_out.side_effect = lambda calls: fan_out(calls, deadline=0.1)
+
+        try:
+            result = search_all_content.invoke({"query": "AI"})
+        finally:
+            release.set()
+
+        parsed = json.loads(result)
+
+        assert parsed["total"] == 1
+        assert parsed["partial"] is True
+        assert parsed["missing_sections"] == ["tools"]
@@ -0,0 +1,75 @@
+"""
+Unit tests for the revision-keyed processed document cache
+
+These tests demonstrate:
+- Each (post type, id, modified) revision is processed once
+- A new revision or an item without revision data is processed again
+- Memory bound with LRU eviction and hit-rate statistics
+"""
+
+from unittest.mock import Mock
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    ContentProcessor,
+    ProcessedCache,
+    get_processed_cache,
+)
+
+
+def _post(modified="2024-01-01T10:00:00", content="<p>Ciao</p>"):
+    return {
+        "id": 1,
+        "modified": modified,
+        "date": modified,
+        "title": {"rendered": "Post"},
+        "content": {"rendered": content},
+    }
+
+
+class TestProcessedCache:
+    """Test memoization of ContentProcessor output"""
+
+    def test_same_revision_processed_once(self):
+        """Test that repeated calls on one revision hit the cache"""
+        processor = Mock(return_value={"title": "Post"})
+        cache = ProcessedCache()
+
+        cache.get_or_process("posts", _post(), processor)
+        cache.get_or_process("posts", _post(), processor)
+
+        assert processor.call_count == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_new_revision_processed_again(self):
+        """Test that a new modified date invalidates the memoized output"""
+        first = ContentProcessor.process_post(_post(content="<p>Prima</p>"))
+        second = ContentProcessor.process_post(
+            _post(modified="2024-02-01T10:00:00", content="<p>Dopo</p>")
+        )
+
+        assert first["content_preview"] == "Prima"
+        assert second["content_preview"] == "Dopo"
+        assert get_processed_cache().stats()["misses"] == 2
+
+    def test_items_without_revision_not_cached(self):
+        """Test that items without id/modified bypass the cache"""
+        processor = Mock(return_value={})
+        cache = ProcessedCache()
+
+        cache.get_or_process("posts", {"title": {"rendered": "x"}}, processor)
+        cache.get_or_process("posts", {"title": {"rendered": "x"}}, processor)
+
+        assert processor.call_count == 2
+        assert cache.stats()["uncached"] == 2
+
+    def test_memory_bound_evicts_least_recent(self):
+        """Test LRU eviction once the estimated size exceeds max_bytes"""
+        cache = ProcessedCache(max_bytes=400)
+
+        for post_id in range(5):
+            item = {"id": post_id, "modified": "2024-01-01"}
+            cache.get_or_process("posts", item, lambda _: {"text": "x" * 100})
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 400
+        assert stats["evictions"] > 0
@@ -0,0 +1,225 @@
+"""
+Unit tests for the local SQLite content mirror
+
+These tests demonstrate:
+- Full and incremental sync driven by a mocked WordPress client
+- Deletion detection through the live ID listing
+- Tool-style queries answered locally, with WordPress fallback
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    ContentMirror,
+    MirrorWordPressClient,
+    OptimizedWordPressClient,
+)
+
+PORTFOLIO_TOOLS = "src.veronica_wordpress_chatbot.tools.portfolio_tools"
+
+
+def _post(post_id, modified, title="Post", content=""):
+    return {
+        "id": post_id,
+        "date": modified,
+        "modified": modified,
+        "title": {"rendered": title},
+        "content": {"rendered": content},
+    }
+
+
+@pytest.fixture
+def wp_client():
+    """WordPress client whose iter_collection is driven by the test"""
+    return Mock()
+
+
+@pytest.fixture
+def mirror(tmp_path, wp_client):
+    mirror = ContentMirror(str(tmp_path / "mirror.sqlite3"), client=wp_client)
+    yield mirror
+    mirror.close()
+
+
+class TestMirrorSync:
+    """Test full and incremental synchronization"""
+
+    def test_full_sync_stores_collection(self, mirror, wp_client):
+        """Test that the first sync downloads and stores everything"""
+        wp_client.iter_collection.return_value = iter(
+            [_post(1, "2024-01-01T10:00:00"), _post(2, "2024-02-01T10:00:00")]
+        )
+
+        result = mirror.sync_endpoint("posts")
+
+        assert result["mode"] == "full"
+        assert result["items"] == 2
+        assert mirror.has_endpoint("posts")
+        wp_client.iter_collection.assert_called_once_with("posts")
+
+    def test_incremental_sync_uses_modified_after(self, mirror, wp_client):
+        """Test that later syncs only ask for modified items"""
+        wp_client.iter_collection.return_value = iter([_post(1, "2024-01-01T10:00:00")])
+        mirror.sync_endpoint("posts")
+
+        wp_client.iter_collection.side_effect = [
+            iter([_post(2, "2024-03-01T10:00:00")]),
+            iter([{"id": 1}, {"id": 2}]),
+        ]
+        result = mirror.sync_endpoint("posts")
+
+        assert result["mode"] == "incremental"
+        changed_call = wp_client.iter_collection.call_args_list[1]
+        assert changed_call.args[1]["modified_after"] == "2024-01-01T10:00:00"
+        assert result["items"] == 2
+
+    def test_incremental_sync_detects_deletions(self, mirror, wp_client):
+        """Test that items missing from the live ID list are removed"""
+        wp_client.iter_collection.return_value = iter(
+            [_post(1, "2024-01-01T10:00:00"), _post(2, "2024-02-01T10:00:00")]
+        )
+        mirror.sync_endpoint("posts")
+
+        wp_client.iter_collection.side_effect = [iter([]), iter([{"id": 2}])]
+        result = mirror.sync_endpoint("posts")
+
+        assert result["deleted"] == 1
+        assert [post["id"] for post in mirror.query("posts")] == [2]
+
+    def test_failed_sync_keeps_mirror(self, mirror, wp_client):
+        """Test that a WordPress error leaves the stored copy untouched"""
+        wp_client.iter_collection.return_value = iter([_post(1, "2024-01-01T10:00:00")])
+        mirror.sync_endpoint("posts")
+
+        wp_client.iter_collection.side_effect = ConnectionError("down")
+        results = mirror.sync(["posts"])
+
+        assert "error" in results["posts"]
+        assert len(mirror.query("posts")) == 1
+
+
+class TestMirrorQuery:
+    """Test tool-style queries answered from SQLite"""
+
+    @pytest.fixture(autouse=True)
+    def synced(self, mirror, wp_client):
+        wp_client.iter_collection.return_value = iter(
+            [
+                _post(1, "2024-01-01T10:00:00", "LangGraph agents", "Workflow AI"),
+                _post(2, "2024-02-01T10:00:00", "Cucina siciliana", "Arancine"),
+                _post(3, "2024-03-01T10:00:00", "RAG 100% locale", "Embeddings AI"),
+            ]
+        )
+        mirror.sync_endpoint("posts")
+
+    def test_latest_first_with_limit(self, mirror):
+        """Test default ordering (date desc) and per_page"""
+        posts = mirror.query("posts", {"per_page": 2})
+
+        assert [post["id"] for post in posts] == [3, 2]
+
+    def test_search_matches_all_terms(self, mirror):
+        """Test case-insensitive search across title and content"""
+        assert [p["id"] for p in mirror.query("posts", {"search": "ai"})] == [3, 1]
+        assert [p["id"] for p in mirror.query("posts", {"search": "AI rag"})] == [3]
+        assert [p["id"] for p in mirror.query("posts", {"search": "100%"})] == [3]
+
+    def test_search_ignores_accents(self, mirror, wp_client):
+        """Test that folded keywords ("perche") match accented text"""
+        wp_client.iter_collection.return_value = iter(
+            [_post(4, "2024-04-01T10:00:00", "Perché Obsidian", "Città e note")]
+        )
+        mirror.sync_endpoint("posts", full=True)
+
+        assert [p["id"] for p in mirror.query("posts", {"search": "perche"})] == [4]
+        assert [p["id"] for p in mirror.query("posts", {"search": "città"})] == [4]
+
+    def test_unsynced_or_unsupported_returns_none(self, mirror):
+        """Test that the mirror declines what it cannot answer"""
+        assert mirror.query("books") is None
+        assert mirror.query("posts", {"categories": 4}) is None
+
+    def test_taxonomy_filter_by_term_id(self, mirror, wp_client):
+        """Test that category pushdown (e.g. tool-category=13,15) is local"""
+        wp_client.iter_collection.return_value = iter(
+            [
+                {**_post(1, "2024-01-01T10:00:00"), "tool-category": [13]},
+                {**_post(2, "2024-02-01T10:00:00"), "tool-category": [14]},
+                {**_post(3, "2024-03-01T10:00:00"), "tool-category": [14, 15]},
+            ]
+        )
+        mirror.sync_endpoint("tools")
+
+        tools = mirror.query("tools", {"tool-category": "13,15"})
+
+        assert [tool["id"] for tool in tools] == [3, 1]
+        assert mirror.query("tools", {"tool-category": "16"}) == []
+
+    def test_project_category_through_projection(
+        self, tmp_path, fake_wordpress_get, mock_project_collection
+    ):
+        """Test the project category filter on a mirror synced with _fields"""
+        from src.veronica_wordpress_chatbot.tools import get_portfolio_projects
+
+        wordpress = OptimizedWordPressClient("https://test.example.com")
+        mirror = ContentMirror(str(tmp_path / "projects.sqlite3"), client=wordpress)
+        with patch.object(
+            wordpress.session,
+            "get",
+            side_effect=fake_wordpress_get(mock_project_collection),
+        ):
+            mirror.sync_endpoint("projects")
+        client = MirrorWordPressClient("https://test.example.com", mirror=mirror)
+        taxonomy = Mock(resolve=Mock(return_value=(7,)))
+
+        with (
+            patch(
+                f"{PORTFOLIO_TOOLS}.get_wordpress_client",
+                return_value=client,
+            ),
+            patch(
+                f"{PORTFOLIO_TOOLS}.get_taxonomy_cache",
+                return_value=taxonomy,
+            ),
+            patch.object(client.session, "get") as mock_get,
+        ):
+            result = json.loads(get_portfolio_projects.invoke({"category": "ai"}))
+
+        mock_get.assert_not_called()
+        assert [p["title"] for p in result["projects"]] == ["Agente RAG"]
+        mirror.close()
+
+    def test_client_iterates_collection_from_mirror(self, mirror):
+        """Test that the search index crawl reads the mirror, not WordPress"""
+        client = MirrorWordPressClient("https://test.example.com", mirror=mirror)
+
+        with patch.object(client.session, "get") as mock_get:
+            everything = list(client.iter_collection("posts"))
+            changed = list(
+                client.iter_collection(
+                    "posts", {"modified_after": "2024-01-15T00:00:00"}
+                )
+            )
+            ids = list(client.iter_collection("posts", fields="id"))
+            mock_get.assert_not_called()
+
+        assert [post["id"] for post in everything] == [1, 2, 3]
+        assert [post["id"] for post in changed] == [2, 3]
+        assert ids == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_client_reads_mirror_then_falls_back(self, mirror):
+        """Test that the mirror client only hits WordPress when needed"""
+        client = MirrorWordPressClient("https://test.example.com", mirror=mirror)
+
+        with patch.object(client.session, "get") as mock_get:
+            assert len(client.get_posts({"per_page": 5})) == 3
+            mock_get.assert_not_called()
+
+        response = Mock(status_code=200, headers={}, content=b"[]")
+        response.json.return_value = [{"id": 9}]
+        with patch.object(client.session, "get", return_value=response) as mock_get:
+            assert client.get_books() == [{"id": 9}]
+            mock_get.assert_called_once()
@@ -0,0 +1,79 @@
+"""
+Unit tests for query rewriting before WordPress ``search``
+
+These tests demonstrate:
+- Keyword extraction from full sentences (Italian and English)
+- Site synonym table, accent folding and proper nouns
+- Counters for empty searches and retries
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    QueryStats,
+    expand_query,
+    rewrite_query,
+)
+
+
+class TestRewriteQuery:
+    """Test the keyword query sent to WordPress"""
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("hai lavorato con modelli linguistici?", "LLM"),
+            ("tell me about your LLMs projects", "LLM project"),
+            ("articles about machine learning", "machine learning"),
+            ("Hai scritto articoli sugli agenti LangGraph?", "agent LangGraph"),
+            ("Perché usi Obsidian?", "Obsidian"),
+            ("cos'è la città di Palermo", "citt Palermo"),
+        ],
+    )
+    def test_sentences_become_keywords(self, query, expected):
+        """Test stopwords, conversational words, synonyms and stemming"""
+        assert rewrite_query(query) == expected
+
+    def test_short_queries_are_unchanged(self):
+        """Test that keyword queries and acronyms keep their form"""
+        assert rewrite_query("AI") == "AI"
+        assert rewrite_query("LangGraph") == "LangGraph"
+        assert rewrite_query("  il  ") == "il"
+        assert rewrite_query("") == ""
+
+    def test_max_terms_prefers_site_terms_and_names(self):
+        """Test that WordPress gets few terms, dictionary terms first"""
+        query = "progetti di produzione con RAG su FastAPI e agenti"
+
+        assert rewrite_query(query, max_terms=3) == "RAG FastAPI agent"
+        assert rewrite_query(query, max_terms=1) == "RAG"
+
+    def test_expand_query_adds_site_terms(self):
+        """Test that BM25 queries keep the text and add the canonical terms"""
+        assert expand_query("modelli linguistici") == "modelli linguistici LLM"
+        assert expand_query("RAG e LLM") == "RAG e LLM"
+
+
+class TestQueryStats:
+    """Test search counters"""
+
+    def test_empty_searches_and_retries(self):
+        """Test that a search soon after an empty one counts as a retry"""
+        stats = QueryStats()
+        with patch(
+            "src.veronica_wordpress_chatbot.wordpress.query_rewrite.time.monotonic",
+            side_effect=[0.0, 5.0, 500.0],
+        ):
+            stats.record("agenti LangGraph in produzione", "agent LangGraph", 0)
+            stats.record("LangGraph", "LangGraph", 2)
+            stats.record("RAG", "RAG", 0)
+
+        assert stats.stats() == {
+            "searches": 3,
+            "rewritten": 1,
+            "empty": 2,
+            "retries": 1,
+            "empty_rate": 0.667,
+        }
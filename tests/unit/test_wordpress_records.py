@@ -0,0 +1,107 @@
+"""
+Unit tests for the compact processed content records
+
+These tests demonstrate:
+- Records stay readable as mappings by existing callers
+- Records are immutable and slotted
+- dumps_result matches json.dumps and reuses the cached JSON per record
+"""
+
+import dataclasses
+import json
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    ContentProcessor,
+    PostRecord,
+    ToolRecord,
+    dumps_result,
+)
+
+
+def _tool():
+    return ToolRecord(
+        title="Cursor",
+        description="Editor",
+        categories=("AI", "IDE"),
+        date="2024-01-01",
+    )
+
+
+class TestContentRecords:
+    """Test record types produced by ContentProcessor"""
+
+    def test_mapping_compatibility(self):
+        """Test that records behave like the dicts they replace"""
+        record = _tool()
+
+        assert record["title"] == "Cursor"
+        assert record.get("missing") is None
+        assert "categories" in record
+        assert list(record) == ["title", "description", "categories", "date", "type"]
+        assert record.to_dict() == {
+            "title": "Cursor",
+            "description": "Editor",
+            "categories": ("AI", "IDE"),
+            "date": "2024-01-01",
+            "type": "tool",
+        }
+        with pytest.raises(KeyError):
+            record["missing"]
+
+    def test_records_are_frozen_and_slotted(self):
+        """Test that cached records cannot be mutated"""
+        record = _tool()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.title = "Altro"  # type: ignore[misc]
+        assert not hasattr(record, "__dict__")
+
+    def test_dumps_result_matches_json_dumps(self):
+        """Test that serialized tool results are unchanged"""
+        record = _tool()
+        result = {
+            "total": 1,
+            "tools": [record],
+            "nested": {"items": [record]},
+            "note": 'àè "quoted"',
+        }
+        expected = {
+            "total": 1,
+            "tools": [record.to_dict()],
+            "nested": {"items": [record.to_dict()]},
+            "note": 'àè "quoted"',
+        }
+
+        assert dumps_result(result) == json.dumps(expected)
+        assert json.loads(dumps_result(result))["tools"][0]["categories"] == [
+            "AI",
+            "IDE",
+        ]
+
+    def test_json_computed_once(self):
+        """Test that each record serializes itself only once"""
+        record = _tool()
+
+        assert record.to_json() is record.to_json()
+
+    def test_from_dict_round_trip(self):
+        """Test rebuilding a record from its JSON form"""
+        record = _tool()
+
+        assert ToolRecord.from_dict(json.loads(record.to_json())) == record
+
+    def test_processor_returns_records(self):
+        """Test that ContentProcessor output is a record"""
+        processed = ContentProcessor.process_post(
+            {
+                "title": {"rendered": "Post"},
+                "content": {"rendered": "<p>Testo</p>"},
+                "date": "2024-01-01T10:00:00",
+            }
+        )
+
+        assert isinstance(processed, PostRecord)
+        assert processed["content_preview"] == "Testo"
+        assert processed["type"] == "article"
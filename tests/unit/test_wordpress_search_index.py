@@ -0,0 +1,165 @@
+"""
+Unit tests for the local BM25 search index
+
+These tests demonstrate:
+- Italian/English tokenization with accent folding and light stemming
+- BM25 ranking across content types
+- Incremental add/remove and sync driven by a mocked WordPress client
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import SearchIndex
+from src.veronica_wordpress_chatbot.wordpress.search_index import tokenize
+
+
+def _item(item_id, title, content="", modified="2024-01-01T10:00:00"):
+    return {
+        "id": item_id,
+        "modified": modified,
+        "date": modified,
+        "title": {"rendered": title},
+        "content": {"rendered": content},
+    }
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex(endpoints=("posts", "projects"))
+    index.add("posts", _item(1, "Agenti AI con LangGraph", "<p>Un agente ReAct</p>"))
+    index.add("posts", _item(2, "Cucina siciliana", "<p>Arancine e cannoli</p>"))
+    index.add("posts", _item(3, "Diario", "<p>Oggi ho parlato di agents</p>"))
+    index.add("projects", _item(4, "Chatbot", "<p>Agente RAG per WordPress</p>"))
+    return index
+
+
+class TestTokenizer:
+    """Test text normalization"""
+
+    def test_accents_stopwords_and_stemming(self):
+        """Test that Italian and English forms share the same terms"""
+        assert tokenize("Perché gli Agenti") == tokenize("perche agents")
+        assert tokenize("embeddings") == tokenize("embedding")
+        assert tokenize("applicazioni applications") == ["applic", "applic"]
+
+    def test_ai_is_not_a_stopword(self):
+        """Test that "AI" survives stopword removal"""
+        assert tokenize("Progetti di AI") == ["progett", "ai"]
+
+
+class TestSearchIndex:
+    """Test BM25 ranking and incremental updates"""
+
+    def test_ranked_across_content_types(self, index):
+        """Test that results mix types, title matches first"""
+        hits = index.search("agenti", limit=10)
+
+        assert [(hit.endpoint, hit.id) for hit in hits][0] == ("posts", 1)
+        assert {(hit.endpoint, hit.id) for hit in hits} == {
+            ("posts", 1),
+            ("posts", 3),
+            ("projects", 4),
+        }
+        assert hits[0].score > hits[-1].score
+        assert hits[0].record["title"] == "Agenti AI con LangGraph"
+
+    def test_no_match_and_endpoint_filter(self, index):
+        """Test empty results and per-collection restriction"""
+        assert index.search("kubernetes") == []
+        assert [hit.id for hit in index.search("agente", endpoints=["projects"])] == [4]
+
+    def test_update_and_remove_by_id(self, index):
+        """Test that re-adding replaces a document and remove drops it"""
+        index.add(
+            "posts",
+            _item(2, "Ricette AI", "<p>Le ricette</p>", modified="2024-02-01T10:00:00"),
+        )
+
+        assert index.search("arancine") == []
+        assert [hit.id for hit in index.search("ricette")] == [2]
+
+        assert index.remove("posts", 2)
+        assert not index.remove("posts", 2)
+        assert index.search("ricette") == []
+        assert index.stats()["documents"] == 3
+
+
+class TestSearchIndexSync:
+    """Test full and incremental sync"""
+
+    def test_full_then_incremental_with_deletions(self):
+        """Test modified_after refresh and removal of unpublished items"""
+        index = SearchIndex(endpoints=("posts",))
+        client = Mock()
+        client.iter_collection.return_value = iter(
+            [_item(1, "LangGraph"), _item(2, "Arancine")]
+        )
+
+        assert index.ensure(client)
+        assert index.ready
+
+        client.iter_collection.side_effect = [
+            iter([_item(3, "LangChain", modified="2024-02-01T10:00:00")]),
+            iter([{"id": 1}, {"id": 3}]),
+        ]
+        result = index.sync_endpoint(client, "posts")
+
+        changed_call = client.iter_collection.call_args_list[1]
+        assert changed_call.args[1]["modified_after"] == "2024-01-01T10:00:00"
+        assert result["mode"] == "incremental"
+        assert result["deleted"] == 1
+        assert [hit.id for hit in index.search("arancine langchain")] == [3]
+
+    def test_failed_build_is_not_ready(self):
+        """Test that a collection that cannot be fetched keeps the fallback"""
+        index = SearchIndex(endpoints=("posts",))
+        client = Mock()
+        client.iter_collection.side_effect = ConnectionError("down")
+
+        assert not index.ensure(client)
+
+    def test_failing_collection_retried_in_background(self):
+        """Test that one failing collection does not rebuild on every search"""
+        from unittest.mock import patch
+
+        index = SearchIndex(endpoints=("posts", "tools"))
+        client = Mock()
+
+        def iter_collection(endpoint, *args, **kwargs):
+            if endpoint == "tools":
+                raise ConnectionError("down")
+            return iter([_item(1, "LangGraph")])
+
+        client.iter_collection.side_effect = iter_collection
+
+        assert index.ensure(client)
+        assert index.stats()["failed_endpoints"] == {"tools": "down"}
+        calls = client.iter_collection.call_count
+
+        # Ricerche successive: nessun download sul chat path
+        assert index.ensure(client)
+        assert client.iter_collection.call_count == calls
+        assert [hit.id for hit in index.search("langgraph")] == [1]
+
+        # Scaduto l'intervallo di retry la collezione va in background
+        with patch(
+            "src.veronica_wordpress_chatbot.wordpress.search_index._refresh_executor"
+        ) as executor:
+            index._attempted_at["tools"] -= 3600
+            assert index.ensure(client)
+
+        executor.submit.assert_called_once_with(index._refresh, client)
+
+    def test_ensure_does_not_wait_for_a_running_build(self):
+        """Test that searches fall back while the startup warm-up holds the lock"""
+        index = SearchIndex(endpoints=("posts",))
+        client = Mock()
+        client.iter_collection.return_value = iter([_item(1, "LangGraph")])
+
+        with index._sync_lock:
+            assert not index.ensure(client)
+        client.iter_collection.assert_not_called()
+
+        assert index.ensure(client)
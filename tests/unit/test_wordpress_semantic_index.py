@@ -0,0 +1,145 @@
+"""
+Unit tests for the NumPy semantic index
+
+These tests demonstrate:
+- Offline hashed n-gram + SVD embeddings (normalized float32 rows)
+- Top-k cosine search, batched queries and per-collection filters
+- Memory-mapped persistence shared by indexes over the same documents
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    HashedNgramEmbedder,
+    SearchIndex,
+    SemanticIndex,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _item(item_id, title, content, modified="2024-01-01T10:00:00"):
+    return {
+        "id": item_id,
+        "modified": modified,
+        "date": modified,
+        "title": {"rendered": title},
+        "content": {"rendered": f"<p>{content}</p>"},
+    }
+
+
+@pytest.fixture
+def source():
+    source = SearchIndex(endpoints=("posts", "projects"))
+    for endpoint, item in [
+        ("posts", _item(1, "Guida agli LLM", "Gli LLM sono modelli linguistici")),
+        ("posts", _item(2, "Fine tuning", "Addestrare un LLM sui propri dati")),
+        ("posts", _item(3, "Cucina siciliana", "Arancine, cannoli e caponata")),
+        ("projects", _item(4, "Chatbot RAG", "Un chatbot con un LLM e LangGraph")),
+        ("projects", _item(5, "Ricettario", "Le ricette della cucina di Palermo")),
+    ]:
+        source.add(endpoint, item)
+    return source
+
+
+@pytest.fixture
+def index(source):
+    index = SemanticIndex(HashedNgramEmbedder(dimensions=8), path="", source=source)
+    index.rebuild()
+    return index
+
+
+class TestHashedNgramEmbedder:
+    """Test the offline embedder"""
+
+    def test_vectors_are_normalized_float32(self):
+        """Test that fit returns one unit row per document"""
+        embedder = HashedNgramEmbedder(dimensions=4, buckets=1024)
+        texts = ["agenti AI", "agenti RAG", "AI RAG", "cucina", "cucina tipica", "tipo"]
+        state, vectors = embedder.fit(texts)
+
+        # Rango ridotto a metà dei documenti
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (6, 3)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+        assert state["components"].shape == (1024, 3)
+        assert embedder.embed(["agenti"], state).shape == (1, 3)
+
+
+class TestSemanticIndex:
+    """Test top-k similarity search"""
+
+    def test_related_terms_without_shared_words(self, index):
+        """Test that "modelli linguistici" finds LLM content without those words"""
+        hits = index.search("modelli linguistici", limit=3)
+        keys = [(hit.endpoint, hit.id) for hit in hits]
+
+        assert keys[0] == ("posts", 1)
+        assert ("posts", 2) in keys
+        assert ("posts", 3) not in keys
+        assert hits[0].record["title"] == "Guida agli LLM"
+
+    def test_batched_queries_and_filters(self, index):
+        """Test that search_many matches single searches and endpoint filters"""
+        queries = ["LLM", "cucina"]
+        batched = index.search_many(queries, limit=2)
+        projects = index.search("cucina", limit=1, endpoints=["projects"])
+
+        assert batched == [index.search(query, limit=2) for query in queries]
+        assert [hit.id for hit in projects] == [5]
+        assert index.search("kubernetes") == []
+
+    def test_removed_documents_are_skipped(self, index, source):
+        """Test that a document deleted from the source is not returned"""
+        source.remove("posts", 1)
+
+        assert 1 not in [hit.id for hit in index.search("modelli linguistici")]
+
+
+class TestSemanticIndexPersistence:
+    """Test memory-mapped files shared between indexes"""
+
+    def test_second_index_loads_memory_mapped_files(self, source, tmp_path):
+        """Test that the same documents reuse the saved matrix"""
+        path = str(tmp_path / "semantic")
+        first = SemanticIndex(HashedNgramEmbedder(dimensions=8), path, source)
+        first.rebuild()
+        second = SemanticIndex(HashedNgramEmbedder(dimensions=8), path, source)
+        second.rebuild()
+
+        assert first.stats()["builds"] == 1
+        assert second.stats()["builds"] == 0
+        assert second.stats()["loads"] == 1
+        assert second.stats()["memory_mapped"]
+        assert second.search("LLM") == first.search("LLM")
+
+    def test_changed_documents_rebuild_and_drop_old_files(self, source, tmp_path):
+        """Test that new content produces a new matrix and removes the old one"""
+        path = str(tmp_path / "s")
+        index = SemanticIndex(HashedNgramEmbedder(dimensions=8), path, source)
+        index.rebuild()
+        before = sorted(path.name for path in tmp_path.glob("s.*.npy"))
+
+        source.add("posts", _item(6, "Kubernetes", "Deploy di un LLM su Kubernetes"))
+        index.rebuild()
+        after = sorted(path.name for path in tmp_path.glob("s.*.npy"))
+
+        assert index.stats()["builds"] == 2
+        assert [hit.id for hit in index.search("kubernetes", 1)] == [6]
+        assert len(after) == len(before) and not set(before) & set(after)
+
+    def test_ensure_syncs_the_source_first(self):
+        """Test that ensure builds the search index and then the matrix"""
+        source = SearchIndex(endpoints=("posts",))
+        client = Mock()
+        client.iter_collection.return_value = iter(
+            [_item(1, "LangGraph", "Agenti"), _item(2, "Cannoli", "Dolci")]
+        )
+        index = SemanticIndex(HashedNgramEmbedder(dimensions=4), "", source)
+
+        assert index.ensure(client)
+        assert index.stats()["documents"] == 2
+        assert index.ensure(client)
+        assert index.stats()["builds"] == 1
@@ -0,0 +1,155 @@
+"""
+Unit tests for the offline content snapshot
+
+These tests demonstrate:
+- Export of every collection (raw + processed) into one bundle
+- WordPress-style queries answered from the memory-mapped bundle
+- The snapshot client never touching the network
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    ContentSnapshot,
+    OptimizedWordPressClient,
+    SnapshotFormatError,
+    SnapshotWordPressClient,
+    export_snapshot,
+)
+
+PORTFOLIO_TOOLS = "src.veronica_wordpress_chatbot.tools.portfolio_tools"
+
+
+def _post(post_id, date, title="Post", content="", **extra):
+    return {
+        "id": post_id,
+        "date": date,
+        "modified": date,
+        "title": {"rendered": title},
+        "content": {"rendered": content},
+        **extra,
+    }
+
+
+COLLECTIONS = {
+    "posts": [
+        _post(3, "2024-03-01T10:00:00", "RAG locale", "<p>Embeddings AI</p>"),
+        _post(2, "2024-02-01T10:00:00", "Cucina siciliana", "Arancine"),
+        _post(1, "2024-01-01T10:00:00", "LangGraph agents", "Workflow AI"),
+    ],
+    "tools": [
+        _post(10, "2024-01-05T10:00:00", "Obsidian", **{"tool-category": [15]}),
+        _post(11, "2024-01-06T10:00:00", "Steam", **{"tool-category": [14]}),
+    ],
+}
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    wp_client = Mock(base_url="https://test.example.com")
+    wp_client.iter_collection.side_effect = lambda endpoint: iter(COLLECTIONS[endpoint])
+    path = str(tmp_path / "snapshot.bin")
+
+    export_snapshot(path, wp_client, COLLECTIONS, use_msgpack=False)
+
+    snapshot = ContentSnapshot(path)
+    yield snapshot
+    snapshot.close()
+
+
+class TestSnapshotBundle:
+    """Test export and loading of the bundle"""
+
+    def test_export_stores_raw_and_processed(self, snapshot):
+        """Test that every collection is stored with its processed form"""
+        assert snapshot.endpoints == ("posts", "tools")
+        assert [post["id"] for post in snapshot.items("posts")] == [3, 2, 1]
+
+        processed = snapshot.processed("posts")[0]
+        assert processed["type"] == "article"
+        assert processed["content_preview"] == "Embeddings AI"
+
+    def test_blocks_loaded_lazily(self, snapshot):
+        """Test that only the requested endpoint is decompressed"""
+        snapshot.query("posts")
+
+        loaded = {
+            endpoint: entry["loaded"]
+            for endpoint, entry in snapshot.stats()["endpoints"].items()
+        }
+        assert loaded == {"posts": True, "tools": False}
+
+    def test_invalid_file_rejected(self, tmp_path):
+        """Test that a foreign file is not loaded"""
+        path = tmp_path / "not_a_snapshot.bin"
+        path.write_bytes(b"certainly not a snapshot bundle")
+
+        with pytest.raises(SnapshotFormatError):
+            ContentSnapshot(str(path))
+
+
+class TestSnapshotQuery:
+    """Test WordPress-style queries on the bundle"""
+
+    def test_latest_first_with_limit(self, snapshot):
+        assert [p["id"] for p in snapshot.query("posts", {"per_page": 2})] == [3, 2]
+
+    def test_search_and_taxonomy_filters(self, snapshot):
+        assert [p["id"] for p in snapshot.query("posts", {"search": "ai"})] == [3, 1]
+        assert [t["id"] for t in snapshot.query("tools", {"tool-category": 14})] == [11]
+
+    def test_missing_endpoint_returns_none(self, snapshot):
+        assert snapshot.query("books") is None
+
+
+class TestSnapshotClient:
+    """Test that the snapshot client is fully offline"""
+
+    def test_client_never_calls_wordpress(self, snapshot):
+        client = SnapshotWordPressClient("https://test.example.com", snapshot)
+
+        with patch.object(client.session, "get") as mock_get:
+            posts = client.get_posts({"per_page": 5, "search": "langgraph"})
+            books = client.get_books()
+            all_tools = list(client.iter_collection("tools"))
+
+        assert [post["id"] for post in posts] == [1]
+        assert books == []
+        assert len(all_tools) == 2
+        mock_get.assert_not_called()
+
+    def test_project_category_through_projection(
+        self, tmp_path, fake_wordpress_get, mock_project_collection
+    ):
+        """Test the project category filter on a bundle exported with _fields"""
+        from src.veronica_wordpress_chatbot.tools import get_portfolio_projects
+
+        wordpress = OptimizedWordPressClient("https://test.example.com")
+        path = str(tmp_path / "projects.bin")
+        with patch.object(
+            wordpress.session,
+            "get",
+            side_effect=fake_wordpress_get(mock_project_collection),
+        ):
+            export_snapshot(path, wordpress, ["projects"], use_msgpack=False)
+        snapshot = ContentSnapshot(path)
+        client = SnapshotWordPressClient("https://test.example.com", snapshot)
+        taxonomy = Mock(resolve=Mock(return_value=(7,)))
+
+        with (
+            patch(
+                f"{PORTFOLIO_TOOLS}.get_wordpress_client",
+                return_value=client,
+            ),
+            patch(
+                f"{PORTFOLIO_TOOLS}.get_taxonomy_cache",
+                return_value=taxonomy,
+            ),
+        ):
+            result = json.loads(get_portfolio_projects.invoke({"category": "ai"}))
+
+        assert [p["title"] for p in result["projects"]] == ["Agente RAG"]
+        snapshot.close()
@@ -0,0 +1,91 @@
+"""
+Unit tests for the taxonomy term cache
+
+These tests demonstrate:
+- Category IDs resolved through cached terms, with the known terms as fallback
+- Terms fetched in bulk once per TTL, also when WordPress is unavailable
+- Renamed terms invalidate the processed documents that embed them
+"""
+
+from unittest.mock import Mock
+
+from src.veronica_wordpress_chatbot.wordpress import (
+    ContentProcessor,
+    TaxonomyCache,
+    get_taxonomy_cache,
+)
+
+
+def _tool(categories):
+    return {
+        "id": 7,
+        "modified": "2024-01-01T10:00:00",
+        "date": "2024-01-01T10:00:00",
+        "title": {"rendered": "Obsidian"},
+        "content": {"rendered": "<p>Note</p>"},
+        "tool-category": categories,
+    }
+
+
+class TestTaxonomyCache:
+    """Test term lookup and refresh"""
+
+    def test_known_terms_before_download(self):
+        """Test that configured terms resolve without any request"""
+        cache = TaxonomyCache()
+
+        assert cache.names("tool-category", [15, 99]) == ("Organizzare", "Categoria 99")
+        assert cache.resolve("stack-category", "dev") == (27, 12, 92)
+        assert cache.resolve("tool-category", "cucina") == ()
+        assert cache.resolve("project-category", "ai") is None
+
+    def test_terms_fetched_once_per_ttl(self):
+        """Test bulk download, HTML unescaping and TTL reuse"""
+        cache = TaxonomyCache(ttl=60)
+        client = Mock()
+        client.get_terms.return_value = [
+            {"id": 3, "name": "AI &amp; Agents"},
+            {"id": 4, "name": "Web"},
+        ]
+
+        cache.ensure(client, ["project-category"])
+        cache.ensure(client, ["project-category"])
+
+        client.get_terms.assert_called_once_with("project-category")
+        assert cache.names("project-category", [3]) == ("AI & Agents",)
+        assert cache.resolve("project-category", "ai") == (3,)
+
+    def test_unavailable_wordpress_keeps_known_terms(self):
+        """Test that a failed download is not retried on every call"""
+        cache = TaxonomyCache(ttl=60)
+        client = Mock()
+        client.get_terms.side_effect = ConnectionError("down")
+
+        cache.ensure(client, ["tool-category"])
+        cache.ensure(client, ["tool-category"])
+
+        assert client.get_terms.call_count == 1
+        assert cache.names("tool-category", [13]) == ("Strumenti",)
+        assert cache.stats()["failures"] == 1
+
+    async def test_async_ensure(self):
+        """Test the async refresh used by ainvoke"""
+        cache = TaxonomyCache(ttl=60)
+        client = Mock()
+
+        async def get_terms(taxonomy):
+            return [{"id": 13, "name": f"{taxonomy} 13"}]
+
+        client.get_terms = get_terms
+
+        await cache.aensure(client, ["tool-category", "stack-category"])
+
+        assert cache.names("stack-category", [13]) == ("stack-category 13",)
+
+    def test_renamed_term_reprocesses_documents(self):
+        """Test that processed tools pick up renamed categories"""
+        assert ContentProcessor.process_tool(_tool([13])).categories == ("Strumenti",)
+
+        get_taxonomy_cache().update("tool-category", [{"id": 13, "name": "Utility"}])
+
+        assert ContentProcessor.process_tool(_tool([13])).categories == ("Utility",)
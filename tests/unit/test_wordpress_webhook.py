@@ -0,0 +1,151 @@
+"""
+Unit tests for webhook-driven cache invalidation
+
+These tests demonstrate:
+- HMAC signature and timestamp verification
+- Invalidation limited to the endpoint touched by the edit
+- Responses fetched before an invalidation are not cached
+- The signed POST /wordpress/webhook endpoint
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.veronica_wordpress_chatbot.wordpress import get_response_cache
+from src.veronica_wordpress_chatbot.wordpress.webhook import (
+    invalidate_content,
+    resolve_endpoint,
+    sign_payload,
+    verify_signature,
+)
+
+SECRET = "test-webhook-secret"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    get_response_cache().clear()
+    yield
+    get_response_cache().clear()
+
+
+def _signed_headers(body: bytes, timestamp=None):
+    timestamp = str(int(time.time()) if timestamp is None else timestamp)
+    return {
+        "Content-Type": "application/json",
+        "X-Webhook-Timestamp": timestamp,
+        "X-Webhook-Signature": sign_payload(body, timestamp, SECRET),
+    }
+
+
+class TestSignature:
+    """Test HMAC verification of webhook requests"""
+
+    def test_valid_signature(self):
+        body = b'{"post_type": "post", "id": 1, "action": "save"}'
+        headers = _signed_headers(body)
+
+        assert verify_signature(
+            body,
+            headers["X-Webhook-Timestamp"],
+            headers["X-Webhook-Signature"],
+            SECRET,
+        )
+
+    def test_tampered_body_rejected(self):
+        headers = _signed_headers(b'{"id": 1}')
+
+        assert not verify_signature(
+            b'{"id": 2}',
+            headers["X-Webhook-Timestamp"],
+            headers["X-Webhook-Signature"],
+            SECRET,
+        )
+
+    def test_expired_timestamp_rejected(self):
+        body = b"{}"
+        headers = _signed_headers(body, timestamp=int(time.time()) - 3600)
+
+        assert not verify_signature(
+            body,
+            headers["X-Webhook-Timestamp"],
+            headers["X-Webhook-Signature"],
+            SECRET,
+        )
+
+    def test_missing_secret_rejects_everything(self):
+        body = b"{}"
+        headers = _signed_headers(body)
+
+        assert not verify_signature(
+            body, headers["X-Webhook-Timestamp"], headers["X-Webhook-Signature"], ""
+        )
+
+
+class TestInvalidation:
+    """Test that only the affected endpoint is invalidated"""
+
+    def test_resolve_post_type_and_rest_base(self):
+        assert resolve_endpoint("post") == "posts"
+        assert resolve_endpoint("work-experience") == "work-experiences"
+        assert resolve_endpoint("custom_cpt", rest_base="books") == "books"
+        assert resolve_endpoint("page") is None
+
+    def test_invalidates_only_affected_endpoint(self):
+        cache = get_response_cache()
+        cache.store("posts", "posts?per_page=5", [{"id": 1}], 10)
+        cache.store("books", "books?per_page=5", [{"id": 2}], 10)
+
+        event = invalidate_content("post", 1, "save")
+
+        assert event["cache_entries"] == 1
+        assert cache.peek("posts?per_page=5") is None
+        assert cache.peek("books?per_page=5") is not None
+
+    def test_in_flight_response_discarded_after_invalidation(self):
+        cache = get_response_cache()
+        generation = cache.generation("posts")
+
+        invalidate_content("post", 1, "save")  # arriva durante il fetch
+        cache.store("posts", "posts", [{"id": 1}], 10, generation)
+
+        assert cache.peek("posts") is None
+
+
+class TestWebhookEndpoint:
+    """Test the signed POST /wordpress/webhook endpoint"""
+
+    ENDPOINT_MODULE = "src.veronica_wordpress_chatbot.api.endpoints.wordpress"
+
+    def test_signed_event_invalidates_cache(self, test_client):
+        get_response_cache().store("projects", "projects", [{"id": 7}], 10)
+        body = json.dumps({"post_type": "projects", "id": 7, "action": "save"}).encode()
+
+        with patch(f"{self.ENDPOINT_MODULE}.WEBHOOK_SECRET", SECRET):
+            response = test_client.post(
+                "/wordpress/webhook", content=body, headers=_signed_headers(body)
+            )
+
+        assert response.status_code == 200
+        assert response.json()["invalidated"]["endpoint"] == "projects"
+        assert get_response_cache().peek("projects") is None
+
+    def test_bad_signature_rejected(self, test_client):
+        body = b'{"post_type": "post", "id": 1, "action": "save"}'
+        headers = {**_signed_headers(body), "X-Webhook-Signature": "sha256=00"}
+
+        with patch(f"{self.ENDPOINT_MODULE}.WEBHOOK_SECRET", SECRET):
+            response = test_client.post(
+                "/wordpress/webhook", content=body, headers=headers
+            )
+
+        assert response.status_code == 401
+
+    def test_disabled_without_secret(self, test_client):
+        with patch(f"{self.ENDPOINT_MODULE}.WEBHOOK_SECRET", ""):
+            response = test_client.post("/wordpress/webhook", content=b"{}")
+
+        assert response.status_code == 503